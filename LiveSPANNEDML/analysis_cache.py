@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+
+# Bump when the layout of cached values changes so old entries are ignored
+CACHE_VERSION = 2
+
+
+class AnalysisCache:
+    def __init__(self, cache_dir=".cspan_cache", max_bytes=2 * 1024 ** 3):
+        """Content-addressed on-disk cache for analysis results.
+
+        Entries are keyed by a hash of the video contents, the stage name and
+        every model name and parameter that affects the result, so a changed
+        setting simply misses instead of returning stale data. Reads refresh an
+        entry's modification time, and writes evict the least recently used
+        entries once the cache grows past max_bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.entry_dir = os.path.join(cache_dir, "entries")
+        self.hash_index_path = os.path.join(cache_dir, "video_hashes.json")
+        self._lock = threading.Lock()
+        os.makedirs(self.entry_dir, exist_ok=True)
+
+    def video_hash(self, path, block_size=1 << 20):
+        """Return the SHA-256 of a video file, remembering it per path, size and mtime."""
+        stat = os.stat(path)
+        index_key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        index = self._load_hash_index()
+        if index_key in index:
+            return index[index_key]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        video_hash = digest.hexdigest()
+
+        with self._lock:
+            index = self._load_hash_index()
+            index[index_key] = video_hash
+            self._atomic_write(self.hash_index_path, json.dumps(index).encode("utf-8"))
+        return video_hash
+
+    def make_key(self, stage, video_hash, **params):
+        """Build the cache key for one stage's output on one video."""
+        payload = json.dumps({"stage": stage, "video": video_hash, "params": params},
+                             sort_keys=True, default=str)
+        return f"{stage}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def get(self, key):
+        """Return the cached value for key, or None if there is no valid entry."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Discarding unreadable cache entry {key}: {e}")
+            self._remove(path)
+            return None
+
+        if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION or entry.get("key") != key:
+            self._remove(path)
+            return None
+
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["value"]
+
+    def put(self, key, value):
+        """Store value under key and evict old entries if the cache is over budget."""
+        data = pickle.dumps({"version": CACHE_VERSION, "key": key, "value": value},
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._atomic_write(self._entry_path(key), data)
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.entry_dir):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.entry_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+        return total
+
+    def _entry_path(self, key):
+        return os.path.join(self.entry_dir, f"{key}.pkl")
+
+    def _load_hash_index(self):
+        try:
+            with open(self.hash_index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _atomic_write(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
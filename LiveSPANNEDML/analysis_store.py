@@ -0,0 +1,248 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from pose_track import PoseTrack
+
+# Tables written by AnalysisWriter, each a directory of shards
+POSE_TABLE = "pose"
+PEOPLE_TABLE = "people"
+SPEECH_TABLE = "speech"
+CONTEXT_TABLE = "context"
+
+META_FILE = "meta.json"
+FORMATS = ("auto", "parquet", "npz")
+
+
+def _pyarrow():
+    """Return (pyarrow, pyarrow.parquet), or None when pyarrow is not installed."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow, pyarrow.parquet
+
+
+def _atomic_path(path):
+    # Readers only look at finished shards, so write to a hidden file and rename it
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    os.close(fd)
+    return tmp_path
+
+
+class _ShardedTable:
+    def __init__(self, directory, rows_per_shard, fmt):
+        self.directory = directory
+        self.rows_per_shard = rows_per_shard
+        self.fmt = fmt
+        self.rows = 0
+        self.shards = 0
+        self._columns = {}
+        self._buffered = 0
+        os.makedirs(directory, exist_ok=True)
+        # A new writer starts a new analysis, so shards of an earlier one must not be read with it
+        for name in os.listdir(directory):
+            if name.startswith("part-"):
+                os.remove(os.path.join(directory, name))
+
+    def append(self, **row):
+        for name, value in row.items():
+            self._columns.setdefault(name, []).append(value)
+        self._buffered += 1
+        if self._buffered >= self.rows_per_shard:
+            self.flush()
+
+    def extend(self, **columns):
+        """Append many rows given as equal-length columns."""
+        n = len(next(iter(columns.values())))
+        for name, values in columns.items():
+            self._columns.setdefault(name, []).extend(values)
+        self._buffered += n
+        if self._buffered >= self.rows_per_shard:
+            self.flush()
+
+    def flush(self):
+        if not self._buffered:
+            return
+        columns = {name: np.asarray(values) for name, values in self._columns.items()}
+        path = os.path.join(self.directory, f"part-{self.shards:05d}.{'parquet' if self.fmt == 'parquet' else 'npz'}")
+        tmp_path = _atomic_path(path)
+        try:
+            if self.fmt == "parquet":
+                self._write_parquet(tmp_path, columns)
+            else:
+                with open(tmp_path, "wb") as f:
+                    np.savez(f, **columns)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self.rows += self._buffered
+        self.shards += 1
+        self._columns = {}
+        self._buffered = 0
+
+    def _write_parquet(self, path, columns):
+        pa, pq = _pyarrow()
+        arrays, shapes = {}, {}
+        for name, values in columns.items():
+            if values.ndim > 1:
+                # Fixed-size lists keep multi-dimensional columns such as landmarks columnar
+                shapes[name] = list(values.shape[1:])
+                width = int(np.prod(values.shape[1:]))
+                arrays[name] = pa.FixedSizeListArray.from_arrays(pa.array(values.reshape(-1)), width)
+            else:
+                arrays[name] = pa.array(values)
+        table = pa.table(arrays).replace_schema_metadata({"shapes": json.dumps(shapes)})
+        pq.write_table(table, path)
+
+
+def read_table(directory):
+    """Read every finished shard of a table into a dict of concatenated column arrays."""
+    if not os.path.isdir(directory):
+        return {}
+    parts = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.endswith(".npz"):
+            with np.load(path) as shard:
+                parts.append({key: shard[key] for key in shard.files})
+        elif name.endswith(".parquet"):
+            parts.append(_read_parquet(path))
+    if not parts:
+        return {}
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def _read_parquet(path):
+    modules = _pyarrow()
+    if modules is None:
+        raise ImportError(f"pyarrow is needed to read {path}")
+    table = modules[1].read_table(path)
+    shapes = json.loads((table.schema.metadata or {}).get(b"shapes", b"{}"))
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name).combine_chunks()
+        if name in shapes:
+            values = column.flatten().to_numpy(zero_copy_only=False)
+            columns[name] = values.reshape(len(column), *shapes[name])
+        else:
+            columns[name] = column.to_numpy(zero_copy_only=False)
+    return columns
+
+
+class AnalysisWriter:
+    def __init__(self, path, shard_frames=1800, shard_rows=32, fmt="auto"):
+        """Stream analysis results to columnar shard files in directory path.
+
+        Per-frame pose landmarks (and per-person landmarks in multi-person
+        mode) are written as one shard every shard_frames frames, speech
+        segments and context results every shard_rows rows. Shards are
+        Parquet files when pyarrow is installed (fmt="auto" or "parquet")
+        and .npz files otherwise. Each shard is written to a temporary file
+        and renamed into place, so a reader never sees a partial one and can
+        load the results so far while the analysis is still running.
+        meta.json records the video and settings, and "complete": true once
+        close() has flushed everything. Use load_analysis() to read it back.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+        if fmt == "parquet" and _pyarrow() is None:
+            raise ImportError("pyarrow is needed to write Parquet shards")
+        if fmt == "auto":
+            fmt = "parquet" if _pyarrow() is not None else "npz"
+        self.path = path
+        self.fmt = fmt
+        os.makedirs(path, exist_ok=True)
+        self.pose = _ShardedTable(os.path.join(path, POSE_TABLE), shard_frames, fmt)
+        self.people = _ShardedTable(os.path.join(path, PEOPLE_TABLE), shard_frames, fmt)
+        self.speech = _ShardedTable(os.path.join(path, SPEECH_TABLE), shard_rows, fmt)
+        self.context = _ShardedTable(os.path.join(path, CONTEXT_TABLE), shard_rows, fmt)
+        self.meta = {"format": fmt, "complete": False}
+
+    def write_meta(self, **meta):
+        """Update meta.json with the given fields."""
+        self.meta.update(meta)
+        path = os.path.join(self.path, META_FILE)
+        tmp_path = _atomic_path(path)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+    def add_poses(self, frames, timestamps, landmarks):
+        """Append a block of pose rows, e.g. a slice of a PoseTrack's arrays."""
+        if len(frames):
+            self.pose.extend(frame=np.asarray(frames, dtype=np.int64),
+                             timestamp=np.asarray(timestamps, dtype=np.float64),
+                             landmarks=np.array(landmarks, dtype=np.float32))
+
+    def add_person(self, track_id, frame, timestamp, landmarks):
+        self.people.append(track_id=int(track_id), frame=int(frame), timestamp=float(timestamp),
+                           landmarks=np.array(landmarks, dtype=np.float32))
+
+    def add_speech(self, segment):
+        self.speech.append(start=float(segment["start"]), end=float(segment["end"]), text=segment["text"])
+
+    def add_context(self, context):
+        # Topic results are nested, so they are kept as a JSON string column
+        self.context.append(timestamp=float(context["timestamp"]), text=context["text"],
+                            topics=json.dumps(context["topics"], default=float), summary=context["summary"])
+
+    def flush(self):
+        for table in (self.pose, self.people, self.speech, self.context):
+            table.flush()
+
+    def close(self, **meta):
+        """Flush the remaining rows and mark the analysis complete in meta.json."""
+        self.flush()
+        self.write_meta(complete=True, pose_frames=self.pose.rows, person_rows=self.people.rows,
+                        speech_segments=self.speech.rows, context_results=self.context.rows, **meta)
+
+
+def load_analysis(path):
+    """Load what an AnalysisWriter wrote to path.
+
+    Returns a dict with "meta", "pose_data" (a PoseTrack), "person_tracks"
+    ({track ID: PoseTrack}), "speech_segments" and "context_data" (lists of
+    dicts shaped like CSPANAnalyzer's). Only finished shards are read, so
+    this also works on an analysis that is still being written.
+    """
+    try:
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        meta = {}
+
+    pose = read_table(os.path.join(path, POSE_TABLE))
+    if pose:
+        pose_data = PoseTrack.from_arrays(pose["frame"], pose["timestamp"], pose["landmarks"])
+    else:
+        pose_data = PoseTrack()
+
+    person_tracks = {}
+    people = read_table(os.path.join(path, PEOPLE_TABLE))
+    if people:
+        # Rows are in frame order, so a stable sort keeps each track in time order
+        order = np.argsort(people["track_id"], kind="stable")
+        ids = people["track_id"][order]
+        bounds = np.flatnonzero(np.diff(ids)) + 1
+        for rows in np.split(order, bounds):
+            person_tracks[int(people["track_id"][rows[0]])] = PoseTrack.from_arrays(
+                people["frame"][rows], people["timestamp"][rows], people["landmarks"][rows])
+
+    speech = read_table(os.path.join(path, SPEECH_TABLE))
+    speech_segments = [{"start": float(start), "end": float(end), "text": str(text)}
+                       for start, end, text in zip(speech.get("start", ()), speech.get("end", ()),
+                                                   speech.get("text", ()))]
+
+    context = read_table(os.path.join(path, CONTEXT_TABLE))
+    context_data = [{"timestamp": float(timestamp), "text": str(text), "topics": json.loads(str(topics)),
+                     "summary": str(summary)}
+                    for timestamp, text, topics, summary in zip(context.get("timestamp", ()), context.get("text", ()),
+                                                                context.get("topics", ()), context.get("summary", ()))]
+
+    return {"meta": meta, "pose_data": pose_data, "person_tracks": person_tracks,
+            "speech_segments": speech_segments, "context_data": context_data}
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Analyze many videos with long-lived worker processes that keep the models loaded.
+
+    python batch_runner.py --manifest jobs.jsonl --workers 2
+    python batch_runner.py --watch incoming/ --workers 2 --status status.jsonl
+
+A manifest has one JSON job per line, e.g.
+{"video": "hearing.mp4", "priority": 5, "options": {"frame_skip": 3}}.
+Jobs with a higher priority start first. Every job event is appended to the
+status file, and jobs it records as done are skipped when the batch is run
+again.
+"""
+
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".avi", ".ts", ".webm")
+
+
+class JobQueue:
+    def __init__(self):
+        """Pending jobs, highest priority first and in submission order within a priority."""
+        self._heap = []
+        self._order = itertools.count()
+
+    def push(self, job):
+        heapq.heappush(self._heap, (-job["priority"], next(self._order), job))
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class DirectoryWatcher:
+    def __init__(self, directory, extensions=VIDEO_EXTENSIONS, settle_seconds=5.0):
+        """Find new videos in a directory, once each has finished being copied in.
+
+        A file is ready when its size has not changed between two scans and it
+        has not been modified for settle_seconds, so a video still being
+        copied or downloaded into the directory is not picked up half written.
+        """
+        self.directory = directory
+        self.extensions = tuple(extensions)
+        self.settle_seconds = settle_seconds
+        self._sizes = {}
+        self._seen = set()
+
+    def scan(self):
+        """Return the paths of the videos that became ready since the last scan."""
+        ready = []
+        now = time.time()
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if path in self._seen or not name.lower().endswith(self.extensions) or name.startswith("."):
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            settled = self._sizes.get(path) == stat.st_size and now - stat.st_mtime >= self.settle_seconds
+            self._sizes[path] = stat.st_size
+            if settled:
+                self._seen.add(path)
+                del self._sizes[path]
+                ready.append(path)
+        return ready
+
+
+class StatusLog:
+    def __init__(self, path):
+        """Append-only JSON lines record of job and worker events."""
+        self.path = path
+        self.completed = set()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # A line cut short by a crash
+                    if record.get("job") is not None and record.get("status") == "done":
+                        self.completed.add(record["job"])
+        self._file = open(path, "a", encoding="utf-8") if path else None
+
+    def write(self, **record):
+        record = {"time": time.time(), **record}
+        if record.get("status") == "done":
+            self.completed.add(record["job"])
+        if self._file is not None:
+            self._file.write(json.dumps(record, default=str) + "\n")
+            self._file.flush()
+        return record
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def load_manifest(path):
+    """Read jobs from a JSON lines manifest, or a JSON list of jobs; bare strings are video paths."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        entries = json.loads(text)
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip() and not line.startswith("#")]
+    return [{"video": entry} if isinstance(entry, str) else entry for entry in entries]
+
+
+def warm_models(analyzer_options):
+    """Load the models the analyzer will use, so the first job does not wait for them."""
+    from cspan_analyzer_working import CSPANAnalyzer
+    analyzer = CSPANAnalyzer(**analyzer_options)
+    if analyzer.enable_speech:
+        analyzer.speech_model
+    if analyzer.enable_context:
+        analyzer.topic_classifier
+        analyzer.nlp
+    if analyzer.enable_pose:
+        analyzer.pose.close()
+
+
+def run_job(job, analyzer_options):
+    """Analyze one video in a worker; models come from the worker's shared registry."""
+    from cspan_analyzer_working import CSPANAnalyzer
+    if job.get("video") and not os.path.exists(job["video"]):
+        raise FileNotFoundError(f"Video file not found: {job['video']}")
+    options = dict(analyzer_options, **job.get("analyzer", {}))
+    analyzer = CSPANAnalyzer(video_path=job.get("video"), url=job.get("url"), **options)
+    if not analyzer.process_video(output_path=job["output"], data_dir=job.get("data_dir"), **job.get("options", {})):
+        raise RuntimeError("process_video did not produce a result")
+    return {
+        "output": analyzer.output_video,
+        "data_dir": job.get("data_dir"),
+        "frames_analyzed": len(analyzer.pose_data),
+        "speech_segments": len(analyzer.speech_segments),
+        "metrics": analyzer.metrics.snapshot(),
+    }
+
+
+def _worker_main(worker_id, analyzer_options, warm, job_fn, inbox, outbox):
+    """Worker process loop: load the models once, then run jobs until told to stop."""
+    started = time.perf_counter()
+    error = None
+    if warm:
+        try:
+            warm_models(analyzer_options)
+        except Exception as e:
+            # Jobs still run, and fail with their own errors if the models really are missing
+            error = f"{type(e).__name__}: {e}"
+    outbox.put(("ready", worker_id, None, {"load_seconds": time.perf_counter() - started, "error": error}))
+
+    while True:
+        job = inbox.get()
+        if job is None:
+            break
+        started = time.perf_counter()
+        try:
+            result = {"status": "done", "result": job_fn(job, analyzer_options)}
+        except Exception:
+            result = {"status": "failed", "error": traceback.format_exc()}
+        result["run_seconds"] = time.perf_counter() - started
+        outbox.put(("finished", worker_id, job["id"], result))
+
+
+class _Worker:
+    def __init__(self, worker_id, process, inbox):
+        self.id = worker_id
+        self.process = process
+        self.inbox = inbox
+        self.ready = False
+        self.job = None
+        self.jobs_run = 0
+
+
+class BatchRunner:
+    def __init__(self, workers=1, analyzer_options=None, options=None, status_path="batch_status.jsonl",
+                 output_dir="batch_output", data_root=None, warm=True, max_jobs_per_worker=None, skip_completed=True,
+                 poll_seconds=1.0, job_fn=run_job):
+        """Schedule videos across worker processes that keep their models warm.
+
+        Each of the workers is a spawned process that loads the models
+        once (see ModelRegistry) and then runs one job at a time, so short
+        clips no longer pay for model loading. analyzer_options are the
+        CSPANAnalyzer arguments every worker shares; a job can override them
+        with its own "analyzer" dict. Likewise options are process_video
+        arguments for every job, extended by a job's own "options". Outputs
+        default to output_dir/<name>_analyzed.mp4, and with data_root set
+        each job's analysis goes to data_root/<name>.
+
+        Jobs start in priority order, at most one per worker. A worker is
+        replaced after max_jobs_per_worker jobs, to bound memory growth, and
+        when it dies, failing the job it was running. Queued, started,
+        finished and failed events with wait and run times, errors and the
+        job's metrics are appended to the JSON lines file at status_path.
+        With skip_completed, jobs that file records as done are not run again.
+        """
+        self.workers = max(1, int(workers))
+        self.analyzer_options = dict(analyzer_options or {})
+        self.options = dict(options or {})
+        self.output_dir = output_dir
+        self.data_root = data_root
+        self.warm = warm
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.skip_completed = skip_completed
+        self.poll_seconds = poll_seconds
+        self.job_fn = job_fn
+
+        self.status = StatusLog(status_path)
+        self.queue = JobQueue()
+        self.jobs = {}
+        self.results = {}
+        self._context = multiprocessing.get_context("spawn")  # MediaPipe and torch are not fork-safe
+        self._outbox = self._context.Queue()
+        self._pool = []
+        self._worker_ids = itertools.count()
+
+    def submit(self, video=None, priority=0, job_id=None, output=None, data_dir=None, url=None, **job):
+        """Queue a video (or url) for analysis and return its job ID, or None if it is already done."""
+        source = video or url
+        if not source:
+            raise ValueError("A job needs a video path or a url")
+        job_id = job_id or job.pop("id", None) or (os.path.abspath(video) if video else url)
+        if self.skip_completed and job_id in self.status.completed:
+            print(f"Skipping {job_id}: already done")
+            return None
+        if job_id in self.jobs and self.results.get(job_id, {}).get("status") != "failed":
+            print(f"Skipping {job_id}: already queued")
+            return None
+        name = os.path.splitext(os.path.basename(source.rstrip("/")))[0] or "video"
+        if output is None:
+            output = os.path.join(self.output_dir, f"{name}_analyzed.mp4")
+        if data_dir is None and self.data_root:
+            data_dir = os.path.join(self.data_root, name)
+        job = dict(job, id=job_id, video=video, url=url, priority=priority, output=output, data_dir=data_dir,
+                   options=dict(self.options, **job.get("options", {})), queued_at=time.time())
+        self.jobs[job_id] = job
+        self.results.pop(job_id, None)
+        self.queue.push(job)
+        self.status.write(job=job_id, status="queued", video=source, priority=priority)
+        return job_id
+
+    def submit_manifest(self, path):
+        """Queue every job of a manifest (see load_manifest); returns the IDs queued."""
+        ids = [self.submit(**entry) for entry in load_manifest(path)]
+        return [job_id for job_id in ids if job_id is not None]
+
+    def run(self, watcher=None, stop_when_idle=True):
+        """Run queued jobs, plus new videos from watcher, and return {job_id: result}.
+
+        With a watcher and stop_when_idle=False this keeps running until
+        interrupted.
+        """
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+        next_scan = 0.0
+        try:
+            while True:
+                if watcher is not None and time.monotonic() >= next_scan:
+                    for path in watcher.scan():
+                        self.submit(path)
+                    next_scan = time.monotonic() + self.poll_seconds
+                self._fill_pool()
+                self._dispatch()
+                busy = any(worker.job is not None for worker in self._pool)
+                if not busy and not self.queue and (watcher is None or stop_when_idle):
+                    break
+                self._poll()
+                self._check_workers()
+        except KeyboardInterrupt:
+            print("Interrupted; stopping workers")
+        finally:
+            self.close()
+        return self.results
+
+    def close(self):
+        """Stop every worker; jobs they were running are recorded as failed."""
+        for worker in self._pool:
+            if worker.process.is_alive():
+                worker.inbox.put(None)
+        # Keep reading results while workers exit, so none blocks on a full queue
+        deadline = time.monotonic() + 10
+        while any(worker.process.is_alive() for worker in self._pool) and time.monotonic() < deadline:
+            self._poll(timeout=0.1)
+        for worker in self._pool:
+            worker.process.join(timeout=1)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            if worker.job is not None:
+                self._finish(worker, {"status": "failed", "error": "stopped before the job finished"})
+        self._pool = []
+        self.status.close()
+
+    def _fill_pool(self):
+        # Only start workers there is work for
+        wanted = min(self.workers, len(self._pool) + len(self.queue))
+        while len(self._pool) < wanted:
+            worker_id = next(self._worker_ids)
+            inbox = self._context.Queue()
+            process = self._context.Process(target=_worker_main, name=f"batch-worker-{worker_id}", daemon=True,
+                                            args=(worker_id, self.analyzer_options, self.warm, self.job_fn,
+                                                  inbox, self._outbox))
+            process.start()
+            self._pool.append(_Worker(worker_id, process, inbox))
+            self.status.write(worker=worker_id, status="worker_started", pid=process.pid)
+
+    def _dispatch(self):
+        for worker in self._pool:
+            if not self.queue:
+                return
+            if worker.ready and worker.job is None:
+                job = self.queue.pop()
+                worker.job = job
+                job["started_at"] = time.time()
+                worker.inbox.put(job)
+                self.status.write(job=job["id"], status="started", worker=worker.id,
+                                  wait_seconds=job["started_at"] - job["queued_at"])
+
+    def _poll(self, timeout=None):
+        try:
+            message = self._outbox.get(timeout=self.poll_seconds if timeout is None else timeout)
+        except queue.Empty:
+            return
+        while message is not None:
+            self._handle(*message)
+            try:
+                message = self._outbox.get_nowait()
+            except queue.Empty:
+                message = None
+
+    def _handle(self, kind, worker_id, job_id, payload):
+        worker = next((w for w in self._pool if w.id == worker_id), None)
+        if worker is None:
+            return
+        if kind == "ready":
+            worker.ready = True
+            self.status.write(worker=worker_id, status="worker_ready", **payload)
+            if payload["error"]:
+                print(f"Worker {worker_id} could not preload models: {payload['error']}")
+        elif kind == "finished" and worker.job is not None and worker.job["id"] == job_id:
+            self._finish(worker, payload)
+            worker.jobs_run += 1
+            if self.max_jobs_per_worker and worker.jobs_run >= self.max_jobs_per_worker:
+                self._retire(worker)
+
+    def _finish(self, worker, payload):
+        job, worker.job = worker.job, None
+        self.results[job["id"]] = payload
+        record = self.status.write(job=job["id"], worker=worker.id, total_seconds=time.time() - job["queued_at"],
+                                   **payload)
+        if record["status"] == "done":
+            print(f"Finished {job['id']} in {record['run_seconds']:.1f}s")
+        else:
+            print(f"Job {job['id']} failed: {payload['error'].strip().splitlines()[-1]}")
+
+    def _retire(self, worker):
+        worker.inbox.put(None)
+        worker.process.join(timeout=10)
+        if worker.process.is_alive():
+            worker.process.terminate()
+        self._pool.remove(worker)
+        self.status.write(worker=worker.id, status="worker_stopped", jobs_run=worker.jobs_run)
+
+    def _check_workers(self):
+        """Replace workers that died, failing the job each was running."""
+        for worker in list(self._pool):
+            if worker.process.is_alive():
+                continue
+            if worker.job is not None:
+                self._finish(worker, {"status": "failed",
+                                      "error": f"worker exited with code {worker.process.exitcode}"})
+            self._pool.remove(worker)
+            self.status.write(worker=worker.id, status="worker_died", exitcode=worker.process.exitcode)
+
+
+# Example usage
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Batch CSPAN Video Analyzer')
+    parser.add_argument('--manifest', type=str, help='JSON lines file with one job per line')
+    parser.add_argument('--watch', type=str, help='Directory to watch for new videos')
+    parser.add_argument('--once', action='store_true', help='With --watch, stop once the directory is processed')
+    parser.add_argument('--workers', type=int, default=1, help='Videos analyzed at the same time')
+    parser.add_argument('--status', type=str, default="batch_status.jsonl", help='JSON lines job status log')
+    parser.add_argument('--output-dir', type=str, default="batch_output", help='Where output videos are written')
+    parser.add_argument('--data-root', type=str, default=None, help='Save each job\'s analysis data under this')
+    parser.add_argument('--max-jobs-per-worker', type=int, default=None,
+                        help='Restart a worker after this many jobs')
+    parser.add_argument('--rerun', action='store_true', help='Run jobs the status log records as done again')
+    parser.add_argument('--poll-seconds', type=float, default=2.0, help='How often the watched directory is scanned')
+    parser.add_argument('--frame-skip', type=int, default=2, help='Default frame skip for jobs')
+    parser.add_argument('--no-render', action='store_true', help='Only save analysis data (needs --data-root)')
+    parser.add_argument('--cache-dir', type=str, default=None, help='Directory for cached analysis results')
+    parser.add_argument('--model-dir', type=str, default=None, help='Load models only from this local directory')
+    parser.add_argument('--whisper-model', type=str, default="base", help='Whisper model size')
+    parser.add_argument('--pose-complexity', type=int, choices=(0, 1, 2), default=2,
+                        help='MediaPipe Pose model complexity')
+    args = parser.parse_args()
+    if not args.manifest and not args.watch:
+        parser.error("give --manifest, --watch or both")
+
+    runner = BatchRunner(workers=args.workers, options={"frame_skip": args.frame_skip, "render": not args.no_render},
+                         status_path=args.status, output_dir=args.output_dir,
+                         data_root=args.data_root, max_jobs_per_worker=args.max_jobs_per_worker,
+                         skip_completed=not args.rerun, poll_seconds=args.poll_seconds,
+                         analyzer_options=dict(cache_dir=args.cache_dir, model_dir=args.model_dir,
+                                               whisper_model=args.whisper_model,
+                                               pose_complexity=args.pose_complexity))
+    if args.manifest:
+        runner.submit_manifest(args.manifest)
+    watcher = DirectoryWatcher(args.watch) if args.watch else None
+    results = runner.run(watcher, stop_when_idle=args.once or not args.watch)
+    failed = [job_id for job_id, result in results.items() if result["status"] != "done"]
+    print(f"{len(results) - len(failed)} jobs done, {len(failed)} failed")
+    exit(1 if failed else 0)
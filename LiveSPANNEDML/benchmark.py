@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Benchmark CSPANAnalyzer on deterministic synthetic C-SPAN-like videos.
+
+    python benchmark.py run --output bench.json
+    python benchmark.py compare baseline.json bench.json
+
+Fixtures are generated locally and cached in --fixture-dir. Each case runs in
+a fresh process so peak RSS is measured per case. Speech and context stages
+only run with --model-dir, so nothing is ever downloaded.
+"""
+
+import json
+import math
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+# Bump when fixture rendering changes so cached fixtures are regenerated
+FIXTURE_VERSION = 1
+AUDIO_SAMPLE_RATE = 16000
+
+# Amplitude of the speaker's gestures, and whether the camera cuts between shots
+MOTION_LEVELS = {
+    "static": {"gesture": 0.0, "sway": 0.0, "cut_every": None},
+    "medium": {"gesture": 0.6, "sway": 0.02, "cut_every": None},
+    "high": {"gesture": 1.0, "sway": 0.05, "cut_every": 4.0},
+}
+
+FIXTURES = {
+    "360p_static": dict(width=640, height=360, seconds=10, motion="static"),
+    "720p_speaker": dict(width=1280, height=720, seconds=10, motion="medium"),
+    "1080p_busy": dict(width=1920, height=1080, seconds=10, motion="high"),
+    "480p_long": dict(width=854, height=480, seconds=60, motion="medium"),
+}
+DEFAULT_FIXTURES = ("360p_static", "720p_speaker", "1080p_busy")
+
+# (CSPANAnalyzer options, process_video options) for each benchmarked configuration
+CONFIGS = {
+    "default": ({}, {}),
+    "pipelined": ({}, {"pipelined": True}),
+    "headless": ({}, {"render": False}),
+    "motion_gate": ({"motion_gate": True}, {}),
+    "inference_640": ({"inference_size": 640}, {}),
+    "multi_person": ({"multi_person": True}, {}),
+}
+DEFAULT_CONFIGS = ("default", "pipelined", "headless")
+
+
+def _draw_speaker(frame, t, level, rng_offsets, shot):
+    """Draw one frame of a speaker at a lectern, C-SPAN style."""
+    height, width = frame.shape[:2]
+    s = height / 720  # Drawing is laid out for 720p and scaled
+    zoom = 1.0 if shot == 0 else 0.6  # Wide shot after a cut
+    cx = width / 2 + math.sin(t * 0.7) * level["sway"] * width
+    top = height * (0.22 if shot == 0 else 0.38)
+
+    def pt(x, y):
+        return int(cx + x * s * zoom), int(top + y * s * zoom)
+
+    # Head, suit and lectern
+    cv2.circle(frame, pt(0, 40), int(45 * s * zoom), (150, 180, 220), -1, cv2.LINE_AA)
+    cv2.ellipse(frame, pt(0, 250), (int(130 * s * zoom), int(170 * s * zoom)), 0, 180, 360, (60, 40, 30), -1,
+                cv2.LINE_AA)
+    cv2.rectangle(frame, pt(-120, 95), pt(120, 420), (60, 40, 30), -1)
+    cv2.rectangle(frame, pt(-18, 95), pt(18, 260), (240, 240, 240), -1)
+    cv2.rectangle(frame, pt(-8, 100), pt(8, 240), (40, 40, 160), -1)
+
+    # Gesturing forearms, out of phase with each other
+    for side, phase in ((-1, 0.0), (1, rng_offsets[0])):
+        swing = level["gesture"] * math.sin(t * 2.3 + phase) * 0.9
+        elbow = (side * 130, 230)
+        hand = (elbow[0] + side * 60 * math.cos(swing) + 20 * side,
+                elbow[1] - 110 * math.sin(swing + 0.6))
+        cv2.line(frame, pt(side * 115, 120), pt(*elbow), (60, 40, 30), int(40 * s * zoom), cv2.LINE_AA)
+        cv2.line(frame, pt(*elbow), pt(*hand), (60, 40, 30), int(34 * s * zoom), cv2.LINE_AA)
+        cv2.circle(frame, pt(*hand), int(18 * s * zoom), (150, 180, 220), -1, cv2.LINE_AA)
+
+    cv2.rectangle(frame, pt(-170, 300), pt(170, 560), (30, 70, 110), -1)
+    cv2.rectangle(frame, pt(-60, 360), pt(60, 440), (200, 200, 200), 2)
+
+
+def _draw_lower_third(frame, t):
+    height, width = frame.shape[:2]
+    s = height / 720
+    y0 = int(height * 0.82)
+    frame[y0:int(height * 0.93)] = (110, 40, 20)
+    cv2.putText(frame, "SEN. JANE SMITH (D)  BUDGET COMMITTEE HEARING", (int(30 * s), y0 + int(40 * s)),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.9 * s, (255, 255, 255), max(1, int(2 * s)), cv2.LINE_AA)
+    cv2.putText(frame, f"C-SPAN  {int(t // 60):02d}:{int(t % 60):02d}", (int(width - 230 * s), int(40 * s)),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.8 * s, (255, 255, 255), max(1, int(2 * s)), cv2.LINE_AA)
+
+
+def _background(width, height, seed):
+    # Blue curtain gradient with a fixed grain, generated once per fixture
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    x = np.linspace(0, 1, width, dtype=np.float32)[None, :]
+    folds = 0.5 + 0.5 * np.sin(x * 40)
+    base = np.empty((height, width, 3), dtype=np.float32)
+    base[..., 0] = 110 + 50 * folds - 40 * y
+    base[..., 1] = 50 + 20 * folds - 20 * y
+    base[..., 2] = 25 + 10 * folds
+    grain = np.random.default_rng(seed).normal(0, 4, (height, width, 1)).astype(np.float32)
+    return np.clip(base + grain, 0, 255).astype(np.uint8)
+
+
+def _speech_audio(seconds, seed, sample_rate=AUDIO_SAMPLE_RATE):
+    """Speech-like audio: a voiced harmonic tone in syllable bursts, with pauses between phrases."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 120 + 15 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 2
+    # Phrases of 2-5 seconds separated by pauses of up to a second
+    phrases = np.zeros_like(t)
+    start = 0.0
+    while start < seconds:
+        length = rng.uniform(2, 5)
+        phrases[(t >= start) & (t < start + length)] = 1
+        start += length + rng.uniform(0.3, 1.0)
+    audio = 0.3 * voice * syllables * phrases + rng.normal(0, 0.005, len(t))
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+
+
+def make_fixture(path, width=1280, height=720, seconds=10, fps=30, motion="medium", seed=0, audio=True,
+                 wav_path=None):
+    """Render a deterministic synthetic C-SPAN-like video to path.
+
+    A speaker gestures at a lectern in front of a curtain with a lower-third
+    caption; motion is one of MOTION_LEVELS. With audio=True a speech-like
+    track is muxed in when ffmpeg is available, and otherwise written to
+    wav_path (next to the video by default). Returns whether the video has
+    an audio track.
+    """
+    level = MOTION_LEVELS[motion]
+    rng = np.random.default_rng(seed)
+    offsets = rng.uniform(0, math.pi, 4)
+    background = _background(width, height, seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    silent_path = path + ".silent.mp4" if audio else path
+    out = cv2.VideoWriter(silent_path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    frame = np.empty_like(background)
+    for i in range(int(seconds * fps)):
+        t = i / fps
+        shot = int(t // level["cut_every"]) % 2 if level["cut_every"] else 0
+        np.copyto(frame, background)
+        _draw_speaker(frame, t, level, offsets, shot)
+        _draw_lower_third(frame, t)
+        out.write(frame)
+    out.release()
+    if not audio:
+        return False
+
+    wav_path = wav_path or os.path.splitext(path)[0] + ".wav"
+    with wave.open(wav_path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(AUDIO_SAMPLE_RATE)
+        f.writeframes(_speech_audio(seconds, seed).tobytes())
+    if shutil.which("ffmpeg") is None:
+        os.replace(silent_path, path)
+        return False
+    subprocess.run(["ffmpeg", "-nostdin", "-y", "-loglevel", "error", "-i", silent_path, "-i", wav_path,
+                    "-c:v", "copy", "-c:a", "aac", "-shortest", path], check=True)
+    os.remove(silent_path)
+    os.remove(wav_path)
+    return True
+
+
+def fixture_path(fixture_dir, name, spec):
+    """Generate the named fixture into fixture_dir unless it is already there, and return its path."""
+    key = "_".join(f"{k}{spec[k]}" for k in sorted(spec))
+    path = os.path.join(fixture_dir, f"{name}_v{FIXTURE_VERSION}_{key}.mp4")
+    if not os.path.exists(path):
+        print(f"Generating fixture {name} ({spec['width']}x{spec['height']}, {spec['seconds']}s)...")
+        make_fixture(path + ".tmp.mp4", wav_path=os.path.splitext(path)[0] + ".wav", **spec)
+        os.replace(path + ".tmp.mp4", path)
+    return path
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+def _run_case(case):
+    """Run one benchmark case; called in a fresh worker process."""
+    # Never reach for the network; models come from model_dir or are already cached
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+    from cspan_analyzer_working import CSPANAnalyzer
+
+    analyzer = CSPANAnalyzer(video_path=case["video_path"], progress_callback=lambda progress: None,
+                             **case["analyzer_options"])
+    first_result = []
+    analyze_frame = analyzer._analyze_frame
+
+    def timed_analyze_frame(*args):
+        result = analyze_frame(*args)
+        if not first_result:
+            first_result.append(time.perf_counter())
+        return result
+
+    analyzer._analyze_frame = timed_analyze_frame
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        analyzer.process_video(os.path.join(tmp, "out.mp4"), **case["process_options"])
+        seconds = time.perf_counter() - start
+
+    snapshot = analyzer.metrics.snapshot()
+    frames = snapshot["counters"].get("frames_analyzed", 0)
+    return {
+        "seconds": seconds,
+        "frames_analyzed": frames,
+        "frames_per_second": frames / seconds if seconds > 0 else 0.0,
+        "first_result_seconds": first_result[0] - start if first_result else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": {name: {"count": s["count"], "mean_ms": s["mean_seconds"] * 1000,
+                          "p95_ms": s["p95_seconds"] * 1000, "total_seconds": s["total_seconds"]}
+                   for name, s in snapshot["stages"].items()},
+        "counters": snapshot["counters"],
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(fixtures=DEFAULT_FIXTURES, configs=DEFAULT_CONFIGS, fixture_dir=".bench_fixtures", repeat=1,
+                   frame_skip=1, model_dir=None, speech=False, context=False):
+    """Run every fixture x config case and return the results document.
+
+    Each case runs repeat times, each in a new process, and the run with the
+    median wall time is kept. Speech and context analysis are off unless
+    requested, and then need model_dir so no model is downloaded.
+    """
+    if (speech or context) and not model_dir:
+        raise ValueError("Speech and context benchmarks need model_dir so no models are downloaded")
+    results = []
+    spawn = multiprocessing.get_context("spawn")
+    for fixture in fixtures:
+        spec = FIXTURES[fixture]
+        video_path = fixture_path(fixture_dir, fixture, spec)
+        for config in configs:
+            analyzer_options, process_options = CONFIGS[config]
+            case = {
+                "video_path": video_path,
+                "analyzer_options": dict(analyzer_options, enable_speech=speech, enable_context=context,
+                                         model_dir=model_dir),
+                "process_options": dict(process_options, frame_skip=frame_skip),
+            }
+            runs = []
+            for _ in range(repeat):
+                # A fresh process per run keeps peak RSS and model loading per case
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                    runs.append(pool.submit(_run_case, case).result())
+            run = sorted(runs, key=lambda r: r["seconds"])[len(runs) // 2]
+            print(f"{fixture:>14} {config:<14} {run['frames_per_second']:8.1f} frames/s  "
+                  f"first result {run['first_result_seconds'] or 0:.2f}s  peak RSS {run['peak_rss_mb'] or 0:.0f}MB")
+            results.append({"fixture": fixture, "config": config, "spec": spec, "repeat": repeat,
+                            "seconds_all_runs": [r["seconds"] for r in runs], **run})
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "frame_skip": frame_skip,
+        "speech": speech,
+        "context": context,
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.10):
+    """Compare two results documents case by case.
+
+    Returns a list of (fixture, config, metric, baseline value, current value,
+    relative change, regressed) rows. Throughput regresses when it drops by
+    more than threshold; time to first result and peak RSS when they grow by
+    more than threshold.
+    """
+    base_cases = {(r["fixture"], r["config"]): r for r in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        base = base_cases.get((result["fixture"], result["config"]))
+        if base is None:
+            continue
+        for metric, higher_is_better in (("frames_per_second", True), ("first_result_seconds", False),
+                                         ("peak_rss_mb", False)):
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            regressed = change < -threshold if higher_is_better else change > threshold
+            rows.append((result["fixture"], result["config"], metric, old, new, change, regressed))
+    return rows
+
+
+def _load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='CSPAN Analyzer benchmarks')
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the benchmarks and save the results as JSON")
+    run_parser.add_argument('--output', type=str, default="bench.json", help='Results JSON path')
+    run_parser.add_argument('--fixtures', nargs="+", choices=sorted(FIXTURES), default=list(DEFAULT_FIXTURES))
+    run_parser.add_argument('--configs', nargs="+", choices=sorted(CONFIGS), default=list(DEFAULT_CONFIGS))
+    run_parser.add_argument('--fixture-dir', type=str, default=".bench_fixtures",
+                            help='Where generated fixture videos are cached')
+    run_parser.add_argument('--repeat', type=int, default=1, help='Runs per case; the median is kept')
+    run_parser.add_argument('--frame-skip', type=int, default=1, help='Process every Nth frame')
+    run_parser.add_argument('--model-dir', type=str, default=None, help='Local model directory for speech/context')
+    run_parser.add_argument('--speech', action='store_true', help='Include speech transcription')
+    run_parser.add_argument('--context', action='store_true', help='Include topic classification and summaries')
+    compare_parser = commands.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument('baseline', type=str)
+    compare_parser.add_argument('current', type=str)
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help='Relative change counted as a regression')
+    args = parser.parse_args()
+
+    if args.command == "run":
+        document = run_benchmarks(args.fixtures, args.configs, args.fixture_dir, args.repeat, args.frame_skip,
+                                  args.model_dir, args.speech, args.context)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+        print(f"Results saved to {args.output}")
+    else:
+        rows = compare(_load(args.baseline), _load(args.current), args.threshold)
+        for fixture, config, metric, old, new, change, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{fixture:>14} {config:<14} {metric:<22} {old:10.2f} -> {new:10.2f} ({change:+.1%}){flag}")
+        exit(1 if any(row[-1] for row in rows) else 0)
@@ -0,0 +1,102 @@
+import os
+import pickle
+import shutil
+import tempfile
+
+# Bump when the layout of checkpoint state changes so old checkpoints are ignored
+CHECKPOINT_VERSION = 1
+
+STATE_FILE = "state.pkl"
+
+
+class CheckpointStore:
+    def __init__(self, directory):
+        """Checkpoints of a long process_video run, so it can resume after a crash.
+
+        The run is split into frame ranges. When a range finishes, its output
+        video segment is already closed in the directory, and a part file
+        with the results added during the range (new pose rows, transcript
+        context requests, ...) is written next to it. Only then is the small
+        state file replaced to point at the part, so a crash at any moment
+        leaves the last completed range intact. Every file is written to a
+        temporary name and renamed into place.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, fingerprint):
+        """Return the saved state for a run with this fingerprint, or None.
+
+        The loaded parts are in state["part_data"], in order. A checkpoint
+        from a run with different settings or of a different video is
+        discarded.
+        """
+        state = self.read(STATE_FILE)
+        if state is None:
+            return None
+        if state.get("version") != CHECKPOINT_VERSION or state.get("fingerprint") != fingerprint:
+            print(f"Discarding checkpoint in {self.directory}: it was made with different settings")
+            self.clear()
+            return None
+        parts = []
+        for name in state["parts"]:
+            part = self.read(name)
+            if part is None:
+                print(f"Discarding checkpoint in {self.directory}: part {name} is missing")
+                self.clear()
+                return None
+            parts.append(part)
+        state["part_data"] = parts
+        state["segments"] = [os.path.join(self.directory, name) for name in state["segments"]]
+        return state
+
+    def save(self, fingerprint, next_frame, parts, segments, **extra):
+        """Record that every frame before next_frame is done; parts and segments are file names."""
+        state = {"version": CHECKPOINT_VERSION, "fingerprint": fingerprint, "next_frame": next_frame,
+                 "parts": list(parts), "segments": [os.path.basename(path) for path in segments], **extra}
+        self.write(STATE_FILE, state)
+
+    def save_part(self, index, part):
+        """Write the results added during range index and return the part's file name."""
+        name = f"part_{index:05d}.pkl"
+        self.write(name, part)
+        return name
+
+    def segment_path(self, index):
+        return os.path.join(self.directory, f"segment_{index:05d}.mp4")
+
+    def clear(self):
+        """Discard every checkpoint file and start over empty."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def remove(self):
+        """Remove the checkpoint directory once the run has finished."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def read(self, name):
+        """Unpickle file name from the checkpoint directory, or return None if it is missing or unreadable."""
+        try:
+            with open(os.path.join(self.directory, name), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Unreadable checkpoint file {name}: {e}")
+            return None
+
+    def write(self, name, value):
+        """Atomically pickle value to file name in the checkpoint directory."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.directory, name))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,154 @@
+import threading
+
+# Topic result used when classification fails
+UNKNOWN_TOPICS = {"labels": ["unknown"], "scores": [1.0]}
+
+
+class ContextAnalyzer:
+    def __init__(self, topic_classifier, summarizer, topics, memo=None, batch_size=8, background=False):
+        """Batched, memoized topic classification and summarization of speech text.
+
+        The frame loop only submit()s (text, timestamp) requests, which never
+        blocks on a transformer forward pass. Unique texts are run through the
+        zero-shot classifier and the summarizer in batches, either all at once
+        when flush() is called after the frame loop or continuously on a
+        background thread when background=True. Results are memoized by text,
+        so a segment that is still on screen at the next update is only
+        analyzed once. memo can be a dict shared with a persistent cache.
+        When a model fails, the fallback result (UNKNOWN_TOPICS, or the text
+        cut to 100 characters) is used for this analyzer only and kept out of
+        memo, so a later run tries the model again.
+        """
+        self.topic_classifier = topic_classifier
+        self.summarizer = summarizer
+        self.topics = topics
+        self.memo = {} if memo is None else memo
+        self.fallbacks = {}
+        self.batch_size = max(1, int(batch_size))
+        self.background = background
+
+        self.requests = []
+        self._pending = []  # unique texts waiting for inference, in arrival order
+        self._pending_set = set()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        """Start the background worker if background mode is enabled."""
+        if self.background and self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="context-analyzer", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, text, timestamp):
+        """Queue a context request; returns immediately."""
+        with self._cond:
+            self.requests.append((text, timestamp))
+            if text not in self.memo and text not in self.fallbacks and text not in self._pending_set:
+                self._pending.append(text)
+                self._pending_set.add(text)
+                self._cond.notify()
+
+    def pending_count(self):
+        """Number of unique texts still waiting for inference."""
+        with self._cond:
+            return len(self._pending)
+
+    def take_requests(self):
+        """Remove and return the queued requests without analyzing them."""
+        with self._cond:
+            requests, self.requests = self.requests, []
+            self._pending, self._pending_set = [], set()
+        return requests
+
+    def result(self, text):
+        """The (topics, summary) result for text, or None while it is still pending."""
+        return self.memo.get(text) or self.fallbacks.get(text)
+
+    def _next_batch(self):
+        batch = self._pending[:self.batch_size]
+        del self._pending[:self.batch_size]
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    return
+                batch = self._next_batch()
+            self.analyze_texts(batch)
+            with self._cond:
+                self._pending_set.difference_update(batch)
+
+    def analyze_texts(self, texts):
+        """Classify and summarize texts in batches; returns {text: (topics, summary)}."""
+        todo = list(dict.fromkeys(t for t in texts if t not in self.memo and t not in self.fallbacks))
+        for i in range(0, len(todo), self.batch_size):
+            batch = todo[i:i + self.batch_size]
+            topics, classified = self._classify(batch)
+            summaries, summarized = self._summarize(batch)
+            # Fallbacks from a failed model are not memoized, so they never reach a persistent cache
+            results = self.memo if classified and summarized else self.fallbacks
+            for text, topic_result, summary in zip(batch, topics, summaries):
+                results[text] = (topic_result, summary)
+        return {t: self.result(t) for t in texts if self.result(t) is not None}
+
+    def _classify(self, batch):
+        """Return (topic results, whether the classifier succeeded)."""
+        try:
+            results = self.topic_classifier(batch, candidate_labels=self.topics, batch_size=self.batch_size)
+            return ([results] if isinstance(results, dict) else list(results)), True
+        except Exception as e:
+            print(f"Error analyzing context: {e}")
+            return [UNKNOWN_TOPICS] * len(batch), False
+
+    def _summarize(self, batch):
+        """Return (summaries, whether the summarizer succeeded)."""
+        # Get a short summary if text is long enough
+        summaries = [""] * len(batch)
+        long_idx = [i for i, text in enumerate(batch) if len(text) > 100]
+        if not long_idx:
+            return summaries, True
+        long_texts = [batch[i] for i in long_idx]
+        try:
+            results = self.summarizer(long_texts, max_length=60, min_length=20, do_sample=False,
+                                      batch_size=self.batch_size)
+            for i, result in zip(long_idx, results):
+                # Pipelines return a list per input for batched calls on some versions
+                if isinstance(result, list):
+                    result = result[0]
+                summaries[i] = result['summary_text']
+        except Exception as e:
+            print(f"Error generating summary: {e}")
+            for i in long_idx:
+                summaries[i] = batch[i][:100] + "..."
+            return summaries, False
+        return summaries, True
+
+    def flush(self):
+        """Finish all queued requests and return their context dicts in timestamp order."""
+        if self._thread is not None:
+            with self._cond:
+                self._stopping = True
+                self._cond.notify_all()
+            self._thread.join()
+            self._thread = None
+
+        with self._cond:
+            requests, self.requests = self.requests, []
+            remaining, self._pending, self._pending_set = self._pending, [], set()
+        self.analyze_texts(remaining + [text for text, _ in requests])
+
+        contexts = []
+        for text, timestamp in sorted(requests, key=lambda r: r[1]):
+            topic_result, summary = self.result(text) or (UNKNOWN_TOPICS, "")
+            contexts.append({
+                "timestamp": timestamp,
+                "text": text,
+                "topics": topic_result,
+                "summary": summary
+            })
+        return contexts
@@ -1,48 +1,262 @@
 import cv2
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
 import numpy as np
-import torch
-from transformers import pipeline
 import pytube
-import whisper
 import matplotlib.pyplot as plt
 from datetime import datetime
+import math
 import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+from analysis_cache import AnalysisCache
+from analysis_store import AnalysisWriter, load_analysis
+from checkpoint import CheckpointStore
+from context_analyzer import ContextAnalyzer, UNKNOWN_TOPICS
+from event_detector import EventDetector, DEFAULT_RULES, keyword_rule
+from ffmpeg_io import FFmpegCapture, VideoIO, VIDEO_BACKENDS, DEFAULT_CODEC, DEFAULT_PRESET, ENCODER_PRESETS
+from frame_pipeline import FramePipeline
+from inference_resize import InferenceResizer, fit_size, parse_size
+from live_stream import LiveAnalyzer, DEFAULT_WINDOW_SECONDS
+from metrics import Metrics, print_progress
+from model_registry import ModelRegistry, DEFAULT_SUMMARIZATION_MODEL, DEFAULT_ZERO_SHOT_MODEL
+from motion_gate import MotionGate, CUT, STATIC
+from multi_person import MultiPersonPose, landmark_box, primary_person
+from overlay_renderer import OverlayRenderer
+from pose_track import PoseTrack
+from speech_index import SpeechIndex
+from streaming_stats import MovementStats, SpeechStats
+from streaming_transcriber import StreamingTranscriber, FAILED_TRANSCRIPT_TEXT
+from timeline import TimelineEmitter, describe_window
+from transcript_search import TranscriptIndex
+from video_segments import concat_videos
 
 class CSPANAnalyzer:
-    def __init__(self, video_path=None, url=None):
-        """Initialize the CSPAN video analyzer with either a local path or YouTube URL."""
+    # What process_video writes to the output for frames skipped by frame_skip: "drop" leaves
+    # them out and lowers the output frame rate to match, "repeat" writes the last annotated
+    # frame again and "passthrough" writes the raw frame
+    SKIP_MODES = ("drop", "repeat", "passthrough")
+    
+    # When process_video runs the queued context analysis: in batches after the last frame, or
+    # on a worker thread while frames are processed. Deferred analysis holds every timeline
+    # window until the end, so stream the timeline with "background"
+    CONTEXT_MODES = ("deferred", "background")
+    
+    # Key landmarks marked with a dot (and labeled for the first five) by draw_pose
+    IMPORTANT_LANDMARKS = {
+        0: "Nose",
+        11: "L Shoulder",
+        12: "R Shoulder",
+        23: "L Hip",
+        24: "R Hip",
+        15: "L Wrist",
+        16: "R Wrist",
+        27: "L Ankle",
+        28: "R Ankle"
+    }
+    
+    # Define potential topics that might be discussed in CSPAN videos
+    POTENTIAL_TOPICS = [
+        "policy", "legislation", "economy", "healthcare", 
+        "foreign affairs", "national security", "election",
+        "budget", "infrastructure", "education", "immigration"
+    ]
+    
+    def __init__(self, video_path=None, url=None, cache_dir=None, cache_max_bytes=2 * 1024 ** 3,
+                 whisper_model="base", summarization_model=None, zero_shot_model=None, pose_complexity=2,
+                 enable_pose=True, enable_speech=True, enable_context=True, model_dir=None, registry=None,
+                 multi_person=False, detect_every=10, max_people=6, motion_gate=False,
+                 inference_size=None, letterbox=False, metrics=None, progress_callback=None, event_rules=None,
+                 search_index=None, video_io=None):
+        """Initialize the CSPAN video analyzer with either a local path or YouTube URL.
+
+        Models are not loaded here; the registry loads each one on first use
+        and shares it between analyzers (see ModelRegistry). The other options
+        turn on stages documented where they are implemented: cache_dir
+        (AnalysisCache), multi_person (MultiPersonPose), motion_gate
+        (MotionGate), inference_size and letterbox (InferenceResizer), metrics
+        and progress_callback (Metrics), event_rules (EventDetector),
+        search_index (TranscriptIndex) and video_io (VideoIO).
+        """
         self.video_path = video_path
         self.url = url
         
-        # Initialize MediaPipe pose estimator for multiple people
+        self.registry = registry or ModelRegistry(model_dir)
+        self.enable_pose = enable_pose
+        self.enable_speech = enable_speech
+        self.enable_context = enable_context
+        
+        # MediaPipe drawing helpers and pose estimator settings
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
+        self.pose_params = dict(
             static_image_mode=False,
-            model_complexity=2,  # Use higher complexity model for better accuracy
+            model_complexity=pose_complexity,  # Higher complexity is more accurate but slower
             smooth_landmarks=True,
             enable_segmentation=True,  # Enable segmentation for better person isolation
             min_detection_confidence=0.7,  # Higher detection confidence
             min_tracking_confidence=0.7   # Higher tracking confidence
         )
         
-        # Initialize speech recognition
-        print("Loading Whisper model...")
-        self.speech_model = whisper.load_model("base")
+        self.whisper_model_name = whisper_model
+        self.summarization_model_name = summarization_model or DEFAULT_SUMMARIZATION_MODEL
+        self.zero_shot_model_name = zero_shot_model or DEFAULT_ZERO_SHOT_MODEL
+        self._skeleton_colors = None
+        self._pose = None
+        self.multi_person = multi_person
+        self.multi_person_params = dict(detect_every=detect_every, max_people=max_people)
+        self._people_pose = None
+        self.motion_gate = MotionGate() if motion_gate else None
+        self.resizer = InferenceResizer(inference_size, letterbox)
+        self._speech_model = None
+        self._nlp = None
+        self._topic_classifier = None
         
-        # Initialize text analysis pipeline
-        print("Loading NLP pipeline...")
-        self.nlp = pipeline("summarization")
-        self.topic_classifier = pipeline("zero-shot-classification")
+        # Frame decoding and encoding backends
+        self.video_io = video_io or VideoIO()
+        self._frames_rgb = False
         
-        # Store analysis results
-        self.pose_data = []
-        self.speech_segments = []
+        # Overlay rendering with cached static layers and text layouts
+        self.renderer = OverlayRenderer()
+        self._output_size = None
+        
+        # Store analysis results. In multi-person mode person_tracks holds every person's landmarks
+        # by track ID and pose_data follows the largest person, usually the speaker; shot_boundaries
+        # are the cuts found by the motion gate
+        self.pose_data = PoseTrack()
+        self.person_tracks = {}
+        self.shot_boundaries = []
+        self.speech_segments = SpeechIndex()
         self.context_data = []
         self.output_video = None
         
+        # Events detected from the stable pose rows and transcript, if event rules are given
+        self.event_detector = EventDetector(event_rules) if event_rules is not None else None
+        self.events = []
+        self._event_pose = 0
+        self._event_speech = 0
+        
+        # Constant-memory movement and speech stats fed with the stable pose rows and new segments
+        self.movement_stats = MovementStats()
+        self.speech_stats = SpeechStats()
+        self._stats_pose = 0
+        self._stats_speech = 0
+        
+        # Cross-video transcript search index fed with new segments, if requested
+        self.search_index = TranscriptIndex(search_index) if search_index else None
+        self.search_video = None
+        self._indexed_speech = 0
+        
+        # Background transcriber when speech is transcribed while frames are processed
+        self.transcriber = None
+        
+        # Windowed timeline and columnar analysis files written while frames are processed, if requested
+        self.timeline = None
+        self._timeline_speech = 0
+        self.store = None
+        self._stored_speech = 0
+        self._stored_pose = 0
+        
+        # Stage timings and counters, reported with the progress every progress_interval frames
+        self.metrics = metrics or Metrics()
+        self.progress_callback = progress_callback or print_progress
+        self.progress_interval = 100
+        
+        # Persistent cache of stage results, plus what was loaded from it for this run
+        self.cache = AnalysisCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self._cached_pose = None
+        self._cached_people = None
+        self._context_memo = {}
+        self._checkpoint_marks = None
+        
+        # Batched context analysis stage fed by the frame loop; the pipelines
+        # are looked up on each call so they only load once there is text to analyze
+        self.context_stage = ContextAnalyzer(
+            self._timed(lambda: self.topic_classifier, "classify"),
+            self._timed(lambda: self.nlp, "summarize"),
+            self.POTENTIAL_TOPICS,
+            memo=self._context_memo
+        )
+    
+    def _timed(self, get_model, stage):
+        """Wrap a lazily loaded model so each call is timed as stage."""
+        def call(*args, **kwargs):
+            model = get_model()
+            with self.metrics.time(stage):
+                return model(*args, **kwargs)
+        return call
+    
+    @property
+    def pose(self):
+        """MediaPipe Pose estimator, created on first use."""
+        if self._pose is None:
+            self._pose = self.registry.pose(**self.pose_params)
+        return self._pose
+    
+    @pose.setter
+    def pose(self, value):
+        self._pose = value
+    
+    @property
+    def people_pose(self):
+        """Multi-person pose tracker, created on first use."""
+        if self._people_pose is None:
+            # Per-crop segmentation masks would not line up with the frame
+            params = dict(self.pose_params, enable_segmentation=False)
+            self._people_pose = MultiPersonPose(lambda: self.registry.pose(**params),
+                                                **self.multi_person_params)
+        return self._people_pose
+    
+    def set_pose_complexity(self, complexity):
+        """Switch the MediaPipe Pose model complexity; the new model is created on next use."""
+        if complexity == self.pose_params["model_complexity"]:
+            return
+        self.pose_params["model_complexity"] = complexity
+        if self._pose is not None:
+            self._pose.close()
+            self._pose = None
+        if self._people_pose is not None:
+            # New tracks get new IDs, like people entering the frame
+            self._people_pose.close()
+            self._people_pose = None
+    
+    @property
+    def speech_model(self):
+        """Whisper model, loaded on first use."""
+        if self._speech_model is None:
+            self._speech_model = self.registry.whisper(self.whisper_model_name)
+        return self._speech_model
+    
+    @speech_model.setter
+    def speech_model(self, value):
+        self._speech_model = value
+    
+    @property
+    def nlp(self):
+        """Summarization pipeline, loaded on first use."""
+        if self._nlp is None:
+            self._nlp = self.registry.summarizer(self.summarization_model_name)
+        return self._nlp
+    
+    @nlp.setter
+    def nlp(self, value):
+        self._nlp = value
+    
+    @property
+    def topic_classifier(self):
+        """Zero-shot topic classification pipeline, loaded on first use."""
+        if self._topic_classifier is None:
+            self._topic_classifier = self.registry.zero_shot(self.zero_shot_model_name)
+        return self._topic_classifier
+    
+    @topic_classifier.setter
+    def topic_classifier(self, value):
+        self._topic_classifier = value
+        
     def download_from_youtube(self):
         """Download video from YouTube if URL is provided."""
         if not self.url:
@@ -59,101 +273,1002 @@ class CSPANAnalyzer:
             print(f"Error downloading video: {e}")
             return False
     
-    def process_video(self, output_path="cspan_analyzed.mp4", frame_skip=1):
-        """Process the video with all analysis components."""
+    def process_video(self, output_path="cspan_analyzed.mp4", frame_skip=1, pipelined=False, queue_size=8,
+                      skip_mode="drop", seek_threshold=None, stream_transcript=False, context_mode="deferred",
+                      timeline_path=None, timeline_window=15.0, output_size=None, render=True, data_dir=None,
+                      checkpoint_dir=None, checkpoint_seconds=300.0):
+        """Process the video with all analysis components.
+
+        frame_skip analyzes every frame_skip-th frame; skip_mode decides what
+        the output shows for the others (see SKIP_MODES and _iter_frames).
+        pipelined=True runs decoding, pose and annotation as a FramePipeline
+        with queue_size frames between stages. stream_transcript=True
+        transcribes on a background StreamingTranscriber while frames are
+        analyzed, and context_mode picks when the ContextAnalyzer runs.
+
+        The results can also be streamed out as they are produced: a
+        TimelineEmitter to timeline_path, and columnar shards to data_dir (see
+        AnalysisWriter; render_analysis() draws the video from them later).
+        render=False skips annotating and encoding, and output_size resizes
+        the output (see fit_size). With checkpoint_dir set, the video is
+        processed in checkpoint_seconds ranges that a rerun resumes from (see
+        CheckpointStore).
+        """
+        if skip_mode not in self.SKIP_MODES:
+            raise ValueError(f"skip_mode must be one of {self.SKIP_MODES}, got {skip_mode!r}")
+        if context_mode not in self.CONTEXT_MODES:
+            raise ValueError(f"context_mode must be one of {self.CONTEXT_MODES}, got {context_mode!r}")
+        
         if not self.video_path:
             if not self.download_from_youtube():
                 print("No video to process")
                 return False
-                
-        cap = cv2.VideoCapture(self.video_path)
+        
+        self.metrics.reset()
+        cap = self._open_capture(rgb=not render)
         fps = cap.get(cv2.CAP_PROP_FPS)
         frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         
-        # Create output video writer
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_path, fourcc, fps, (frame_width, frame_height))
+        out_size = fit_size(output_size, frame_width, frame_height)
+        out = None
+        if not render:
+            # Nothing is written, so skipped frames never need decoding
+            skip_mode = "drop"
+        elif not checkpoint_dir:
+            out = self._open_writer(output_path, fps, frame_skip, skip_mode, out_size or (frame_width, frame_height))
         
-        # Batch audio for speech recognition
-        print("Extracting audio for speech recognition...")
-        self.extract_audio_from_video()
+        checkpoint = resumed = None
+        if checkpoint_dir:
+            checkpoint = CheckpointStore(checkpoint_dir)
+            fingerprint = self._checkpoint_fingerprint(frame_skip=frame_skip, skip_mode=skip_mode,
+                                                       output_size=out_size, render=render)
+            resumed = checkpoint.load(fingerprint)
+            if resumed is not None:
+                self._restore_checkpoint(resumed, checkpoint)
+                print(f"Resuming from frame {resumed['next_frame']} of {total_frames}")
         
-        frame_count = 0
-        last_speech_update = 0
-        current_speech = "Processing speech..."
-        speech_update_interval = int(fps * 3)  # Update speech every 3 seconds
+        if resumed is None or resumed["transcript"] is None:
+            # Batch audio for speech recognition
+            print("Extracting audio for speech recognition...")
+            self.extract_audio_from_video(streaming=stream_transcript, duration=total_frames / fps if fps else None)
+        
+        # Only single-person tracks are cached
+        cacheable = self.enable_pose and not self.multi_person
+        pose_key = self._cache_key("pose", frame_skip=frame_skip, motion_gate=self.motion_gate is not None,
+                                   inference_size=self.resizer.size, letterbox=self.resizer.letterbox,
+                                   **self.pose_params) if cacheable else None
+        cached_pose = self.cache.get(pose_key) if pose_key else None
+        if cached_pose is not None:
+            print(f"Using {len(cached_pose)} cached pose frames instead of running pose estimation")
+            self._cached_pose = cached_pose
+        self._load_cached_context()
+        self.context_stage.background = context_mode == "background"
+        self.context_stage.start()
+        if data_dir:
+            self.start_store(data_dir, fps=fps, total_frames=total_frames, width=frame_width,
+                             height=frame_height, frame_skip=frame_skip)
+            if resumed is not None:
+                self._store_existing()
+            timeline_path = timeline_path or os.path.join(data_dir, "timeline.jsonl")
+        self._start_events()
+        self._start_stats()
+        self._indexed_speech = 0
+        if timeline_path:
+            self.start_timeline(timeline_path, timeline_window)
+            if resumed is not None:
+                # Windows before the resume point are rebuilt from the restored results; the
+                # restored pose rows are fed with the first frame's timeline update
+                for text, timestamp in self.context_stage.requests:
+                    self.timeline.add_text(timestamp, text)
         
         print(f"Processing video with {total_frames} frames at {fps} FPS")
+        frame_options = dict(frame_skip=frame_skip, pipelined=pipelined, queue_size=queue_size, skip_mode=skip_mode,
+                             seek_threshold=seek_threshold, output_size=out_size)
+        try:
+            if checkpoint is None:
+                self._process_frames(cap, out, fps, total_frames, **frame_options)
+            else:
+                cap.release()
+                segments = self._process_checkpointed(checkpoint, fingerprint, resumed, fps, total_frames,
+                                                      int(checkpoint_seconds * fps), render,
+                                                      out_size or (frame_width, frame_height), **frame_options)
+                if render:
+                    concat_videos(segments, output_path)
+        finally:
+            self._cached_pose = None
+        if self.motion_gate is not None:
+            print(f"Motion gate: {self.motion_gate.stats()}")
         
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
+        if self.transcriber is not None:
+            # Finish the transcript so the analytics see every segment
+            self.transcriber.join()
+            print(f"Speech transcription complete. Found {len(self.speech_segments)} segments.")
+            if self.transcriber.error is None:
+                self._store_cached_transcript()
+        if self.search_index is not None:
+            self._update_search_index()
+        
+        if pose_key and cached_pose is None:
+            self.cache.put(pose_key, self.pose_data)
+        
+        print("Analyzing speech context...")
+        contexts = self.context_stage.flush()
+        self.context_data.extend(contexts)
+        self._store_cached_context()
+        self._finish_events()
+        self._finish_stats()
+        self._finish_timeline(total_frames / fps if fps else None)
+        self._finish_store(contexts)
+        if checkpoint is not None:
+            checkpoint.remove()
+        
+        return self._report_outputs(output_path if render else None, data_dir)
+    
+    def _checkpoint_fingerprint(self, **run_options):
+        """Everything that must match for a checkpoint to be resumed."""
+        stat = os.stat(self.video_path)
+        return {
+            "video": os.path.abspath(self.video_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "pose_params": dict(self.pose_params),
+            "multi_person": self.multi_person and dict(self.multi_person_params),
+            "motion_gate": self.motion_gate is not None,
+            "inference_size": self.resizer.size,
+            "letterbox": self.resizer.letterbox,
+            "stages": (self.enable_pose, self.enable_speech, self.enable_context),
+            "whisper_model": self.whisper_model_name,
+            # Segments are joined without re-encoding, so they must all be encoded alike
+            "encoder": self.video_io.encoding,
+            **run_options,
+        }
+    
+    def _restore_checkpoint(self, state, checkpoint):
+        """Load the results of the ranges a checkpointed run already finished."""
+        for part in state["part_data"]:
+            self.pose_data.extend(part["pose_data"])
+            for track_id, track in part["person_tracks"].items():
+                self.person_tracks.setdefault(track_id, PoseTrack(capacity=256)).extend(track)
+            self.shot_boundaries.extend(part["shot_boundaries"])
+            self._context_memo.update(part["context_memo"])
+            for text, timestamp in part["context_requests"]:
+                self.context_stage.submit(text, timestamp)
+        if state["transcript"] is not None:
+            self.speech_segments.extend(checkpoint.read(state["transcript"]))
+            print(f"Restored {len(self.speech_segments)} speech segments from the checkpoint")
+        if self.multi_person:
+            # Tracks found after the resume point must not reuse restored IDs
+            self.people_pose.next_id = state["next_person_id"]
+    
+    def _mark_checkpoint(self):
+        self._checkpoint_marks = {
+            "pose": len(self.pose_data),
+            "people": {track_id: len(track) for track_id, track in self.person_tracks.items()},
+            "shots": len(self.shot_boundaries),
+            "requests": len(self.context_stage.requests),
+            "memo": len(self._context_memo),
+        }
+    
+    def _checkpoint_part(self):
+        """Collect the results added since the last checkpoint."""
+        marks = self._checkpoint_marks
+        memo = dict(self._context_memo)  # A background context thread may be adding to it
+        part = {
+            "pose_data": self.pose_data[marks["pose"]:],
+            "person_tracks": {track_id: track[marks["people"].get(track_id, 0):]
+                              for track_id, track in self.person_tracks.items()},
+            "shot_boundaries": self.shot_boundaries[marks["shots"]:],
+            "context_requests": self.context_stage.requests[marks["requests"]:],
+            "context_memo": dict(list(memo.items())[marks["memo"]:]),
+        }
+        self._mark_checkpoint()
+        return part
+    
+    def _process_checkpointed(self, checkpoint, fingerprint, resumed, fps, total_frames, range_frames, render,
+                              frame_size, **options):
+        """Process the video range by range, checkpointing after each; returns the output segments.
+
+        Each range starts fresh like a chunk of process_video_chunked (speech
+        lookup, motion gate, person tracks), so a resumed run gives the same
+        results as one that was never interrupted.
+        """
+        frame_skip = options["frame_skip"]
+        # Ranges start on analyzed frames, so a resumed run analyzes the same frames
+        range_frames = max(frame_skip, -(-range_frames // frame_skip) * frame_skip)
+        start = resumed["next_frame"] if resumed else 0
+        parts = list(resumed["parts"]) if resumed else []
+        segments = list(resumed["segments"]) if resumed else []
+        transcript = resumed["transcript"] if resumed else None
+        self._mark_checkpoint()
+        
+        while total_frames <= 0 or start < total_frames:
+            end = start + range_frames
+            if end >= total_frames:
+                end = None  # Read the last range to the real end of the video
+            if self.multi_person:
+                # Every range starts detecting afresh, as a resumed run has to
+                self.people_pose.reset()
+            cap = self._open_capture(rgb=not render)
+            out = None
+            if render:
+                segment = checkpoint.segment_path(len(segments))
+                out = self._open_writer(segment, fps, frame_skip, options["skip_mode"], frame_size)
+            self._process_frames(cap, out, fps, total_frames, start_frame=start, end_frame=end, **options)
+            if render:
+                segments.append(segment)
+            
+            transcriber = self.transcriber
+            if (transcript is None and self.enable_speech
+                    and (transcriber is None or (transcriber.done and transcriber.error is None))):
+                transcript = "transcript.pkl"
+                checkpoint.write(transcript, list(self.speech_segments))
+            parts.append(checkpoint.save_part(len(parts), self._checkpoint_part()))
+            start = self._frames_read if end is None else end
+            checkpoint.save(fingerprint, start, parts, segments, transcript=transcript,
+                            next_person_id=self.people_pose.next_id if self.multi_person else None)
+            if end is None:
                 break
-                
+        return segments
+    
+    def _report_outputs(self, output_path, data_dir):
+        self.output_video = output_path
+        if output_path:
+            print(f"Analysis complete. Output video saved to {output_path}")
+        if data_dir:
+            print(f"Analysis complete. Results saved to {data_dir}")
+        elif not output_path:
+            print("Analysis complete.")
+        return True
+    
+    def process_video_chunked(self, output_path="cspan_analyzed.mp4", frame_skip=1, workers=None,
+                              chunk_seconds=None, skip_mode="drop", seek_threshold=None,
+                              timeline_path=None, timeline_window=15.0, output_size=None, render=True,
+                              data_dir=None):
+        """Process the video as parallel time ranges across a pool of worker processes.
+
+        The video is split into chunks (one per worker, or chunk_seconds long)
+        whose boundaries fall on analyzed frames. Each worker runs its own
+        MediaPipe Pose over its range and writes an annotated segment. Speech is
+        transcribed once up front and context analysis runs here afterwards, so
+        workers only need the pose model. pose_data is merged in timestamp order
+        and the segments are joined into output_path. With multi_person, a
+        person crossing a chunk boundary gets a new track ID. The timeline, if
+        timeline_path is set, is written once all chunks are merged. render and
+        data_dir work as in process_video, except that the data is written
+        after the merge rather than streamed.
+        """
+        if skip_mode not in self.SKIP_MODES:
+            raise ValueError(f"skip_mode must be one of {self.SKIP_MODES}, got {skip_mode!r}")
+        
+        if not self.video_path:
+            if not self.download_from_youtube():
+                print("No video to process")
+                return False
+        
+        self.metrics.reset()
+        self._start_stats()
+        cap = cv2.VideoCapture(self.video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        
+        workers = workers or os.cpu_count() or 1
+        if chunk_seconds:
+            chunk_frames = int(chunk_seconds * fps)
+        else:
+            chunk_frames = -(-total_frames // workers)
+        # Align chunk boundaries with the frame_skip grid so every chunk analyzes the same frames
+        chunk_frames = max(frame_skip, -(-chunk_frames // frame_skip) * frame_skip)
+        
+        print("Extracting audio for speech recognition...")
+        self.extract_audio_from_video()
+        
+        segment_dir = f"{output_path}.chunks"
+        if render:
+            os.makedirs(segment_dir, exist_ok=True)
+        jobs = []
+        for i, start in enumerate(range(0, total_frames, chunk_frames)):
+            jobs.append({
+                "video_path": self.video_path,
+                "output_path": os.path.join(segment_dir, f"chunk_{i:04d}.mp4") if render else None,
+                "start_frame": start,
+                "end_frame": min(start + chunk_frames, total_frames),
+                "frame_skip": frame_skip,
+                "skip_mode": skip_mode,
+                "seek_threshold": seek_threshold,
+                "output_size": output_size,
+                "analyzer_options": {
+                    "pose_complexity": self.pose_params["model_complexity"],
+                    "enable_pose": self.enable_pose,
+                    "enable_context": self.enable_context,
+                    "model_dir": self.registry.model_dir,
+                    "multi_person": self.multi_person,
+                    "motion_gate": self.motion_gate is not None,
+                    "inference_size": self.resizer.size,
+                    "letterbox": self.resizer.letterbox,
+                    "video_io": self.video_io,
+                    **self.multi_person_params,
+                },
+                "speech_segments": list(self.speech_segments),
+            })
+        
+        print(f"Processing {total_frames} frames in {len(jobs)} chunks across {workers} workers")
+        
+        # Spawn fresh interpreters; MediaPipe and torch are not fork-safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = list(pool.map(_process_chunk, jobs))
+        
+        # Stitch results back together in timestamp order
+        for r in results:
+            self.metrics.merge(r["metrics"])
+        self.pose_data.extend(PoseTrack.concatenate([r["pose_data"] for r in results]))
+        # Chunks' movement stats merge into those of the whole video; speech was transcribed here
+        for r in results:
+            self.movement_stats.merge(r["movement_stats"])
+        self._stats_pose = len(self.pose_data)
+        self._finish_stats()
+        self.shot_boundaries.extend(b for r in results for b in r["shot_boundaries"])
+        # Track IDs restart in every chunk, so number each chunk's tracks after the previous ones
+        for r in results:
+            offset = max(self.person_tracks, default=-1) + 1
+            for track_id, track in sorted(r["person_tracks"].items()):
+                self.person_tracks[offset + track_id] = track
+        if self.search_index is not None:
+            self._update_search_index()
+        self._load_cached_context()
+        for text, timestamp in (c for r in results for c in r["context_requests"]):
+            self.context_stage.submit(text, timestamp)
+        print("Analyzing speech context...")
+        self.context_data.extend(self.context_stage.flush())
+        self._store_cached_context()
+        if data_dir:
+            os.makedirs(data_dir, exist_ok=True)
+            timeline_path = timeline_path or os.path.join(data_dir, "timeline.jsonl")
+        if timeline_path:
+            # Workers do not see the whole timeline, so build it from the merged results
+            self.start_timeline(timeline_path, timeline_window)
+            for context in self.context_data:
+                self.timeline.add_text(context["timestamp"], context["text"])
+        if self.event_detector is not None:
+            self.events = []
+            self._add_events(self.detect_events())
+        self._finish_timeline(total_frames / fps if fps else None)
+        if data_dir:
+            self.save_analysis(data_dir, fps=fps, total_frames=total_frames, frame_skip=frame_skip)
+        
+        if render:
+            concat_videos([r["output_path"] for r in results], output_path)
+            for r in results:
+                os.remove(r["output_path"])
+            os.rmdir(segment_dir)
+        
+        return self._report_outputs(output_path if render else None, data_dir)
+    
+    def render_analysis(self, data_dir, output_path="cspan_analyzed.mp4", skip_mode="drop", pipelined=False,
+                        queue_size=8, output_size=None):
+        """Render the annotated video from analysis saved with data_dir, without analyzing again.
+
+        The source video is self.video_path or the one recorded in the data.
+        Frames get the stored landmarks (every tracked person's in
+        multi-person mode) and transcript, so no model is loaded. The stored
+        frame_skip decides which frames are drawn on.
+        """
+        if skip_mode not in self.SKIP_MODES:
+            raise ValueError(f"skip_mode must be one of {self.SKIP_MODES}, got {skip_mode!r}")
+        data = load_analysis(data_dir)
+        meta = data["meta"]
+        self.video_path = self.video_path or meta.get("video_path")
+        if not self.video_path:
+            print(f"No video to render; {data_dir} does not name one")
+            return False
+        frame_skip = meta.get("frame_skip", 1)
+        
+        cap = self._open_capture()
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        out_size = fit_size(output_size, *frame_size)
+        out = self._open_writer(output_path, fps, frame_skip, skip_mode, out_size or frame_size)
+        
+        # The frame loop rebuilds pose_data and person_tracks from the stored ones
+        self.pose_data = PoseTrack()
+        self.person_tracks = {}
+        self.speech_segments = SpeechIndex(data["speech_segments"])
+        self._start_stats()
+        self.context_data = data["context_data"]
+        self._cached_pose = data["pose_data"]
+        self._cached_people = data["person_tracks"] or None
+        enable_context = self.enable_context
+        self.enable_context = False  # Context results are already in the data
+        print(f"Rendering {total_frames} frames from {data_dir}")
+        try:
+            self._process_frames(cap, out, fps, total_frames, frame_skip=frame_skip, pipelined=pipelined,
+                                 queue_size=queue_size, skip_mode=skip_mode, output_size=out_size)
+        finally:
+            self._cached_pose = None
+            self._cached_people = None
+            self.enable_context = enable_context
+        
+        self.output_video = output_path
+        print(f"Rendering complete. Output video saved to {output_path}")
+        return True
+    
+    def start_timeline(self, path=None, window_seconds=15.0, on_window=None):
+        """Start emitting the analysis timeline in window_seconds windows (see TimelineEmitter)."""
+        self.timeline = TimelineEmitter(window_seconds, path=path, on_window=on_window,
+                                        context_lookup=self.context_stage.result)
+        self._timeline_pose = 0
+        self._timeline_speech = 0
+        return self.timeline
+    
+    def _update_timeline(self, timestamp):
+        """Feed new stable pose rows and transcript segments to the timeline; emit the windows before timestamp."""
+        # Read how far the transcript reaches before reading its segments, so none are missed
+        covered = self.transcriber.transcribed_until if self.transcriber is not None else math.inf
+        stable = self._stable_pose_rows()
+        if stable > self._timeline_pose:
+            track = self.pose_data
+            self.timeline.add_poses(track.timestamps[self._timeline_pose:stable],
+                                    track.landmarks[self._timeline_pose:stable])
+            self._timeline_pose = stable
+        segments = self.speech_segments
+        while self._timeline_speech < len(segments):
+            self.timeline.add_speech(segments[self._timeline_speech])
+            self._timeline_speech += 1
+        until = min(timestamp, covered)
+        if self._timeline_pose < len(self.pose_data):
+            # Hold the windows of rows the motion gate has yet to interpolate
+            until = min(until, self.pose_data.timestamps[self._timeline_pose])
+        if self.event_detector is not None:
+            # Hold windows that events still being detected may start in
+            if self._event_pose < len(self.pose_data):
+                until = min(until, self.pose_data.timestamps[self._event_pose])
+            if self.event_detector.pending_since is not None:
+                until = min(until, self.event_detector.pending_since)
+        self.timeline.advance(until)
+    
+    def _finish_timeline(self, duration=None):
+        if self.timeline is None:
+            return
+        self._last_inferred_row = None
+        self._update_timeline(duration or 0.0)
+        windows = self.timeline.close(duration)
+        print(f"Timeline written with {len(windows)} windows.")
+        self.timeline = None
+    
+    def start_store(self, path, **meta):
+        """Start streaming the analysis to columnar files in directory path (see AnalysisWriter)."""
+        self.store = AnalysisWriter(path)
+        self._stored_pose = len(self.pose_data)
+        self._stored_speech = 0
+        self.store.write_meta(video_path=self.video_path, pose_complexity=self.pose_params["model_complexity"],
+                              multi_person=self.multi_person, whisper_model=self.whisper_model_name, **meta)
+        return self.store
+    
+    def _stable_pose_rows(self):
+        """Number of pose rows that will not change any more."""
+        # Rows held by the motion gate after the last inferred frame are still to be interpolated
+        if self.motion_gate is not None and self._last_inferred_row is not None:
+            return self._last_inferred_row + 1
+        return len(self.pose_data)
+    
+    def _update_store(self):
+        """Write the pose rows that are final and the transcript segments not written yet."""
+        stable = self._stable_pose_rows()
+        if stable > self._stored_pose:
+            track = self.pose_data
+            self.store.add_poses(track.frames[self._stored_pose:stable], track.timestamps[self._stored_pose:stable],
+                                 track.landmarks[self._stored_pose:stable])
+            self._stored_pose = stable
+        segments = self.speech_segments
+        while self._stored_speech < len(segments):
+            self.store.add_speech(segments[self._stored_speech])
+            self._stored_speech += 1
+    
+    def _finish_store(self, contexts=(), **meta):
+        if self.store is None:
+            return
+        self._last_inferred_row = None
+        self._update_store()
+        for context in contexts:
+            self.store.add_context(context)
+        if self.motion_gate is not None:
+            meta["motion_gate"] = self.motion_gate.stats()
+        if self.event_detector is not None:
+            meta["events"] = self.events
+        self.store.close(shot_boundaries=self.shot_boundaries, **meta)
+        self.store = None
+    
+    def save_analysis(self, path, **meta):
+        """Write everything analyzed so far to directory path in one go, in the data_dir layout."""
+        self.start_store(path, **meta)
+        self._store_existing()
+        self._finish_store(self.context_data)
+    
+    def _store_existing(self):
+        """Queue the pose rows and person tracks analyzed before the store was started."""
+        self._stored_pose = 0
+        for track_id, track in self.person_tracks.items():
+            for row in track:
+                self.store.add_person(track_id, row["frame"], row["timestamp"], row["landmarks"])
+    
+    def detect_events(self, rules=None):
+        """Return the events in everything analyzed so far, by rules or else the analyzer's event rules."""
+        if rules is None and self.event_detector is not None:
+            rules = self.event_detector.rules
+        return EventDetector(rules).detect(self.pose_data, self.speech_segments)
+    
+    def _start_events(self):
+        if self.event_detector is None:
+            return
+        # Rows restored from a checkpoint are detected on like new ones
+        self.event_detector.reset()
+        self.events = []
+        self._event_pose = 0
+        self._event_speech = 0
+    
+    def _update_events(self):
+        """Feed the stable pose rows and new transcript segments to the event detector."""
+        detector = self.event_detector
+        found = []
+        stable = self._stable_pose_rows()
+        if stable > self._event_pose:
+            track = self.pose_data
+            found += detector.add_poses(track.timestamps[self._event_pose:stable],
+                                        track.landmarks[self._event_pose:stable])
+            self._event_pose = stable
+        segments = self.speech_segments
+        while self._event_speech < len(segments):
+            found += detector.add_speech(segments[self._event_speech])
+            self._event_speech += 1
+        self._add_events(found)
+    
+    def _finish_events(self):
+        if self.event_detector is None:
+            return
+        self._last_inferred_row = None
+        self._update_events()
+        self._add_events(self.event_detector.flush())
+        self.events.sort(key=lambda e: e["start"])
+        print(f"Detected {len(self.events)} events.")
+    
+    def _add_events(self, events):
+        self.events.extend(events)
+        if self.timeline is not None:
+            for event in events:
+                details = {k: v for k, v in event.items() if k not in ("type", "start")}
+                self.timeline.add_event(event["start"], event["type"], **details)
+    
+    def _start_stats(self):
+        self.movement_stats = MovementStats()
+        self.speech_stats = SpeechStats()
+        self._stats_pose = 0
+        self._stats_speech = 0
+    
+    def _update_stats(self):
+        """Add the stable pose rows and new transcript segments to the streaming stats."""
+        stable = self._stable_pose_rows()
+        if stable > self._stats_pose:
+            track = self.pose_data
+            self.movement_stats.add(track.timestamps[self._stats_pose:stable],
+                                    track.landmarks[self._stats_pose:stable])
+            self._stats_pose = stable
+        segments = self.speech_segments
+        while self._stats_speech < len(segments):
+            self.speech_stats.add(segments[self._stats_speech])
+            self._stats_speech += 1
+    
+    def _finish_stats(self):
+        self._last_inferred_row = None
+        self._update_stats()
+    
+    def current_stats(self, now=None):
+        """Whole-video, rolling (window ending at now) and decaying metrics of everything analyzed so far."""
+        return {
+            "movement": self.movement_stats.summary(),
+            "rolling_movement": self.movement_stats.rolling(now),
+            "recent_movement": self.movement_stats.recent(),
+            "speech": self.speech_stats.summary(),
+            "rolling_words_per_minute": self.speech_stats.rolling(now),
+            "recent_words_per_minute": self.speech_stats.recent(),
+        }
+    
+    def _update_search_index(self):
+        """Add the transcript segments not indexed yet to the search index."""
+        segments = self.speech_segments
+        if self._indexed_speech >= len(segments):
+            return
+        video = self.search_video or (os.path.abspath(self.video_path) if self.video_path else self.url)
+        new = [s for s in segments[self._indexed_speech:] if s["text"] != FAILED_TRANSCRIPT_TEXT]
+        self.search_index.add_segments(video, new)
+        self._indexed_speech = len(segments)
+    
+    def _cache_key(self, stage, **params):
+        """Return the cache key for a stage's output on the current video, or None without a cache."""
+        if self.cache is None or not self.video_path:
+            return None
+        return self.cache.make_key(stage, self.cache.video_hash(self.video_path), **params)
+    
+    def _store_cached_transcript(self):
+        key = self._cache_key("transcript", model=self.whisper_model_name)
+        if key:
+            self.cache.put(key, list(self.speech_segments))
+    
+    def _context_cache_key(self):
+        return self._cache_key(
+            "context",
+            summarizer=self.summarization_model_name,
+            classifier=self.zero_shot_model_name,
+            topics=self.POTENTIAL_TOPICS
+        )
+    
+    def _load_cached_context(self):
+        key = self._context_cache_key()
+        cached = self.cache.get(key) if key else None
+        if cached:
+            print(f"Loaded {len(cached)} cached context results")
+            self._context_memo.update(cached)
+    
+    def _store_cached_context(self):
+        key = self._context_cache_key()
+        if key and self._context_memo:
+            self.cache.put(key, dict(self._context_memo))
+    
+    def _pose_results_from_landmarks(self, landmarks):
+        """Rebuild a pose result object from stored [x, y, z, visibility] landmarks."""
+        pose_landmarks = None
+        if landmarks is not None:
+            pose_landmarks = landmark_pb2.NormalizedLandmarkList()
+            for x, y, z, visibility in landmarks:
+                pose_landmarks.landmark.add(x=x, y=y, z=z, visibility=visibility)
+        return SimpleNamespace(pose_landmarks=pose_landmarks, segmentation_mask=None)
+    
+    def _open_capture(self, rgb=False, source=None):
+        """Open source (default: the video) with the video_io decoder; rgb asks ffmpeg for RGB frames."""
+        return self.video_io.open_capture(source or self.video_path, rgb=rgb)
+    
+    def _open_writer(self, output_path, fps, frame_skip, skip_mode, frame_size):
+        """Create the output video writer for the given skip settings."""
+        # Dropping skipped frames lowers the output frame rate so the video
+        # still plays back at the right speed
+        output_fps = fps / frame_skip if skip_mode == "drop" else fps
+        return self.video_io.open_writer(output_path, output_fps, frame_size)
+    
+    def _process_frames(self, cap, out, fps, total_frames, frame_skip=1, pipelined=False, queue_size=8,
+                        skip_mode="drop", seek_threshold=None, start_frame=0, end_frame=None, output_size=None):
+        """Analyze, annotate and write frames start_frame..end_frame, then release cap and out.
+
+        output_size is the (width, height) frames are rendered and written at, or None for the input size.
+        With out=None frames are only analyzed, never annotated or written.
+        """
+        self._reset_frame_state(fps, start_frame)
+        self._output_size = output_size
+        
+        last_annotated = None
+        next_report = (start_frame // self.progress_interval + 1) * self.progress_interval
+        pipeline = None
+        metrics = self.metrics
+        
+        def analyze_stage(item):
+            frame_count, frame, analyze = item
+            if not analyze:
+                return item  # Skipped frames pass through untouched
+            with metrics.time("analyze_frame"):
+                return self._analyze_frame(frame_count, frame)
+        
+        def annotate_stage(item):
+            if len(item) == 3:
+                frame_count, frame, analyzed = item
+                if frame is not None and output_size is not None:
+                    frame = cv2.resize(frame, output_size, interpolation=cv2.INTER_AREA)  # "passthrough" mode
+                return frame_count, frame, analyzed
+            with metrics.time("annotate_frame"):
+                frame_count, annotated_frame = self._annotate_frame(*item)
+            return frame_count, annotated_frame, True
+        
+        def write_frame(item):
+            nonlocal last_annotated, next_report
+            frame_count = item[0]
+            if out is not None:
+                _, frame, analyzed = item
+                if analyzed:
+                    last_annotated = frame
+                elif frame is None:
+                    frame = last_annotated  # "repeat" mode
+                if frame is not None:
+                    with metrics.time("write"):
+                        out.write(frame)
+                    metrics.increment("frames_written")
+            if frame_count + 1 >= next_report:
+                self._report_progress(frame_count + 1, total_frames, pipeline)
+                next_report = ((frame_count + 1) // self.progress_interval + 1) * self.progress_interval
+        
+        frames = self._iter_frames(cap, frame_skip, skip_mode, seek_threshold, start_frame, end_frame)
+        stages = [("pose", analyze_stage)]
+        if out is not None:
+            stages.append(("annotate", annotate_stage))
+        
+        if isinstance(cap, FFmpegCapture):
+            # Frames are annotated in their ring slot, so the ring must outlast
+            # every frame in flight plus the last annotated one "repeat" mode rewrites
+            in_flight = FramePipeline.max_in_flight(len(stages), queue_size) if pipelined else 1
+            cap.reserve(in_flight + 2)
+            self._frames_rgb = cap.pix_fmt == "rgb24"
+        
+        try:
+            if pipelined:
+                pipeline = FramePipeline(frames, stages, write_frame, queue_size=queue_size)
+                pipeline.run()
+            else:
+                for item in frames:
+                    for _, stage in stages:
+                        item = stage(item)
+                    write_frame(item)
+        finally:
+            # Release resources
+            cap.release()
+            if out is not None:
+                out.release()
+        end = end_frame if end_frame is not None else total_frames
+        self._report_progress(min(self._frames_read, end) if end else self._frames_read, total_frames)
+    
+    def _report_progress(self, frames, total_frames=None, pipeline=None):
+        """Sample the queue depths, then call progress_callback and notify the metrics' observers."""
+        if pipeline is not None:
+            for stage, depth in pipeline.queue_depths().items():
+                self.metrics.set_gauge("queue_depth", depth, stage=stage)
+        self.metrics.set_gauge("context_backlog", self.context_stage.pending_count())
+        elapsed = time.perf_counter() - self._progress_start
+        self.progress_callback({
+            "frames": frames,
+            "total_frames": total_frames,
+            "elapsed_seconds": elapsed,
+            "frames_per_second": (frames - self._progress_origin) / elapsed if elapsed > 0 else 0.0,
+        })
+        self.metrics.notify()
+    
+    def _reset_frame_state(self, fps, start_frame=0, wait_for_speech=True):
+        """Prepare the per-run state _analyze_frame uses.
+
+        With wait_for_speech=False, frames never wait for a streaming
+        transcript to catch up, which keeps live analysis real-time.
+        """
+        self._fps = fps
+        self._speech_update_interval = max(1, int(fps * 3))  # Update speech every 3 seconds
+        # A chunk starting mid-video looks up its speech right away
+        self._last_speech_update = start_frame - self._speech_update_interval if start_frame else 0
+        self._current_speech = "Processing speech..."
+        self._speech_cursor = self.speech_segments.cursor()
+        self._wait_for_speech = wait_for_speech
+        self._progress_start = time.perf_counter()
+        self._progress_origin = start_frame
+        # Last inferred pose, reused by the motion gate on static frames
+        self._last_pose_results = None
+        self._last_inferred_row = None
+        self._frames_rgb = False
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
+    
+    def _iter_frames(self, cap, frame_skip=1, skip_mode="drop", seek_threshold=None, start_frame=0, end_frame=None):
+        """Yield (frame_count, frame, analyze) for every frame the output needs.
+
+        Analyzed frames are fully decoded with read(). Skipped frames are only
+        grab()bed, which advances the decoder without building a BGR image,
+        except in "passthrough" mode where the raw frame is needed. In "drop"
+        mode nothing is yielded for skipped frames, in "repeat" mode they are
+        yielded with frame set to None. In "drop" mode, skips of at least
+        seek_threshold frames (default two seconds) seek the capture instead.
+        """
+        if seek_threshold is None:
+            seek_threshold = max(2, int(self._fps * 2))
+        seek = skip_mode == "drop" and frame_skip >= seek_threshold
+        
+        frame_count = start_frame
+        if start_frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        while cap.isOpened() and (end_frame is None or frame_count < end_frame):
             # Process only every Nth frame to speed up analysis
-            if frame_count % frame_skip != 0:
+            if frame_count % frame_skip == 0:
+                start = time.perf_counter()
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                self.metrics.observe("decode", time.perf_counter() - start)
+                self.metrics.increment("frames_decoded")
+                yield frame_count, frame, True
                 frame_count += 1
-                continue
                 
-            # Convert BGR to RGB for MediaPipe
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Store current timestamp for overlay
-            self.current_timestamp = frame_count / fps
-            
-            # Process pose
-            pose_results = self.pose.process(frame_rgb)
-            annotated_frame = self.draw_pose(frame.copy(), pose_results)
-            
-            # Store pose data for this frame
-            if pose_results.pose_landmarks:
-                frame_pose_data = {
-                    'frame': frame_count,
-                    'timestamp': frame_count / fps,
-                    'landmarks': [[lm.x, lm.y, lm.z, lm.visibility] for lm in pose_results.pose_landmarks.landmark]
-                }
-                self.pose_data.append(frame_pose_data)
-            
-            # Update speech text periodically
-            if frame_count - last_speech_update >= speech_update_interval:
-                timestamp = frame_count / fps
-                current_speech = self.get_speech_at_timestamp(timestamp)
-                last_speech_update = frame_count
-                
-                # Analyze context from speech text if available
-                if current_speech and len(current_speech) > 20:
-                    self.analyze_context(current_speech, timestamp)
-            
-            # Add speech transcription and context to the frame
-            self.add_text_overlay(annotated_frame, current_speech)
-            
-            # Write the frame to output video
-            out.write(annotated_frame)
+                if seek:
+                    # Let the demuxer jump to the next analyzed frame from the nearest keyframe
+                    frame_count += frame_skip - 1
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_count)
+                continue
             
+            start = time.perf_counter()
+            if skip_mode == "passthrough":
+                ret, frame = cap.read()
+            else:
+                ret, frame = cap.grab(), None
+            if not ret:
+                break
+            self.metrics.observe("decode" if frame is not None else "grab", time.perf_counter() - start)
+            self.metrics.increment("frames_skipped")
+            if skip_mode != "drop":
+                yield frame_count, frame, False
             frame_count += 1
-            if frame_count % 100 == 0:
-                print(f"Processed {frame_count}/{total_frames} frames ({frame_count/total_frames*100:.1f}%)")
+        # How far the capture got, for the final progress report
+        self._frames_read = frame_count
+    
+    def _analyze_frame(self, frame_count, frame):
+        """Run pose inference and speech/context updates for a single frame."""
+        timestamp = frame_count / self._fps
+        self.metrics.increment("frames_analyzed")
         
-        # Release resources
-        cap.release()
-        out.release()
-        self.output_video = output_path
-        print(f"Analysis complete. Output video saved to {output_path}")
-        return True
+        if self._cached_people is not None:
+            pose_results = self._people_results(frame_count, timestamp, self._cached_people_at(frame_count, frame))
+        elif self._cached_pose is not None:
+            # Reuse the landmarks from a previous run of this video
+            row = self._cached_pose.index_of_frame(frame_count)
+            landmarks = None if row is None else self._cached_pose.landmarks[row].tolist()
+            pose_results = self._pose_results_from_landmarks(landmarks)
+        elif not self.enable_pose:
+            pose_results = self._pose_results_from_landmarks(None)
+        else:
+            pose_results = self._estimate_pose(frame_count, frame, timestamp)
+        
+        # Store pose data for this frame
+        if pose_results.pose_landmarks:
+            self.pose_data.append_pose_landmarks(frame_count, timestamp, pose_results.pose_landmarks)
+        if self.motion_gate is not None and pose_results is self._last_pose_results:
+            self._interpolate_reused_rows(pose_results)
+        
+        # Update speech text periodically
+        if frame_count - self._last_speech_update >= self._speech_update_interval:
+            self._current_speech = self.get_speech_at_timestamp(timestamp, cursor=self._speech_cursor,
+                                                                wait=self._wait_for_speech)
+            self._last_speech_update = frame_count
+            
+            # Analyze context from speech text if available
+            if self.enable_context and self._current_speech and len(self._current_speech) > 20:
+                self.context_stage.submit(self._current_speech, timestamp)
+                if self.timeline is not None:
+                    self.timeline.add_text(timestamp, self._current_speech)
+        
+        self._update_stats()
+        if self.event_detector is not None:
+            self._update_events()
+        if self.search_index is not None:
+            self._update_search_index()
+        if self.timeline is not None:
+            self._update_timeline(timestamp)
+        if self.store is not None:
+            self._update_store()
+        
+        return frame_count, frame, pose_results, self._current_speech, timestamp
+    
+    def _estimate_pose(self, frame_count, frame, timestamp):
+        """Run pose inference on a frame, unless the motion gate finds it unchanged."""
+        decision = None
+        if self.motion_gate is not None:
+            with self.metrics.time("motion_gate"):
+                decision = self.motion_gate.check(frame, rgb=self._frames_rgb)
+        if decision == CUT:
+            self.shot_boundaries.append({"frame": frame_count, "timestamp": timestamp,
+                                         "score": self.motion_gate.last_score})
+            if self.timeline is not None:
+                self.timeline.add_event(timestamp, "shot_cut")
+            self._reset_pose_tracking()
+        elif decision == STATIC and self._last_pose_results is not None:
+            self.metrics.increment("pose_reused")
+            previous = self._last_pose_results
+            if self.multi_person:
+                # Hold every person's landmarks, not just the primary one's
+                return self._people_results(frame_count, timestamp, previous.people)
+            return SimpleNamespace(pose_landmarks=previous.pose_landmarks,
+                                   segmentation_mask=previous.segmentation_mask)
+        
+        # Convert BGR to RGB for MediaPipe, at the inference resolution
+        with self.metrics.time("convert"):
+            image = self.resizer.prepare(frame, rgb=self._frames_rgb)
+        
+        # Process pose
+        self.metrics.increment("pose_inferences")
+        if self.multi_person:
+            with self.metrics.time("pose"):
+                people = self.people_pose.process(image)
+            if self.resizer.active:
+                people = [{"id": p["id"], "box": self.resizer.map_box(p["box"]),
+                           "landmarks": self.resizer.map_array(p["landmarks"])} for p in people]
+            pose_results = self._people_results(frame_count, timestamp, people)
+        else:
+            with self.metrics.time("pose"):
+                pose_results = self.pose.process(image)
+            if self.resizer.active:
+                pose_results = SimpleNamespace(
+                    pose_landmarks=self.resizer.map_landmarks(pose_results.pose_landmarks),
+                    segmentation_mask=self.resizer.map_mask(getattr(pose_results, "segmentation_mask", None))
+                )
+        self._last_pose_results = pose_results
+        return pose_results
+    
+    def _interpolate_reused_rows(self, pose_results):
+        """Blend the landmarks held over static frames between the last two inferred frames."""
+        row = len(self.pose_data) - 1 if pose_results.pose_landmarks else None
+        if row is not None and self._last_inferred_row is not None:
+            self.pose_data.interpolate(self._last_inferred_row, row)
+        self._last_inferred_row = row
+    
+    def _reset_pose_tracking(self):
+        """Drop pose tracking state after a shot cut so landmarks are found afresh."""
+        self._last_pose_results = None
+        self._last_inferred_row = None
+        if self._pose is not None:
+            if hasattr(self._pose, "reset"):
+                self._pose.reset()
+            else:
+                self._pose.close()
+                self._pose = None
+        if self._people_pose is not None:
+            self._people_pose.reset()
+    
+    def _people_results(self, frame_count, timestamp, people):
+        """Store each tracked person's landmarks and build a pose result for the primary one."""
+        for person in people:
+            track = self.person_tracks.get(person["id"])
+            if track is None:
+                track = self.person_tracks[person["id"]] = PoseTrack(capacity=256)
+            track.append(frame_count, timestamp, person["landmarks"])
+            if self.store is not None:
+                self.store.add_person(person["id"], frame_count, timestamp, person["landmarks"])
+        primary = primary_person(people)
+        pose_results = self._pose_results_from_landmarks(None if primary is None else primary["landmarks"].tolist())
+        pose_results.people = people
+        pose_results.primary_id = None if primary is None else primary["id"]
+        return pose_results
+    
+    def _cached_people_at(self, frame_count, frame):
+        """Rebuild a frame's people from stored person tracks."""
+        height, width = frame.shape[:2]
+        people = []
+        for track_id, track in self._cached_people.items():
+            row = track.index_of_frame(frame_count)
+            if row is None:
+                continue
+            landmarks = track.landmarks[row]
+            box = landmark_box(landmarks, width, height) or landmark_box(landmarks, width, height, -1.0)
+            people.append({"id": track_id, "box": box, "landmarks": landmarks})
+        return people
+    
+    def _annotate_frame(self, frame_count, frame, pose_results, speech_text, timestamp):
+        """Draw the pose and text overlays for a single analyzed frame."""
+        # Store current timestamp for overlay
+        self.current_timestamp = timestamp
+        if self._output_size is not None:
+            # Landmarks are normalized, so they are drawn on the resized frame as is
+            with self.metrics.time("resize_output"):
+                frame = cv2.resize(frame, self._output_size, interpolation=cv2.INTER_AREA)
+        # The decoded frame is not used after this, so annotate it in place
+        with self.metrics.time("draw_pose"):
+            annotated_frame = self.draw_pose(frame, pose_results)
+        
+        # Add speech transcription and context to the frame
+        with self.metrics.time("overlay"):
+            self.add_text_overlay(annotated_frame, speech_text, timestamp)
+        return frame_count, annotated_frame
         
     def draw_pose(self, frame, pose_results):
-        """Draw pose landmarks on the frame with improved visibility."""
-        annotated_frame = frame.copy()
+        """Draw pose landmarks on the frame with improved visibility.
+
+        The frame is drawn on in place and returned; pass a copy to keep the original.
+        """
+        annotated_frame = frame
         
         # Draw segmentation mask if available (helps isolate people)
-        if hasattr(pose_results, 'segmentation_mask') and pose_results.segmentation_mask is not None:
-            segmentation_mask = pose_results.segmentation_mask
-            condition = np.stack((segmentation_mask,) * 3, axis=-1) > 0.1
-            bg_image = np.zeros(frame.shape, dtype=np.uint8)
-            bg_image[:] = (192, 192, 192)  # Light gray background
-            annotated_frame = np.where(condition, annotated_frame, bg_image)
+        if getattr(pose_results, 'segmentation_mask', None) is not None:
+            self.renderer.composite_segmentation(annotated_frame, pose_results.segmentation_mask)
         
         if pose_results.pose_landmarks:
             # Draw pose landmarks with improved style
@@ -164,83 +1279,112 @@ class CSPANAnalyzer:
                 landmark_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style()
             )
             
-            # Draw enhanced skeleton connections for better visibility
-            for i, connection in enumerate(self.mp_pose.POSE_CONNECTIONS):
-                start_idx = connection[0]
-                end_idx = connection[1]
-                
-                # Only draw if both landmarks are visible enough
-                if (pose_results.pose_landmarks.landmark[start_idx].visibility > 0.5 and
-                    pose_results.pose_landmarks.landmark[end_idx].visibility > 0.5):
-                    
-                    start_point = tuple(np.multiply(
-                        [pose_results.pose_landmarks.landmark[start_idx].x, 
-                         pose_results.pose_landmarks.landmark[start_idx].y],
-                        [frame.shape[1], frame.shape[0]]).astype(int))
-                    end_point = tuple(np.multiply(
-                        [pose_results.pose_landmarks.landmark[end_idx].x, 
-                         pose_results.pose_landmarks.landmark[end_idx].y],
-                        [frame.shape[1], frame.shape[0]]).astype(int))
-                    
-                    # Use different colors for different body parts
-                    color = (0, 255, 255)  # Default yellow
-                    
-                    # Color-code different body parts
-                    # Arms - blue
-                    if (11 <= start_idx <= 16) or (11 <= end_idx <= 16) or (23 <= start_idx <= 28) or (23 <= end_idx <= 28):
-                        color = (255, 128, 0)  # Blue-ish
-                    # Legs - green
-                    elif (23 <= start_idx <= 32) or (23 <= end_idx <= 32):
-                        color = (0, 255, 0)  # Green
-                    # Face - purple
-                    elif (0 <= start_idx <= 10) or (0 <= end_idx <= 10):
-                        color = (255, 0, 255)  # Purple
-                    # Torso - red
-                    elif (11 <= start_idx <= 24) or (11 <= end_idx <= 24):
-                        color = (0, 0, 255)  # Red
-                        
-                    cv2.line(annotated_frame, start_point, end_point, color, 3)
-                    
-            # Add dots at key points with labels for important landmarks
-            important_landmarks = {
-                0: "Nose",
-                11: "L Shoulder",
-                12: "R Shoulder",
-                23: "L Hip",
-                24: "R Hip",
-                15: "L Wrist",
-                16: "R Wrist",
-                27: "L Ankle",
-                28: "R Ankle"
-            }
-            
-            for idx, name in important_landmarks.items():
-                if pose_results.pose_landmarks.landmark[idx].visibility > 0.7:
-                    pos = tuple(np.multiply(
-                        [pose_results.pose_landmarks.landmark[idx].x, 
-                         pose_results.pose_landmarks.landmark[idx].y],
-                        [frame.shape[1], frame.shape[0]]).astype(int))
-                    
-                    # Draw a more visible circle
-                    cv2.circle(annotated_frame, pos, 5, (255, 255, 255), -1)
-                    cv2.circle(annotated_frame, pos, 5, (0, 0, 0), 1)
-                    
-                    # Only add labels for key points to avoid cluttering
-                    if idx in [0, 11, 12, 15, 16]:
-                        cv2.putText(annotated_frame, name, 
-                                   (pos[0]+10, pos[1]), 
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 2, cv2.LINE_AA)
-                        cv2.putText(annotated_frame, name, 
-                                   (pos[0]+10, pos[1]), 
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
+            # Pixel positions and visibility of every landmark, computed once
+            landmarks = pose_results.pose_landmarks.landmark
+            coords = np.array([(lm.x, lm.y) for lm in landmarks], dtype=np.float32)
+            visibility = np.array([lm.visibility for lm in landmarks], dtype=np.float32)
+            self._draw_skeleton(annotated_frame, coords, visibility)
+        
+        # Other tracked people get a plain skeleton, and everyone their track ID
+        for person in getattr(pose_results, 'people', ()):
+            if person["id"] != pose_results.primary_id:
+                landmarks = person["landmarks"]
+                self._draw_skeleton(annotated_frame, landmarks[:, :2], landmarks[:, 3], labels=False)
+            x0, y0 = int(person["box"][0]), max(15, int(person["box"][1]))
+            label = f"ID {person['id']}"
+            cv2.putText(annotated_frame, label, (x0, y0), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 3, cv2.LINE_AA)
+            cv2.putText(annotated_frame, label, (x0, y0), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 1, cv2.LINE_AA)
         
         return annotated_frame
     
-    def extract_audio_from_video(self):
-        """Extract audio from video file for speech recognition."""
+    def _draw_skeleton(self, frame, coords, visibility, labels=True):
+        """Draw color-coded connections and key point dots from normalized coords."""
+        points = (coords * (frame.shape[1], frame.shape[0])).astype(int).tolist()
+        
+        # Draw enhanced skeleton connections for better visibility
+        for (start_idx, end_idx), color in self._connection_colors().items():
+            # Only draw if both landmarks are visible enough
+            if visibility[start_idx] > 0.5 and visibility[end_idx] > 0.5:
+                cv2.line(frame, tuple(points[start_idx]), tuple(points[end_idx]), color, 3)
+                
+        # Add dots at key points with labels for important landmarks
+        for idx, name in self.IMPORTANT_LANDMARKS.items():
+            if visibility[idx] > 0.7:
+                pos = tuple(points[idx])
+                
+                # Draw a more visible circle
+                cv2.circle(frame, pos, 5, (255, 255, 255), -1)
+                cv2.circle(frame, pos, 5, (0, 0, 0), 1)
+                
+                # Only add labels for key points to avoid cluttering
+                if labels and idx in [0, 11, 12, 15, 16]:
+                    cv2.putText(frame, name, 
+                               (pos[0]+10, pos[1]), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 2, cv2.LINE_AA)
+                    cv2.putText(frame, name, 
+                               (pos[0]+10, pos[1]), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
+    
+    def _connection_colors(self):
+        """Map each pose connection to its body-part color, computed once."""
+        if self._skeleton_colors is None:
+            colors = {}
+            for start_idx, end_idx in self.mp_pose.POSE_CONNECTIONS:
+                # Use different colors for different body parts
+                color = (0, 255, 255)  # Default yellow
+                
+                # Color-code different body parts
+                # Arms - blue
+                if (11 <= start_idx <= 16) or (11 <= end_idx <= 16) or (23 <= start_idx <= 28) or (23 <= end_idx <= 28):
+                    color = (255, 128, 0)  # Blue-ish
+                # Legs - green
+                elif (23 <= start_idx <= 32) or (23 <= end_idx <= 32):
+                    color = (0, 255, 0)  # Green
+                # Face - purple
+                elif (0 <= start_idx <= 10) or (0 <= end_idx <= 10):
+                    color = (255, 0, 255)  # Purple
+                # Torso - red
+                elif (11 <= start_idx <= 24) or (11 <= end_idx <= 24):
+                    color = (0, 0, 255)  # Red
+                colors[(start_idx, end_idx)] = color
+            self._skeleton_colors = colors
+        return self._skeleton_colors
+    
+    def extract_audio_from_video(self, streaming=False, duration=None, window_seconds=30.0, overlap_seconds=5.0):
+        """Extract audio from video file for speech recognition.
+
+        With streaming=True this returns immediately and the audio is transcribed
+        in overlapping windows on a background thread, filling speech_segments
+        incrementally; get_speech_at_timestamp waits for the windows it needs.
+        """
+        if not self.enable_speech:
+            print("Speech analysis disabled, skipping transcription.")
+            return
+        
+        key = self._cache_key("transcript", model=self.whisper_model_name)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            self.speech_segments.extend(cached)
+            print(f"Loaded {len(self.speech_segments)} cached speech segments.")
+            return
+        
+        if streaming:
+            if duration is None:
+                cap = cv2.VideoCapture(self.video_path)
+                fps = cap.get(cv2.CAP_PROP_FPS)
+                duration = cap.get(cv2.CAP_PROP_FRAME_COUNT) / fps if fps else 0
+                cap.release()
+            print(f"Transcribing speech in {window_seconds:.0f}s windows in the background...")
+            self.transcriber = StreamingTranscriber(
+                self.speech_model, self.video_path, duration, self.speech_segments,
+                window_seconds=window_seconds, overlap_seconds=overlap_seconds, metrics=self.metrics
+            ).start()
+            return
+        
         print("Transcribing speech from video...")
         try:
-            result = self.speech_model.transcribe(self.video_path)
+            with self.metrics.time("transcribe"):
+                result = self.speech_model.transcribe(self.video_path)
             
             # Store speech segments with timestamps
             for segment in result["segments"]:
@@ -251,43 +1395,43 @@ class CSPANAnalyzer:
                 })
             
             print(f"Speech transcription complete. Found {len(self.speech_segments)} segments.")
+            self._store_cached_transcript()
         except Exception as e:
             print(f"Error during speech transcription: {e}")
             # Add a dummy segment to avoid errors
             self.speech_segments.append({
                 "start": 0,
                 "end": 100000,  # Very large end time
-                "text": "Speech transcription failed. Processing video without speech analysis."
+                "text": FAILED_TRANSCRIPT_TEXT
             })
     
-    def get_speech_at_timestamp(self, timestamp):
-        """Get the speech text at a specific timestamp."""
-        for segment in self.speech_segments:
-            if segment["start"] <= timestamp <= segment["end"]:
-                return segment["text"]
-        return ""
+    def get_speech_at_timestamp(self, timestamp, tolerance=0.0, cursor=None, wait=True):
+        """Get the speech text at a specific timestamp.
+
+        Timestamps in a gap between segments return "" unless a segment lies
+        within tolerance seconds. Callers walking forward through the video can
+        pass a cursor from speech_segments.cursor() to avoid repeated bisects.
+        With wait=False, a streaming transcript that has not reached timestamp
+        yet is looked up as it is.
+        """
+        if self.transcriber is not None and wait:
+            # Only wait if the frame loop got ahead of the streaming transcript
+            with self.metrics.time("speech_wait"):
+                self.transcriber.wait_until(timestamp)
+        if cursor is not None:
+            return cursor.text_at(timestamp)
+        return self.speech_segments.text_at(timestamp, tolerance)
+    
+    def get_speech_in_range(self, start, end):
+        """Get all speech segments overlapping the window [start, end]."""
+        if self.transcriber is not None:
+            self.transcriber.wait_until(end)
+        return self.speech_segments.overlapping(start, end)
     
     def analyze_context(self, text, timestamp):
         """Analyze the context of speech text using NLP."""
         try:
-            # Define potential topics that might be discussed in CSPAN videos
-            potential_topics = [
-                "policy", "legislation", "economy", "healthcare", 
-                "foreign affairs", "national security", "election",
-                "budget", "infrastructure", "education", "immigration"
-            ]
-            
-            # Classify the text into potential topics
-            topic_result = self.topic_classifier(text, potential_topics)
-            
-            # Get a short summary if text is long enough
-            summary = ""
-            if len(text) > 100:
-                try:
-                    summary = self.nlp(text, max_length=60, min_length=20, do_sample=False)[0]['summary_text']
-                except Exception as e:
-                    print(f"Error generating summary: {e}")
-                    summary = text[:100] + "..."
+            topic_result, summary = self.context_stage.analyze_texts([text])[text]
             
             context = {
                 "timestamp": timestamp,
@@ -303,68 +1447,16 @@ class CSPANAnalyzer:
             return {
                 "timestamp": timestamp,
                 "text": text,
-                "topics": {"labels": ["unknown"], "scores": [1.0]},
+                "topics": UNKNOWN_TOPICS,
                 "summary": ""
             }
     
-    def add_text_overlay(self, frame, text):
+    def add_text_overlay(self, frame, text, timestamp=None):
         """Add enhanced text overlay to the frame."""
-        # Add semi-transparent background for text
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, frame.shape[0]-180), (frame.shape[1], frame.shape[0]), (0, 0, 0), -1)
-        alpha = 0.8  # More opaque for better readability
-        cv2.addWeighted(overlay, alpha, frame, 1-alpha, 0, frame)
-        
-        # Add speech text with better formatting
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        if text:
-            # Split text into multiple lines
-            max_width = 80
-            words = text.split()
-            lines = []
-            current_line = ""
-            
-            for word in words:
-                if len(current_line + " " + word) <= max_width:
-                    current_line += " " + word if current_line else word
-                else:
-                    lines.append(current_line)
-                    current_line = word
-            
-            if current_line:
-                lines.append(current_line)
-            
-            # Draw text background for better readability
-            for i, line in enumerate(lines):
-                y_pos = frame.shape[0] - 150 + (i * 30)
-                # Draw each line with shadow effect for better readability
-                cv2.putText(frame, line, (22, y_pos+2), font, 0.7, (0, 0, 0), 2, cv2.LINE_AA)  # Shadow
-                cv2.putText(frame, line, (20, y_pos), font, 0.7, (255, 255, 255), 2, cv2.LINE_AA)  # Text
-        
-        # Add title with better styling
-        title_bg = frame.copy()
-        cv2.rectangle(title_bg, (0, 0), (frame.shape[1], 60), (0, 0, 0), -1)
-        cv2.addWeighted(title_bg, 0.7, frame, 0.3, 0, frame)
-        
-        # Add main title
-        cv2.putText(frame, "CSPAN Video Analysis", (20, 40), font, 1.2, (0, 0, 0), 3, cv2.LINE_AA)  # Shadow
-        cv2.putText(frame, "CSPAN Video Analysis", (20, 40), font, 1.2, (0, 255, 255), 2, cv2.LINE_AA)  # Text
-        
-        # Add ML analysis label with better positioning
-        analysis_text = "Multi-Person Pose Tracking + Speech Analysis"
-        text_size = cv2.getTextSize(analysis_text, font, 0.7, 2)[0]
-        cv2.putText(frame, analysis_text, (frame.shape[1]-text_size[0]-20, 40), 
-                   font, 0.7, (0, 0, 0), 3, cv2.LINE_AA)  # Shadow
-        cv2.putText(frame, analysis_text, (frame.shape[1]-text_size[0]-20, 40), 
-                   font, 0.7, (0, 255, 255), 2, cv2.LINE_AA)  # Text
-        
-        # Add timestamp if available
-        if hasattr(self, 'current_timestamp') and self.current_timestamp is not None:
-            timestamp_str = f"Time: {self.format_timestamp(self.current_timestamp)}"
-            cv2.putText(frame, timestamp_str, (frame.shape[1]-200, 80), 
-                       font, 0.6, (200, 200, 200), 2, cv2.LINE_AA)
-        
-        return frame
+        if timestamp is None:
+            timestamp = getattr(self, 'current_timestamp', None)
+        timestamp_str = f"Time: {self.format_timestamp(timestamp)}" if timestamp is not None else None
+        return self.renderer.draw_text_overlay(frame, text, timestamp_str)
         
     def format_timestamp(self, seconds):
         """Format seconds into MM:SS format."""
@@ -374,7 +1466,7 @@ class CSPANAnalyzer:
     
     def generate_analytics(self):
         """Generate analytics from collected data."""
-        if not self.pose_data or not self.speech_segments:
+        if not self.pose_data and not self.speech_segments:
             print("No data available for analytics")
             return
             
@@ -388,64 +1480,84 @@ class CSPANAnalyzer:
         
         # Print summary
         print("\n=== CSPAN Video Analysis Summary ===")
-        print(f"Video duration: {self.pose_data[-1]['timestamp']:.2f} seconds" if self.pose_data else "No pose data available")
+        print(f"Video duration: {self.pose_data.timestamps[-1]:.2f} seconds" if self.pose_data else "No pose data available")
         print(f"Frames analyzed: {len(self.pose_data)}")
         print(f"Speech segments: {len(self.speech_segments)}")
         print(f"Movement analysis: {movement_analysis}")
         print(f"Speech analysis: {speech_analysis}")
+        if self.events:
+            counts = {}
+            for event in self.events:
+                counts[event["type"]] = counts.get(event["type"], 0) + 1
+            print(f"Events: {counts}")
         
-    def analyze_movement(self):
-        """Analyze the pose movement data."""
-        if not self.pose_data:
+    def analyze_movement(self, start=None, end=None):
+        """Analyze the pose movement data, optionally only for start <= timestamp < end.
+
+        The whole-video result comes from movement_stats once every pose row
+        has been added to it; a time range is computed from pose_data.
+        """
+        if start is None and end is None and self._stats_pose == len(self.pose_data):
+            return self.movement_stats.summary()
+        track = self.pose_data
+        if start is not None or end is not None:
+            track = track.slice_time(-np.inf if start is None else start, np.inf if end is None else end)
+        if not track:
             return {}
             
         # Extract movement of key points (e.g., hands)
-        right_hand_idx = self.mp_pose.PoseLandmark.RIGHT_WRIST.value
-        left_hand_idx = self.mp_pose.PoseLandmark.LEFT_WRIST.value
-        head_idx = self.mp_pose.PoseLandmark.NOSE.value
-        
-        right_hand_movement = []
-        left_hand_movement = []
-        head_movement = []
-        
-        for frame_data in self.pose_data:
-            if len(frame_data['landmarks']) > right_hand_idx:
-                right_hand_movement.append(frame_data['landmarks'][right_hand_idx][:2])  # x, y
-            if len(frame_data['landmarks']) > left_hand_idx:
-                left_hand_movement.append(frame_data['landmarks'][left_hand_idx][:2])
-            if len(frame_data['landmarks']) > head_idx:
-                head_movement.append(frame_data['landmarks'][head_idx][:2])
-        
-        # Calculate movement variance
-        movement_analysis = {}
-        if right_hand_movement:
-            right_hand_array = np.array(right_hand_movement)
-            movement_analysis['right_hand_variance'] = np.sum(np.var(right_hand_array, axis=0))
-        if left_hand_movement:
-            left_hand_array = np.array(left_hand_movement)
-            movement_analysis['left_hand_variance'] = np.sum(np.var(left_hand_array, axis=0))
-        if head_movement:
-            head_array = np.array(head_movement)
-            movement_analysis['head_variance'] = np.sum(np.var(head_array, axis=0))
-        
-        return movement_analysis
+        key_points = {
+            'right_hand_variance': self.mp_pose.PoseLandmark.RIGHT_WRIST.value,
+            'left_hand_variance': self.mp_pose.PoseLandmark.LEFT_WRIST.value,
+            'head_variance': self.mp_pose.PoseLandmark.NOSE.value,
+        }
+        
+        # Calculate movement variance of x, y over all frames in one pass
+        xy = track.landmarks[:, list(key_points.values()), :2]
+        variances = np.var(xy, axis=0, dtype=np.float64).sum(axis=-1)
+        return {name: float(v) for name, v in zip(key_points, variances)}
     
     def analyze_speech(self):
         """Analyze speech patterns."""
-        if not self.speech_segments:
-            return {}
-            
-        total_words = sum(len(segment['text'].split()) for segment in self.speech_segments)
-        total_duration = sum(segment['end'] - segment['start'] for segment in self.speech_segments)
-        
-        speech_analysis = {
-            "total_segments": len(self.speech_segments),
-            "total_words": total_words,
-            "total_speech_duration": total_duration,
-            "words_per_minute": (total_words / total_duration) * 60 if total_duration > 0 else 0
-        }
-        
-        return speech_analysis
+        stats = self.speech_stats
+        if self._stats_speech != len(self.speech_segments):
+            # Segments added outside the frame loop, e.g. a transcript loaded on its own
+            stats = SpeechStats()
+            for segment in self.speech_segments:
+                stats.add(segment)
+        return stats.summary()
+
+
+def _process_chunk(job):
+    """Process one frame range of a video in a pool worker and return its results."""
+    analyzer = CSPANAnalyzer(video_path=job["video_path"], **job["analyzer_options"])
+    analyzer.speech_segments = SpeechIndex(job["speech_segments"])
+    
+    cap = analyzer._open_capture(rgb=not job["output_path"])
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    out_size = fit_size(job["output_size"], *frame_size)
+    out = None
+    if job["output_path"]:
+        out = analyzer._open_writer(job["output_path"], fps, job["frame_skip"], job["skip_mode"],
+                                    out_size or frame_size)
+    
+    analyzer._process_frames(cap, out, fps, total_frames, frame_skip=job["frame_skip"],
+                             skip_mode=job["skip_mode"], seek_threshold=job["seek_threshold"],
+                             start_frame=job["start_frame"], end_frame=job["end_frame"], output_size=out_size)
+    analyzer._finish_stats()
+    
+    return {
+        "output_path": job["output_path"],
+        "pose_data": analyzer.pose_data,
+        "person_tracks": analyzer.person_tracks,
+        "shot_boundaries": analyzer.shot_boundaries,
+        "metrics": analyzer.metrics,
+        "movement_stats": analyzer.movement_stats,
+        # Context is analyzed in the parent, where the NLP models are loaded
+        "context_requests": analyzer.context_stage.take_requests(),
+    }
 
 
 # Example usage
@@ -457,19 +1569,158 @@ if __name__ == "__main__":
     parser.add_argument('--url', type=str, help='YouTube URL of CSPAN video')
     parser.add_argument('--output', type=str, default="cspan_analyzed.mp4", help='Output video path')
     parser.add_argument('--frame-skip', type=int, default=2, help='Process every Nth frame (higher values = faster processing)')
+    parser.add_argument('--skip-mode', choices=CSPANAnalyzer.SKIP_MODES, default="drop",
+                        help='What the output video shows for skipped frames')
+    parser.add_argument('--pipelined', action='store_true', help='Run decode, pose, annotation and encoding as parallel stages')
+    parser.add_argument('--queue-size', type=int, default=8, help='Maximum frames buffered between pipeline stages')
+    parser.add_argument('--stream-transcript', action='store_true',
+                        help='Transcribe speech in the background while frames are processed')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Reuse transcripts, pose tracks and context results cached in this directory')
+    parser.add_argument('--save-pose', type=str, default=None,
+                        help='Directory to save the pose track to as .npy files')
+    parser.add_argument('--context-mode', choices=CSPANAnalyzer.CONTEXT_MODES, default="deferred",
+                        help='Analyze speech context after the frame loop or on a background thread')
+    parser.add_argument('--whisper-model', type=str, default="base", help='Whisper model size (tiny, base, small, ...)')
+    parser.add_argument('--summarization-model', type=str, default=None, help='Summarization model name')
+    parser.add_argument('--zero-shot-model', type=str, default=None, help='Zero-shot topic classification model name')
+    parser.add_argument('--pose-complexity', type=int, choices=[0, 1, 2], default=2, help='MediaPipe Pose model complexity')
+    parser.add_argument('--no-pose', action='store_true', help='Skip pose estimation')
+    parser.add_argument('--multi-person', action='store_true', help='Track pose for every person in the frame')
+    parser.add_argument('--detect-every', type=int, default=10, help='Multi-person mode: frames between person detections')
+    parser.add_argument('--max-people', type=int, default=6, help='Multi-person mode: maximum people tracked at once')
+    parser.add_argument('--inference-size', type=parse_size, default=None,
+                        help='Run pose on frames shrunk to this size: largest side ("640") or "WIDTHxHEIGHT"')
+    parser.add_argument('--letterbox', action='store_true',
+                        help='Pad instead of stretching frames to a WIDTHxHEIGHT --inference-size')
+    parser.add_argument('--output-size', type=parse_size, default=None,
+                        help='Render and encode the output at this size: largest side or "WIDTHxHEIGHT"')
+    parser.add_argument('--motion-gate', action='store_true',
+                        help='Reuse landmarks on frames where nothing moved and reset tracking on shot cuts')
+    parser.add_argument('--no-speech', action='store_true', help='Skip speech transcription')
+    parser.add_argument('--no-context', action='store_true', help='Skip topic classification and summaries')
+    parser.add_argument('--model-dir', type=str, default=None, help='Only load models from this local directory (offline)')
+    parser.add_argument('--workers', type=int, default=1, help='Process the video in parallel chunks across this many processes')
+    parser.add_argument('--chunk-seconds', type=float, default=None, help='Length of each parallel chunk (default: one chunk per worker)')
+    parser.add_argument('--live', type=str, default=None,
+                        help='Analyze a growing file, named pipe or stream URL in real time instead of a finished video')
+    parser.add_argument('--latency-budget', type=float, default=None,
+                        help='Live mode: seconds one frame may take before the pose model complexity is lowered')
+    parser.add_argument('--max-lag', type=float, default=5.0, help='Live mode: seconds analysis may fall behind live')
+    parser.add_argument('--window-seconds', type=float, default=DEFAULT_WINDOW_SECONDS,
+                        help='Length of each timeline window')
+    parser.add_argument('--timeline', type=str, default=None,
+                        help='JSON lines file the windowed analysis timeline is streamed to')
+    parser.add_argument('--no-render', action='store_true',
+                        help='Only analyze: skip annotating and encoding the output video')
+    parser.add_argument('--data-dir', type=str, default=None,
+                        help='Directory to stream pose, speech and context results to as columnar shards')
+    parser.add_argument('--render-from', type=str, default=None,
+                        help='Render the annotated video from a --data-dir analysis instead of analyzing')
+    parser.add_argument('--checkpoint-dir', type=str, default=None,
+                        help='Checkpoint progress here and resume from it if a previous run was interrupted')
+    parser.add_argument('--checkpoint-seconds', type=float, default=300.0,
+                        help='Length of video processed between checkpoints')
+    parser.add_argument('--events', action='store_true',
+                        help='Detect events such as raised hands, hand movement bursts and head turns')
+    parser.add_argument('--keyword', action='append', default=[],
+                        help='Detect mentions of this word or phrase (repeatable; implies --events)')
+    parser.add_argument('--search-index', type=str, default=None,
+                        help='Add the transcript to this cross-video search index (see transcript_search.py)')
+    parser.add_argument('--metrics', type=str, default=None,
+                        help='Write stage timings and counters here when done (Prometheus text for .prom, else JSON)')
+    parser.add_argument('--decoder', choices=VIDEO_BACKENDS, default="opencv",
+                        help='Decode frames with OpenCV or an ffmpeg pipe into preallocated buffers')
+    parser.add_argument('--encoder', choices=VIDEO_BACKENDS, default="opencv",
+                        help='Encode the output with OpenCV (mp4v) or an ffmpeg pipe')
+    parser.add_argument('--codec', type=str, default=DEFAULT_CODEC, help='ffmpeg encoder: video codec')
+    parser.add_argument('--preset', choices=ENCODER_PRESETS, default=DEFAULT_PRESET,
+                        help='ffmpeg encoder: speed preset')
     
     args = parser.parse_args()
     
+    if args.render_from:
+        analyzer = CSPANAnalyzer(video_path=args.video,
+                                 video_io=VideoIO(args.decoder, args.encoder, args.codec, args.preset))
+        ok = analyzer.render_analysis(args.render_from, output_path=args.output, skip_mode=args.skip_mode,
+                                      pipelined=args.pipelined, queue_size=args.queue_size,
+                                      output_size=args.output_size)
+        if args.metrics:
+            analyzer.metrics.save(args.metrics)
+        exit(0 if ok else 1)
+    
+    event_rules = None
+    if args.events or args.keyword:
+        event_rules = dict(DEFAULT_RULES)
+        for word in args.keyword:
+            event_rules["mention_" + "_".join(word.lower().split())] = keyword_rule(word)
+    
+    if args.live:
+        # Live analysis neither renders, caches nor checkpoints anything
+        unsupported = [flag for flag, used in [
+            ("--cache-dir", args.cache_dir), ("--data-dir", args.data_dir), ("--checkpoint-dir", args.checkpoint_dir),
+            ("--workers", args.workers > 1), ("--encoder", args.encoder != "opencv"),
+            ("--codec", args.codec != DEFAULT_CODEC), ("--preset", args.preset != DEFAULT_PRESET),
+        ] if used]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be used with --live")
+        analyzer = CSPANAnalyzer(whisper_model=args.whisper_model, summarization_model=args.summarization_model,
+                                 zero_shot_model=args.zero_shot_model, pose_complexity=args.pose_complexity,
+                                 enable_pose=not args.no_pose, enable_speech=not args.no_speech,
+                                 enable_context=not args.no_context, model_dir=args.model_dir,
+                                 multi_person=args.multi_person, detect_every=args.detect_every,
+                                 max_people=args.max_people, motion_gate=args.motion_gate,
+                                 inference_size=args.inference_size, letterbox=args.letterbox,
+                                 event_rules=event_rules, search_index=args.search_index,
+                                 video_io=VideoIO(decoder=args.decoder))
+        live = LiveAnalyzer(analyzer, args.live, window_seconds=args.window_seconds,
+                            latency_budget=args.latency_budget, max_lag=args.max_lag,
+                            timeline_path=args.timeline, on_window=lambda w: print(describe_window(w) + "\n"))
+        live.run()
+        if args.metrics:
+            analyzer.metrics.save(args.metrics)
+        exit(0)
+    
     if not args.video and not args.url:
         print("Error: Either --video or --url must be provided")
         parser.print_help()
         exit(1)
     
     # Initialize analyzer with provided video path or URL
-    analyzer = CSPANAnalyzer(video_path=args.video, url=args.url)
+    analyzer = CSPANAnalyzer(video_path=args.video, url=args.url, cache_dir=args.cache_dir,
+                             whisper_model=args.whisper_model, summarization_model=args.summarization_model,
+                             zero_shot_model=args.zero_shot_model, pose_complexity=args.pose_complexity,
+                             enable_pose=not args.no_pose, enable_speech=not args.no_speech,
+                             enable_context=not args.no_context, model_dir=args.model_dir,
+                             multi_person=args.multi_person, detect_every=args.detect_every,
+                             max_people=args.max_people, motion_gate=args.motion_gate,
+                             inference_size=args.inference_size, letterbox=args.letterbox,
+                             event_rules=event_rules, search_index=args.search_index,
+                             video_io=VideoIO(args.decoder, args.encoder, args.codec, args.preset))
     
     # Process the video
-    analyzer.process_video(output_path=args.output, frame_skip=args.frame_skip)
+    if args.workers > 1:
+        analyzer.process_video_chunked(output_path=args.output, frame_skip=args.frame_skip,
+                                       workers=args.workers, chunk_seconds=args.chunk_seconds,
+                                       skip_mode=args.skip_mode, timeline_path=args.timeline,
+                                       timeline_window=args.window_seconds, output_size=args.output_size,
+                                       render=not args.no_render, data_dir=args.data_dir)
+    else:
+        analyzer.process_video(output_path=args.output, frame_skip=args.frame_skip,
+                               pipelined=args.pipelined, queue_size=args.queue_size,
+                               skip_mode=args.skip_mode, stream_transcript=args.stream_transcript,
+                               context_mode=args.context_mode, timeline_path=args.timeline,
+                               timeline_window=args.window_seconds, output_size=args.output_size,
+                               render=not args.no_render, data_dir=args.data_dir,
+                               checkpoint_dir=args.checkpoint_dir, checkpoint_seconds=args.checkpoint_seconds)
+    
+    if args.save_pose:
+        analyzer.pose_data.save(args.save_pose)
+        print(f"Pose track saved to {args.save_pose}")
+    
+    if args.metrics:
+        analyzer.metrics.save(args.metrics)
+        print(f"Metrics saved to {args.metrics}")
     
     # Generate analytics
     analyzer.generate_analytics()
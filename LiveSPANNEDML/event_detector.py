@@ -0,0 +1,257 @@
+import math
+import re
+
+import numpy as np
+
+# MediaPipe Pose landmarks the rules refer to
+LANDMARKS = {
+    "nose": 0,
+    "left_ear": 7,
+    "right_ear": 8,
+    "left_shoulder": 11,
+    "right_shoulder": 12,
+    "left_wrist": 15,
+    "right_wrist": 16,
+}
+
+# Event rules by name. Pose values are measured in shoulder widths, so they do
+# not depend on how large the speaker is in the frame; left and right are the
+# speaker's. An event lasts while the value stays above threshold, bridging
+# dropouts of up to max_gap_seconds, and is kept if it lasts min_seconds.
+DEFAULT_RULES = {
+    # Wrist above its shoulder
+    "right_hand_raised": {"kind": "above", "pairs": [("right_wrist", "right_shoulder")], "threshold": 0.1,
+                          "min_seconds": 0.5},
+    "left_hand_raised": {"kind": "above", "pairs": [("left_wrist", "left_shoulder")], "threshold": 0.1,
+                         "min_seconds": 0.5},
+    # Both wrists up at once, e.g. holding up a signed document
+    "both_hands_raised": {"kind": "above", "pairs": [("right_wrist", "right_shoulder"),
+                                                     ("left_wrist", "left_shoulder")],
+                          "threshold": 0.0, "min_seconds": 1.0},
+    # Wrist speed in shoulder widths per second
+    "right_hand_burst": {"kind": "speed", "points": ["right_wrist"], "threshold": 2.0, "min_seconds": 0.2},
+    "left_hand_burst": {"kind": "speed", "points": ["left_wrist"], "threshold": 2.0, "min_seconds": 0.2},
+    # Shoulders ahead of the hips in MediaPipe's depth estimate
+    "lean_forward": {"kind": "lean", "threshold": 0.6, "min_seconds": 1.0},
+    # Nose off the midpoint between the ears, as a fraction of the distance between them
+    "head_turn_left": {"kind": "head_turn", "direction": "left", "threshold": 0.3, "min_seconds": 0.5},
+    "head_turn_right": {"kind": "head_turn", "direction": "right", "threshold": 0.3, "min_seconds": 0.5},
+}
+
+MAX_GAP_SECONDS = 0.3
+MIN_VISIBILITY = 0.5
+# Shoulder widths below this (a profile view, or a bad detection) are clamped to it
+MIN_SCALE = 0.02
+
+
+def keyword_rule(*words):
+    """A rule matching any of words (or phrases) in the transcript, case-insensitively."""
+    return {"kind": "keyword", "words": list(words)}
+
+
+def _above(rule, x, y, z, visibility, scale, timestamps):
+    values, seen = [], []
+    for point, reference in rule["pairs"]:
+        point, reference = LANDMARKS[point], LANDMARKS[reference]
+        # Image y grows downwards
+        values.append((y[:, reference] - y[:, point]) / scale)
+        seen.append(np.minimum(visibility[:, point], visibility[:, reference]))
+    return np.min(values, axis=0), np.min(seen, axis=0)
+
+
+def _speed(rule, x, y, z, visibility, scale, timestamps):
+    points = [LANDMARKS[p] for p in rule["points"]]
+    dt = np.diff(timestamps)
+    distance = np.hypot(np.diff(x[:, points], axis=0), np.diff(y[:, points], axis=0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speed = distance.max(axis=1) / dt / scale[1:]
+    # Across a gap in the track the displacement is not a movement
+    speed[dt > rule.get("max_gap_seconds", MAX_GAP_SECONDS)] = np.nan
+    seen = visibility[:, points].min(axis=1)
+    return np.concatenate([[np.nan], speed]), np.concatenate([[0.0], np.minimum(seen[1:], seen[:-1])])
+
+
+def _lean(rule, x, y, z, visibility, scale, timestamps):
+    left, right = LANDMARKS["left_shoulder"], LANDMARKS["right_shoulder"]
+    # MediaPipe depth is relative to the hips and smaller towards the camera
+    value = -(z[:, left] + z[:, right]) / 2 / scale
+    return value, np.minimum(visibility[:, left], visibility[:, right])
+
+
+def _head_turn(rule, x, y, z, visibility, scale, timestamps):
+    nose, left, right = LANDMARKS["nose"], LANDMARKS["left_ear"], LANDMARKS["right_ear"]
+    ears = x[:, left] - x[:, right]
+    ears = np.copysign(np.maximum(np.abs(ears), MIN_SCALE / 2), ears)
+    # Turning to their left brings the nose towards the speaker's left ear
+    value = (x[:, nose] - (x[:, left] + x[:, right]) / 2) / ears
+    if rule.get("direction", "left") == "right":
+        value = -value
+    seen = np.minimum(visibility[:, nose], np.maximum(visibility[:, left], visibility[:, right]))
+    return value, seen
+
+
+_KINDS = {"above": _above, "speed": _speed, "lean": _lean, "head_turn": _head_turn}
+
+
+class EventDetector:
+    def __init__(self, rules=None):
+        """Detect events described by rules in the pose track and the transcript.
+
+        rules maps event names to rule dicts (see DEFAULT_RULES and
+        keyword_rule()). Every pose rule is evaluated in one vectorized pass
+        over the (frames, landmarks, 4) array: a value per frame, compared
+        with the rule's threshold, then grouped into runs of frames. Each
+        event is a dict with type, start and end timestamps and a confidence,
+        the mean over its frames of the landmarks' visibility scaled by how
+        far past the threshold the value is (0.5 at the threshold, nearing 1
+        well past it). Keyword rules give an event per match, timed by the
+        match's position in its transcript segment.
+
+        detect() finds the events of a whole run at once. For a run in
+        progress, add_poses() and add_speech() return each event once it can
+        no longer change, and pending_since is the start of the earliest
+        event that may still be returned (None if none is in progress);
+        flush() returns the rest at the end.
+        """
+        self.rules = DEFAULT_RULES if rules is None else rules
+        for name, rule in self.rules.items():
+            if rule["kind"] != "keyword" and rule["kind"] not in _KINDS:
+                raise ValueError(f"Unknown kind {rule['kind']!r} of event rule {name!r}")
+        self._pose_rules = {name: rule for name, rule in self.rules.items() if rule["kind"] in _KINDS}
+        self._keywords = {
+            name: re.compile(r"\b(?:" + "|".join(re.escape(w) for w in rule["words"]) + r")\b", re.IGNORECASE)
+            for name, rule in self.rules.items() if rule["kind"] == "keyword"
+        }
+        self.reset()
+
+    def reset(self):
+        """Forget the frames added so far, e.g. before another run."""
+        self._timestamps = np.empty(0)
+        self._masks = {name: np.empty(0, dtype=bool) for name in self._pose_rules}
+        self._scores = {name: np.empty(0) for name in self._pose_rules}
+        self._last_row = None
+        self._emitted = {name: -math.inf for name in self._pose_rules}
+        self.pending_since = None
+
+    def _evaluate(self, timestamps, landmarks):
+        """Return {rule name: (mask, score)} for every pose rule over the frames."""
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        x, y, z, visibility = (landmarks[..., i] for i in range(4))
+        left, right = LANDMARKS["left_shoulder"], LANDMARKS["right_shoulder"]
+        scale = np.maximum(np.hypot(x[:, left] - x[:, right], y[:, left] - y[:, right]), MIN_SCALE)
+
+        results = {}
+        for name, rule in self._pose_rules.items():
+            value, seen = _KINDS[rule["kind"]](rule, x, y, z, visibility, scale, timestamps)
+            threshold = rule["threshold"]
+            with np.errstate(invalid="ignore"):
+                mask = (value > threshold) & (seen >= rule.get("min_visibility", MIN_VISIBILITY))
+            spread = rule.get("spread", max(abs(threshold), 0.1))
+            score = seen.astype(np.float64) * (0.5 + 0.5 * np.tanh(np.nan_to_num(value - threshold) / spread))
+            results[name] = (mask, score)
+        return results
+
+    def _runs(self, name, timestamps, mask, score, last_timestamp=None):
+        """Group a rule's frames into events; returns (events, start of the first run still open)."""
+        rule = self._pose_rules[name]
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return [], None
+        max_gap = rule.get("max_gap_seconds", MAX_GAP_SECONDS)
+        times = timestamps[rows]
+        firsts = np.concatenate([[0], np.flatnonzero(np.diff(times) > max_gap) + 1])
+        lasts = np.concatenate([firsts[1:] - 1, [len(rows) - 1]])
+        confidences = np.add.reduceat(score[rows], firsts) / (lasts - firsts + 1)
+
+        events, open_start = [], None
+        min_seconds = rule.get("min_seconds", 0.0)
+        for first, last, confidence in zip(firsts, lasts, confidences):
+            start, end = float(times[first]), float(times[last])
+            if last_timestamp is not None and last_timestamp - end < max_gap:
+                # A later frame could still extend this run
+                open_start = start
+                break
+            if end - start >= min_seconds:
+                events.append({"type": name, "start": start, "end": end, "confidence": float(confidence)})
+        return events, open_start
+
+    def detect(self, pose_track=None, speech_segments=()):
+        """Return every event in a whole PoseTrack and transcript, ordered by start."""
+        events = []
+        if pose_track is not None and len(pose_track):
+            timestamps = np.asarray(pose_track.timestamps, dtype=np.float64)
+            for name, (mask, score) in self._evaluate(timestamps, pose_track.landmarks).items():
+                events += self._runs(name, timestamps, mask, score)[0]
+        for segment in speech_segments:
+            events += self.keyword_events(segment)
+        return sorted(events, key=lambda e: e["start"])
+
+    def keyword_events(self, segment):
+        """Return the keyword events in one transcript segment."""
+        events = []
+        text = segment["text"]
+        duration = segment["end"] - segment["start"]
+        for name, pattern in self._keywords.items():
+            for match in pattern.finditer(text):
+                events.append({
+                    "type": name,
+                    "start": segment["start"] + duration * match.start() / len(text),
+                    "end": segment["start"] + duration * match.end() / len(text),
+                    "confidence": 1.0,
+                    "match": match.group(0),
+                })
+        return events
+
+    def add_speech(self, segment):
+        """Add a transcript segment; returns its keyword events."""
+        return self.keyword_events(segment)
+
+    def add_poses(self, timestamps, landmarks):
+        """Add frames in time order; returns the events that ended and can no longer change."""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if not len(timestamps):
+            return []
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        if self._last_row is not None:
+            # Speed rules need the frame before the first new one
+            timestamps = np.concatenate([[self._last_row[0]], timestamps])
+            landmarks = np.concatenate([self._last_row[1][None], landmarks])
+        results = self._evaluate(timestamps, landmarks)
+        skip = 0 if self._last_row is None else 1
+        self._last_row = (timestamps[-1], landmarks[-1])
+        self._timestamps = np.concatenate([self._timestamps, timestamps[skip:]])
+        for name, (mask, score) in results.items():
+            self._masks[name] = np.concatenate([self._masks[name], mask[skip:]])
+            self._scores[name] = np.concatenate([self._scores[name], score[skip:]])
+        return self._collect(self._timestamps[-1])
+
+    def flush(self):
+        """Return the events still open at the end of the run."""
+        if not len(self._timestamps):
+            return []
+        return self._collect(None)
+
+    def _collect(self, last_timestamp):
+        events, open_starts = [], []
+        for name in self._pose_rules:
+            found, open_start = self._runs(name, self._timestamps, self._masks[name], self._scores[name],
+                                           last_timestamp)
+            # Runs cut short by trimming were returned when they ended
+            found = [e for e in found if e["start"] > self._emitted[name]]
+            if found:
+                self._emitted[name] = found[-1]["end"]
+            events += found
+            if open_start is not None:
+                open_starts.append(open_start)
+
+        # Only the frames of runs that are still open are needed again
+        self.pending_since = min(open_starts) if open_starts else None
+        keep = len(self._timestamps)
+        if self.pending_since is not None:
+            keep = int(np.searchsorted(self._timestamps, self.pending_since))
+        self._timestamps = self._timestamps[keep:]
+        for name in self._pose_rules:
+            self._masks[name] = self._masks[name][keep:]
+            self._scores[name] = self._scores[name][keep:]
+        return sorted(events, key=lambda e: e["start"])
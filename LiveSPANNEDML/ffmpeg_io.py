@@ -0,0 +1,325 @@
+import collections
+import re
+import shutil
+import subprocess
+import threading
+
+import cv2
+import numpy as np
+
+# Frame decoding and encoding backends the analyzer can use
+VIDEO_BACKENDS = ("opencv", "ffmpeg")
+
+# Raw frame layouts FFmpegCapture can deliver and FFmpegWriter accepts
+PIXEL_FORMATS = ("bgr24", "rgb24")
+
+DEFAULT_CODEC = "libx264"
+DEFAULT_PRESET = "veryfast"
+# x264/x265 speed presets, fastest first
+ENCODER_PRESETS = ("ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow")
+
+# The per-frame line of ffmpeg's showinfo filter, e.g.
+# "[Parsed_showinfo_0 @ 0x55d0] n:  12 pts:  6144 pts_time:0.48 duration: ..."
+_SHOWINFO = re.compile(r"\bn:\s*(\d+)\s+pts:\s*(-?\d+)\s+pts_time:\s*(-?[0-9.eE+-]+)")
+
+
+def ffmpeg_available(ffmpeg="ffmpeg"):
+    return shutil.which(ffmpeg) is not None
+
+
+def parse_showinfo(line):
+    """Return (frame number, presentation time in seconds) from a showinfo log line, or None."""
+    match = _SHOWINFO.search(line)
+    if match is None:
+        return None
+    return int(match.group(1)), float(match.group(3))
+
+
+def _read_lines(stream, on_line):
+    """Pass each line of a subprocess's stderr to on_line until it closes."""
+    for raw in iter(stream.readline, b""):
+        on_line(raw.decode("utf-8", "replace").rstrip())
+    stream.close()
+
+
+class FFmpegCapture:
+    def __init__(self, path, pix_fmt="bgr24", ring_size=4, ffmpeg="ffmpeg", seek_frames=None):
+        """Decode a video with an ffmpeg subprocess into a ring of preallocated frames.
+
+        A drop-in for the cv2.VideoCapture calls the analyzer makes: read(),
+        grab(), isOpened(), release(), and get()/set() of the frame position.
+        ffmpeg writes raw pix_fmt frames to a pipe, and read() copies each
+        one from the pipe straight into the next of ring_size preallocated
+        arrays, so no array is allocated per frame, and rgb24 frames go to
+        pose without a color conversion. A frame returned by read() is
+        overwritten ring_size reads later, so the ring must be larger than
+        the number of frames the caller holds at once (see reserve()).
+
+        Each frame's presentation time from ffmpeg's showinfo filter is in
+        timestamp (and CAP_PROP_POS_MSEC), so it is exact even for variable
+        frame rate video. Setting the position restarts ffmpeg there, except
+        for jumps of at most seek_frames frames forward (a second of video by
+        default), which are read past.
+        """
+        if pix_fmt not in PIXEL_FORMATS:
+            raise ValueError(f"pix_fmt must be one of {PIXEL_FORMATS}, got {pix_fmt!r}")
+        self.path = path
+        self.pix_fmt = pix_fmt
+        self.ffmpeg = ffmpeg
+
+        # Container metadata; only the frames themselves come from the pipe
+        probe = cv2.VideoCapture(path)
+        self._opened = probe.isOpened()
+        self.fps = probe.get(cv2.CAP_PROP_FPS)
+        self.frame_count = int(probe.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(probe.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(probe.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        probe.release()
+        self.seek_frames = seek_frames if seek_frames is not None else max(1, int(self.fps or 1))
+
+        self._ring = None
+        self._slot = 0
+        self.reserve(ring_size)
+        self._scratch = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.position = 0
+        self.timestamp = None
+        self._proc = None
+        self._stderr_thread = None
+        self._times = collections.deque()
+        self._time_offset = 0.0
+        self._log = collections.deque(maxlen=20)
+        self._cond = threading.Condition()
+        self._stderr_done = False
+
+    def reserve(self, ring_size):
+        """Make sure the ring holds at least ring_size frames; frames already returned stay valid."""
+        if self._ring is None or len(self._ring) < ring_size:
+            self._ring = np.empty((max(2, ring_size), self.height, self.width, 3), dtype=np.uint8)
+            self._slot = 0
+
+    @property
+    def ring_size(self):
+        return len(self._ring)
+
+    def _start(self, frame):
+        self._stop()
+        cmd = [self.ffmpeg, "-nostdin", "-hide_banner", "-nostats", "-loglevel", "info"]
+        # showinfo times frames from the seek point
+        self._time_offset = 0.0
+        if frame > 0 and self.fps:
+            # Half a frame early, so rounding can neither skip nor repeat the frame
+            self._time_offset = (frame - 0.5) / self.fps
+            cmd += ["-ss", f"{self._time_offset:.6f}"]
+        cmd += ["-i", self.path, "-map", "0:v:0", "-vf", "showinfo", "-fps_mode", "passthrough",
+                "-f", "rawvideo", "-pix_fmt", self.pix_fmt, "-"]
+        self._times.clear()
+        self._stderr_done = False
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self._stderr_thread = threading.Thread(target=self._watch_stderr, args=(self._proc.stderr,), daemon=True)
+        self._stderr_thread.start()
+        self.position = frame
+
+    def _watch_stderr(self, stream):
+        def on_line(line):
+            info = parse_showinfo(line)
+            with self._cond:
+                if info is None:
+                    self._log.append(line)
+                else:
+                    self._times.append(info[1])
+                self._cond.notify_all()
+        try:
+            _read_lines(stream, on_line)
+        finally:
+            with self._cond:
+                self._stderr_done = True
+                self._cond.notify_all()
+
+    def _stop(self):
+        if self._proc is None:
+            return
+        self._proc.kill()
+        self._proc.stdout.close()
+        self._proc.wait()
+        self._stderr_thread.join()
+        self._proc = None
+
+    def _next_time(self):
+        """Presentation time of the frame just read; showinfo logs it before the frame reaches the pipe."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._times or self._stderr_done, timeout=1.0)
+            if self._times:
+                return self._times.popleft() + self._time_offset
+        return self.position / self.fps if self.fps else None
+
+    def _read_into(self, buffer):
+        if self._proc is None:
+            self._start(self.position)
+        view = memoryview(buffer).cast("B")
+        filled = 0
+        while filled < len(view):
+            count = self._proc.stdout.readinto(view[filled:])
+            if not count:
+                if filled == 0 and self._proc.wait() not in (0, -9):
+                    print(f"ffmpeg failed decoding {self.path}: {' / '.join(self._log)}")
+                return False
+            filled += count
+        self.timestamp = self._next_time()
+        self.position += 1
+        return True
+
+    def isOpened(self):
+        return self._opened
+
+    def read(self):
+        """Decode the next frame into the ring; returns (ok, frame) like cv2.VideoCapture.read()."""
+        if not self._opened:
+            return False, None
+        frame = self._ring[self._slot]
+        if not self._read_into(frame):
+            return False, None
+        self._slot = (self._slot + 1) % len(self._ring)
+        return True, frame
+
+    def grab(self):
+        """Decode the next frame without keeping it."""
+        return self._opened and self._read_into(self._scratch)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return self.frame_count
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.width
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.height
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self.position
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return (self.timestamp or 0.0) * 1000
+        return 0.0
+
+    def set(self, prop, value):
+        if prop != cv2.CAP_PROP_POS_FRAMES:
+            return False
+        frame = int(value)
+        if self._proc is not None and 0 <= frame - self.position <= self.seek_frames:
+            while self.position < frame:
+                if not self.grab():
+                    break
+            return True
+        self._stop()
+        self.position = frame
+        return True
+
+    def release(self):
+        self._stop()
+        self._opened = False
+
+
+class FFmpegWriter:
+    def __init__(self, path, fps, frame_size, codec=DEFAULT_CODEC, preset=DEFAULT_PRESET, pix_fmt="bgr24",
+                 ffmpeg="ffmpeg", extra_args=()):
+        """Encode raw frames by piping them to an ffmpeg subprocess.
+
+        A drop-in for cv2.VideoWriter (write(), isOpened(), release()) that
+        encodes with any ffmpeg codec, libx264 by default, at a speed preset
+        (see ENCODER_PRESETS; ignored by codecs without presets). frame_size
+        is (width, height) and frames are pix_fmt arrays of that size. The
+        output is yuv420p so players can open it. extra_args go to ffmpeg
+        before the output path, e.g. ["-crf", "20"].
+        """
+        if pix_fmt not in PIXEL_FORMATS:
+            raise ValueError(f"pix_fmt must be one of {PIXEL_FORMATS}, got {pix_fmt!r}")
+        self.path = path
+        width, height = frame_size
+        self._frame_bytes = width * height * 3
+        cmd = [ffmpeg, "-nostdin", "-hide_banner", "-nostats", "-loglevel", "error", "-y",
+               "-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{width}x{height}", "-r", f"{fps}", "-i", "-",
+               "-c:v", codec]
+        if preset:
+            cmd += ["-preset", preset]
+        if codec in ("libx264", "libx265") and width % 2 == 0 and height % 2 == 0:
+            cmd += ["-pix_fmt", "yuv420p"]
+        cmd += list(extra_args) + [path]
+        self._log = collections.deque(maxlen=20)
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        self._stderr_thread = threading.Thread(target=_read_lines, args=(self._proc.stderr, self._log.append),
+                                               daemon=True)
+        self._stderr_thread.start()
+        self._failed = False
+
+    def isOpened(self):
+        return self._proc is not None and not self._failed
+
+    def write(self, frame):
+        if not self.isOpened():
+            return
+        if frame.nbytes != self._frame_bytes:
+            raise ValueError(f"Frame of shape {frame.shape} does not match the writer's frame size")
+        try:
+            self._proc.stdin.write(memoryview(np.ascontiguousarray(frame)).cast("B"))
+        except BrokenPipeError:
+            self._failed = True
+            self._stderr_thread.join()
+            print(f"ffmpeg stopped encoding {self.path}: {' / '.join(self._log)}")
+
+    def release(self):
+        if self._proc is None:
+            return
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            self._failed = True
+        returncode = self._proc.wait()
+        self._stderr_thread.join()
+        if returncode != 0 and not self._failed:
+            print(f"ffmpeg failed encoding {self.path}: {' / '.join(self._log)}")
+        self._proc = None
+
+
+class VideoIO:
+    def __init__(self, decoder="opencv", encoder="opencv", codec=DEFAULT_CODEC, preset=DEFAULT_PRESET):
+        """How the analyzer decodes its input and encodes its output.
+
+        decoder="ffmpeg" decodes frames with FFmpegCapture into a ring of
+        preallocated arrays instead of allocating one per frame, and can
+        deliver RGB frames that go to pose without a color conversion.
+        encoder="ffmpeg" encodes with FFmpegWriter at codec and preset instead
+        of cv2.VideoWriter's mp4v. Both fall back to OpenCV when ffmpeg is not
+        installed.
+        """
+        for name, backend in (("decoder", decoder), ("encoder", encoder)):
+            if backend not in VIDEO_BACKENDS:
+                raise ValueError(f"{name} must be one of {VIDEO_BACKENDS}, got {backend!r}")
+        self.decoder = decoder
+        self.encoder = encoder
+        self.codec = codec
+        self.preset = preset
+
+    def __repr__(self):
+        return (f"VideoIO(decoder={self.decoder!r}, encoder={self.encoder!r}, codec={self.codec!r}, "
+                f"preset={self.preset!r})")
+
+    @property
+    def encoding(self):
+        """Everything that decides how the output is encoded, e.g. for segments joined without re-encoding."""
+        return self.encoder, self.codec, self.preset
+
+    def open_capture(self, source, rgb=False):
+        """Open source with the decoder backend; rgb asks ffmpeg for RGB frames."""
+        if self.decoder == "ffmpeg":
+            if ffmpeg_available():
+                return FFmpegCapture(source, pix_fmt="rgb24" if rgb else "bgr24")
+            print("ffmpeg not found, decoding with OpenCV")
+        return cv2.VideoCapture(source)
+
+    def open_writer(self, path, fps, frame_size):
+        """Open a frame_size (width, height) writer at fps with the encoder backend."""
+        if self.encoder == "ffmpeg":
+            if ffmpeg_available():
+                return FFmpegWriter(path, fps, frame_size, codec=self.codec, preset=self.preset)
+            print("ffmpeg not found, encoding with OpenCV")
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        return cv2.VideoWriter(path, fourcc, fps, frame_size)
@@ -0,0 +1,110 @@
+import queue
+import threading
+
+# Marks the end of the stream as it flows through the stage queues
+_END = object()
+
+
+class FramePipeline:
+    def __init__(self, source, stages, sink, queue_size=8):
+        """Chain a frame source, processing stages and a sink with bounded queues.
+
+        source is any iterable of items, each stage is a (name, fn) pair where fn
+        maps one item to the next, and sink consumes the final items. Every stage
+        runs on its own thread with a single worker, so items reach the sink in
+        the order the source produced them. At most queue_size items wait between
+        two stages, which keeps memory bounded no matter how long the video is.
+        """
+        self.source = source
+        self.stages = list(stages)
+        self.sink = sink
+        self.queue_size = max(1, int(queue_size))
+        self._stop = threading.Event()
+        self._error = None
+        self._error_lock = threading.Lock()
+        self.queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+
+    @staticmethod
+    def max_in_flight(num_stages, queue_size):
+        """Most items alive at once: queued, held by each stage, by the source waiting to put and by the sink."""
+        return (num_stages + 1) * max(1, int(queue_size)) + num_stages + 2
+
+    def _fail(self, exc):
+        """Record the first error and tell every stage to stop."""
+        with self._error_lock:
+            if self._error is None:
+                self._error = exc
+        self._stop.set()
+
+    def _put(self, q, item):
+        """Put an item on a queue, giving up if the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        """Get an item from a queue, returning _END if the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _run_source(self):
+        try:
+            for item in self.source:
+                if not self._put(self.queues[0], item):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(self.queues[0], _END)
+
+    def _run_stage(self, index, fn):
+        in_q, out_q = self.queues[index], self.queues[index + 1]
+        try:
+            while True:
+                item = self._get(in_q)
+                if item is _END:
+                    break
+                if not self._put(out_q, fn(item)):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(out_q, _END)
+
+    def queue_depths(self):
+        """Return the current number of items waiting in front of each stage and the sink."""
+        names = [name for name, _ in self.stages] + ["sink"]
+        return {name: q.qsize() for name, q in zip(names, self.queues)}
+
+    def run(self):
+        """Run the pipeline to completion, re-raising the first stage error."""
+        threads = [threading.Thread(target=self._run_source, name="pipeline-source", daemon=True)]
+        for i, (name, fn) in enumerate(self.stages):
+            threads.append(threading.Thread(target=self._run_stage, args=(i, fn),
+                                            name=f"pipeline-{name}", daemon=True))
+        for t in threads:
+            t.start()
+
+        try:
+            while True:
+                item = self._get(self.queues[-1])
+                if item is _END:
+                    break
+                self.sink(item)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._stop.set()
+            for t in threads:
+                t.join()
+
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,141 @@
+import cv2
+import numpy as np
+
+
+def fit_size(size, width, height):
+    """Resolve a size setting for a width x height frame.
+
+    size is None (keep the frame size), an int (largest side in pixels,
+    keeping the aspect ratio) or a (width, height) tuple. Neither upscales:
+    a tuple larger than the frame is scaled down to fit inside it, keeping
+    the tuple's own aspect ratio. Returns a (width, height) tuple, or None
+    when the frame is used as is.
+    """
+    if size is None:
+        return None
+    if isinstance(size, int):
+        scale = size / max(width, height)
+        if scale >= 1:
+            return None
+        return max(1, round(width * scale)), max(1, round(height * scale))
+    target_w, target_h = int(size[0]), int(size[1])
+    scale = min(1.0, width / target_w, height / target_h)
+    size = (max(1, round(target_w * scale)), max(1, round(target_h * scale)))
+    return None if size == (width, height) else size
+
+
+def parse_size(text):
+    """Parse a CLI size: "640" for the largest side, or "640x360"."""
+    if text is None:
+        return None
+    if "x" in text.lower():
+        width, height = text.lower().split("x")
+        return int(width), int(height)
+    return int(text)
+
+
+class InferenceResizer:
+    def __init__(self, size=None, letterbox=False, pad_color=(0, 0, 0)):
+        """Shrink frames for pose inference and map the results back to the frame.
+
+        size is passed to fit_size. A (width, height) size stretches the frame
+        unless letterbox=True, which scales it to fit and pads the rest with
+        pad_color, so the model sees undistorted people. Normalized landmarks
+        from a stretched image already match the frame; with letterboxing
+        map_landmarks() and map_mask() undo the padding. Frames already at or
+        below the size pass through untouched.
+        """
+        self.size = size
+        self.letterbox = letterbox
+        self.pad_color = pad_color
+
+        self._frame_shape = None
+        self._target = None
+        self._canvas = None
+        # Content placement within the inference image: x, y, width, height
+        self._content = None
+
+    @property
+    def active(self):
+        return self._target is not None
+
+    def _configure(self, height, width):
+        self._frame_shape = (height, width)
+        self._target = fit_size(self.size, width, height)
+        self._canvas = None
+        self._content = None
+        if self._target is None:
+            return
+        target_w, target_h = self._target
+        if self.letterbox and not isinstance(self.size, int):
+            scale = min(target_w / width, target_h / height)
+            content_w, content_h = max(1, round(width * scale)), max(1, round(height * scale))
+            x, y = (target_w - content_w) // 2, (target_h - content_h) // 2
+            self._content = (x, y, content_w, content_h)
+            self._canvas = np.empty((target_h, target_w, 3), dtype=np.uint8)
+            self._canvas[:] = self.pad_color
+
+    def prepare(self, frame, rgb=False):
+        """Return the RGB image to run pose on for a BGR frame, or for an RGB one with rgb=True.
+
+        An RGB frame that needs no resizing is returned as is, and a
+        letterboxed one in a canvas reused for the next frame.
+        """
+        if frame.shape[:2] != self._frame_shape:
+            self._configure(*frame.shape[:2])
+        if self._target is None:
+            return frame if rgb else cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if self._content is None:
+            small = cv2.resize(frame, self._target, interpolation=cv2.INTER_AREA)
+            return small if rgb else cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+        x, y, w, h = self._content
+        # The padding never changes, so only the content area is rewritten
+        region = self._canvas[y:y + h, x:x + w]
+        cv2.resize(frame, (w, h), dst=region, interpolation=cv2.INTER_AREA)
+        return self._canvas if rgb else cv2.cvtColor(self._canvas, cv2.COLOR_BGR2RGB)
+
+    def map_landmarks(self, pose_landmarks):
+        """Map a NormalizedLandmarkList from the inference image to the frame, in place."""
+        if self._content is None or not pose_landmarks:
+            return pose_landmarks
+        sx, sy, ox, oy = self._scale_offset()
+        for lm in pose_landmarks.landmark:
+            lm.x = lm.x * sx - ox
+            lm.y = lm.y * sy - oy
+            lm.z = lm.z * sx
+        return pose_landmarks
+
+    def map_array(self, landmarks):
+        """Map a (landmarks, 4) array from the inference image to the frame, in place."""
+        if self._content is None:
+            return landmarks
+        sx, sy, ox, oy = self._scale_offset()
+        landmarks[:, 0] = landmarks[:, 0] * sx - ox
+        landmarks[:, 1] = landmarks[:, 1] * sy - oy
+        landmarks[:, 2] *= sx
+        return landmarks
+
+    def map_box(self, box):
+        """Map an (x0, y0, x1, y1) pixel box from the inference image to the frame."""
+        if self._target is None:
+            return box
+        height, width = self._frame_shape
+        if self._content is None:
+            fx, fy = width / self._target[0], height / self._target[1]
+            return box[0] * fx, box[1] * fy, box[2] * fx, box[3] * fy
+        x, y, w, h = self._content
+        fx, fy = width / w, height / h
+        return (box[0] - x) * fx, (box[1] - y) * fy, (box[2] - x) * fx, (box[3] - y) * fy
+
+    def map_mask(self, mask):
+        """Crop the padding off a segmentation mask; the renderer resizes it to the frame."""
+        if self._content is None or mask is None:
+            return mask
+        x, y, w, h = self._content
+        return mask[y:y + h, x:x + w]
+
+    def _scale_offset(self):
+        # Normalized inference coordinate u maps to frame coordinate u * s - o
+        x, y, w, h = self._content
+        target_w, target_h = self._target
+        return target_w / w, target_h / h, x / w, y / h
@@ -0,0 +1,231 @@
+import math
+import os
+import stat
+import time
+
+import cv2
+
+from ffmpeg_io import FFmpegCapture
+from streaming_transcriber import StreamingTranscriber
+
+# Length of the live segments the web app's QuestionScheduler works on
+DEFAULT_WINDOW_SECONDS = 15.0
+
+
+class LiveAnalyzer:
+    def __init__(self, analyzer, source, window_seconds=DEFAULT_WINDOW_SECONDS, latency_budget=None,
+                 max_lag=5.0, max_frame_skip=30, min_pose_complexity=0, complexity_cooldown=5.0,
+                 on_window=None, timeline_path=None, poll_interval=0.5, idle_timeout=10.0,
+                 speech_window_seconds=None, default_fps=30.0):
+        """Analyze a live source with a CSPANAnalyzer while keeping up with it.
+
+        source is a file that is still being written, a named pipe, or a
+        stream URL OpenCV can open (rtsp://, udp://, http://...). Regular files
+        are read at wall-clock rate and reopened at the current frame when
+        they run out, until nothing new arrives for idle_timeout seconds.
+
+        Frames are decoded with the analyzer's video_io and analyzed with its
+        pose, speech, context and event stages, but not annotated or encoded.
+        After each analyzed frame frame_skip is raised or lowered (up to max_frame_skip) so analysis
+        keeps pace with the source, and when a single frame takes longer than
+        latency_budget seconds the pose model complexity is lowered (down to
+        min_pose_complexity, and back up when there is room again, at most
+        once per complexity_cooldown seconds). If the analysis still falls
+        more than max_lag seconds behind live, frames are only grabbed, not
+        decoded, until it is back within half of that.
+
+        Results are emitted through a TimelineEmitter in window_seconds
+        windows, to on_window(window) and as JSON lines to timeline_path, as
+        soon as each window's frames, transcript and context results are
+        done. Each window also records the frame_skip, pose complexity and lag
+        in effect at its end.
+        """
+        self.analyzer = analyzer
+        self.source = source
+        self.window_seconds = window_seconds
+        self.latency_budget = latency_budget
+        self.max_lag = max_lag
+        self.max_frame_skip = max(1, int(max_frame_skip))
+        self.min_pose_complexity = min_pose_complexity
+        self.max_pose_complexity = analyzer.pose_params["model_complexity"]
+        self.complexity_cooldown = complexity_cooldown
+        self.on_window = on_window
+        self.timeline_path = timeline_path
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.speech_window_seconds = speech_window_seconds or window_seconds
+        self.default_fps = default_fps
+
+        self.frame_skip = 1
+        self.frame_cost = None  # moving average of seconds spent analyzing one frame
+        self.lag = 0.0
+        self.position = 0  # index of the next frame to read
+        self.fps = None
+        self._stopped = False
+        self._last_complexity_change = -math.inf
+        self._complexity_costs = {}  # complexity -> (frame cost, when it was measured)
+
+    def _source_kind(self):
+        if "://" in self.source:
+            return "stream"
+        if os.path.exists(self.source) and stat.S_ISFIFO(os.stat(self.source).st_mode):
+            return "pipe"
+        return "file"
+
+    def _open(self, position=0):
+        if self.analyzer.video_io.decoder == "ffmpeg" and self._source_kind() == "pipe":
+            # FFmpegCapture probes the source before decoding it, which would eat the start of a pipe
+            print("The ffmpeg decoder cannot read named pipes, decoding with OpenCV")
+            cap = cv2.VideoCapture(self.source)
+        else:
+            # Frames are never drawn, so ffmpeg can decode them straight to RGB for pose
+            cap = self.analyzer._open_capture(rgb=True, source=self.source)
+        if position:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+        return cap
+
+    def stop(self):
+        """Ask run() to finish after the current frame."""
+        self._stopped = True
+
+    def _available_seconds(self):
+        return self.position / self.fps if self.fps else 0.0
+
+    def run(self, max_seconds=None):
+        """Analyze the source until it ends, stop() is called or max_seconds of it are read."""
+        analyzer = self.analyzer
+        kind = self._source_kind()
+        cap = self._open()
+        if not cap.isOpened():
+            raise IOError(f"Could not open live source {self.source}")
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or self.default_fps
+        # Streams and pipes arrive at their own pace; a file is paced by the clock
+        paced = kind == "file"
+
+        analyzer.metrics.reset()
+        analyzer._reset_frame_state(self.fps, wait_for_speech=False)
+        analyzer._frames_rgb = isinstance(cap, FFmpegCapture) and cap.pix_fmt == "rgb24"
+        analyzer._start_events()
+        analyzer._start_stats()
+        analyzer.search_video = analyzer.search_video or self.source
+        if analyzer.enable_speech and kind == "file":
+            # Audio can only be cut into windows from a seekable file
+            analyzer.transcriber = StreamingTranscriber(
+                analyzer.speech_model, self.source, self._available_seconds, analyzer.speech_segments,
+                window_seconds=self.speech_window_seconds,
+                overlap_seconds=min(5.0, self.speech_window_seconds / 5), metrics=analyzer.metrics
+            ).start()
+        elif analyzer.enable_speech:
+            print(f"Speech transcription needs a seekable file, skipping it for {kind} sources.")
+        analyzer.context_stage.background = True
+        analyzer.context_stage.start()
+        timeline = analyzer.start_timeline(self.timeline_path, self.window_seconds, self.on_window)
+
+        print(f"Analyzing live {kind} {self.source} at {self.fps:.1f} fps...")
+        self.position = 0
+        next_analyzed = 0
+        catching_up = False
+        clock_start = time.monotonic()
+        idle_since = None
+        try:
+            while not self._stopped:
+                if max_seconds is not None and self.position / self.fps >= max_seconds:
+                    break
+                due = clock_start + self.position / self.fps
+                if paced:
+                    time.sleep(max(0.0, due - time.monotonic()))
+                self.lag = max(0.0, time.monotonic() - due)
+
+                # Skip decoding entirely while catching up with live
+                if self.lag > self.max_lag:
+                    catching_up = True
+                elif self.lag <= self.max_lag / 2:
+                    catching_up = False
+                analyze = self.position >= next_analyzed and not catching_up
+
+                start = time.perf_counter()
+                if analyze:
+                    ret, frame = cap.read()
+                else:
+                    ret, frame = cap.grab(), None
+                if ret:
+                    analyzer.metrics.observe("decode" if analyze else "grab", time.perf_counter() - start)
+                if not ret:
+                    if kind != "file":
+                        break
+                    # Wait for a growing file to be written further
+                    idle_since = idle_since or time.monotonic()
+                    if time.monotonic() - idle_since > self.idle_timeout:
+                        break
+                    cap.release()
+                    time.sleep(self.poll_interval)
+                    cap = self._open(self.position)
+                    continue
+                if idle_since is not None:
+                    # The file stalled, so its timeline did too
+                    clock_start += time.monotonic() - idle_since
+                    idle_since = None
+
+                if analyze:
+                    start = time.perf_counter()
+                    analyzer._analyze_frame(self.position, frame)
+                    self._adapt(time.perf_counter() - start)
+                    next_analyzed = self.position + self.frame_skip
+                    timeline.note(self.position / self.fps, frame_skip=self.frame_skip, lag=self.lag,
+                                  pose_complexity=analyzer.pose_params["model_complexity"])
+                    analyzer.metrics.set_gauge("lag_seconds", self.lag)
+                    analyzer.metrics.set_gauge("frame_skip", self.frame_skip)
+                    analyzer.metrics.set_gauge("pose_complexity", analyzer.pose_params["model_complexity"])
+                self.position += 1
+                if self.position % analyzer.progress_interval == 0:
+                    analyzer._report_progress(self.position)
+                analyzer._update_timeline(self.position / self.fps)
+        finally:
+            cap.release()
+
+        # Finish the partial last window once the transcript has caught up
+        if analyzer.transcriber is not None:
+            analyzer.transcriber.finish()
+            analyzer.transcriber.join()
+        if analyzer.search_index is not None:
+            analyzer._update_search_index()
+        analyzer.context_data.extend(analyzer.context_stage.flush())
+        analyzer._finish_events()
+        analyzer._finish_stats()
+        analyzer._finish_timeline(self.position / self.fps)
+        print(f"Live analysis stopped after {self.position / self.fps:.1f}s with {len(timeline.windows)} windows.")
+        return timeline.windows
+
+    def _adapt(self, cost):
+        """Update frame_skip and the pose complexity after an analyzed frame took cost seconds."""
+        self.frame_cost = cost if self.frame_cost is None else 0.8 * self.frame_cost + 0.2 * cost
+
+        # Analyze as often as the frame cost allows, with 10% headroom
+        needed = math.ceil(self.frame_cost * self.fps * 1.1)
+        self.frame_skip = min(max(needed, 1), self.max_frame_skip)
+
+        if self.latency_budget is None or not self.analyzer.enable_pose:
+            return
+        now = time.monotonic()
+        if now - self._last_complexity_change < self.complexity_cooldown:
+            return
+        complexity = self.analyzer.pose_params["model_complexity"]
+        self._complexity_costs[complexity] = (self.frame_cost, now)
+        if self.frame_cost > self.latency_budget and complexity > self.min_pose_complexity:
+            complexity -= 1
+        elif complexity < self.max_pose_complexity and self._fits_budget(complexity + 1, now):
+            complexity += 1
+        else:
+            return
+        print(f"Frame cost {self.frame_cost * 1000:.0f}ms, switching to pose complexity {complexity}")
+        self.analyzer.set_pose_complexity(complexity)
+        self._last_complexity_change = now
+        self.frame_cost = None
+
+    def _fits_budget(self, complexity, now):
+        cost, measured_at = self._complexity_costs.get(complexity, (None, -math.inf))
+        # Retry a complexity that was too slow once the measurement is old, as load may have changed
+        if now - measured_at > 10 * self.complexity_cooldown:
+            # Each complexity step costs roughly 2-3x, so only step up with plenty of room
+            return self.frame_cost * 3 < self.latency_budget
+        return cost < self.latency_budget
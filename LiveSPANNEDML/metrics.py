@@ -0,0 +1,225 @@
+import bisect
+import json
+import threading
+import time
+
+# Upper bounds in seconds of the latency histogram buckets, doubling from 0.5ms to about 16s
+DEFAULT_BUCKETS = tuple(0.0005 * 2 ** i for i in range(16))
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self, num_buckets):
+        self.counts = [0] * (num_buckets + 1)  # the last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    def __init__(self, buckets=DEFAULT_BUCKETS, enabled=True):
+        """Per-stage latency histograms, counters and gauges for the analyzer.
+
+        Stages are timed with time() as a context manager or by passing a
+        duration to observe(). Each observation is a perf_counter() call, a
+        bisect over the fixed bucket bounds and a few additions under a lock,
+        so it is cheap enough to leave on. Counters only go up (frames
+        decoded, pose inferences, ...) and are turned into rates by
+        snapshot(); gauges hold the latest value of something like a queue
+        depth. Observers added with add_observer() get a snapshot() every
+        time notify() is called. With enabled=False every call is a no-op.
+        """
+        self.buckets = tuple(buckets)
+        self.enabled = enabled
+        self.observers = []
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop every measurement and restart the clock rates are computed from."""
+        with self._lock:
+            self.histograms = {}
+            self.counters = {}
+            self.gauges = {}
+            self.started = time.perf_counter()
+
+    def time(self, name):
+        """Context manager timing the enclosed block as stage name."""
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def observe(self, name, seconds):
+        """Record one stage latency in seconds."""
+        if not self.enabled:
+            return
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = _Histogram(len(self.buckets))
+            histogram.counts[i] += 1
+            histogram.count += 1
+            histogram.total += seconds
+            if seconds > histogram.max:
+                histogram.max = seconds
+
+    def increment(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        """Set a gauge, optionally labeled, e.g. set_gauge("queue_depth", 3, stage="pose")."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def merge(self, other):
+        """Add another Metrics' measurements, e.g. from a worker process, into this one."""
+        if other.buckets != self.buckets:
+            raise ValueError("Cannot merge metrics with different histogram buckets")
+        with self._lock:
+            for name, h in other.histograms.items():
+                mine = self.histograms.get(name)
+                if mine is None:
+                    mine = self.histograms[name] = _Histogram(len(self.buckets))
+                mine.counts = [a + b for a, b in zip(mine.counts, h.counts)]
+                mine.count += h.count
+                mine.total += h.total
+                mine.max = max(mine.max, h.max)
+            for name, value in other.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def __getstate__(self):
+        # Locks and observer callbacks stay in the process that created them
+        state = dict(self.__dict__)
+        del state["_lock"]
+        state["observers"] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add_observer(self, observer):
+        """Call observer(snapshot) on every notify()."""
+        self.observers.append(observer)
+        return observer
+
+    def notify(self):
+        if not self.observers:
+            return
+        snapshot = self.snapshot()
+        for observer in self.observers:
+            observer(snapshot)
+
+    def _quantile(self, histogram, q):
+        # Upper bound of the bucket holding the q-th observation, capped by the largest one seen
+        rank = q * histogram.count
+        seen = 0
+        for bound, count in zip(self.buckets, histogram.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, histogram.max)
+        return histogram.max
+
+    def snapshot(self):
+        """Return every measurement as a JSON-serializable dict."""
+        with self._lock:
+            elapsed = time.perf_counter() - self.started
+            stages = {}
+            for name, h in self.histograms.items():
+                stages[name] = {
+                    "count": h.count,
+                    "total_seconds": h.total,
+                    "mean_seconds": h.total / h.count,
+                    "p50_seconds": self._quantile(h, 0.5),
+                    "p95_seconds": self._quantile(h, 0.95),
+                    "p99_seconds": self._quantile(h, 0.99),
+                    "max_seconds": h.max,
+                }
+            counters = dict(self.counters)
+            gauges = {}
+            for (name, labels), value in self.gauges.items():
+                key = name + "".join(f"[{k}={v}]" for k, v in labels)
+                gauges[key] = value
+        return {
+            "elapsed_seconds": elapsed,
+            "stages": stages,
+            "counters": counters,
+            "rates_per_second": {name: value / elapsed for name, value in counters.items()} if elapsed > 0 else {},
+            "gauges": gauges,
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix="cspan"):
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            if self.histograms:
+                lines.append(f"# HELP {prefix}_stage_seconds Time spent per call of each analysis stage.")
+                lines.append(f"# TYPE {prefix}_stage_seconds histogram")
+            for name, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {h.total!r}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {h.count}')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                lines.append(f"{prefix}_{name}_total {value}")
+            typed = set()
+            for (name, labels), value in sorted(self.gauges.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {prefix}_{name} gauge")
+                    typed.add(name)
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text else f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def save(self, path):
+        """Write the metrics to path, in Prometheus text format for a .prom file and JSON otherwise."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus() if path.endswith(".prom") else self.to_json(indent=2))
+        return path
+
+
+def print_progress(progress):
+    """Default progress callback, printing one line per report."""
+    total = progress["total_frames"]
+    percent = f" ({progress['frames'] / total * 100:.1f}%)" if total else ""
+    print(f"Processed {progress['frames']}/{total or '?'} frames{percent}, "
+          f"{progress['frames_per_second']:.1f} frames/s")
@@ -0,0 +1,92 @@
+import os
+import threading
+
+# The models the transformers pipelines pick when no model is named
+DEFAULT_SUMMARIZATION_MODEL = "sshleifer/distilbart-cnn-12-6"
+DEFAULT_ZERO_SHOT_MODEL = "facebook/bart-large-mnli"
+
+
+class ModelRegistry:
+    # Loaded models shared by every registry (and so every analyzer) in the process
+    _models = {}
+    _locks = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, model_dir=None):
+        """Lazily load and share the analyzer's models.
+
+        Whisper and the transformers pipelines are loaded on first request and
+        kept for the life of the process, so further analyzers reuse them
+        instead of loading their own copies. The heavy libraries are only
+        imported when a model is first needed. With model_dir set, models are
+        only loaded from that directory (whisper as <name>.pt, transformers
+        models as <name>/), which keeps startup offline.
+        """
+        self.model_dir = model_dir
+
+    def _get(self, key, loader):
+        with self._registry_lock:
+            if key in self._models:
+                return self._models[key]
+            lock = self._locks.setdefault(key, threading.Lock())
+        # Load outside the registry lock so different models can load in parallel
+        with lock:
+            if key not in self._models:
+                model = loader()
+                with self._registry_lock:
+                    self._models[key] = model
+        return self._models[key]
+
+    def _local_path(self, name, suffix=""):
+        path = os.path.join(self.model_dir, f"{name}{suffix}")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model {name!r} not found in local model directory {self.model_dir}: {path}")
+        return path
+
+    def whisper(self, name="base"):
+        """Return a shared Whisper model."""
+        def load():
+            import whisper
+            print(f"Loading Whisper model {name}...")
+            if self.model_dir:
+                return whisper.load_model(self._local_path(name, ".pt"))
+            return whisper.load_model(name)
+        return self._get(("whisper", name, self.model_dir), load)
+
+    def _pipeline(self, task, name):
+        def load():
+            from transformers import pipeline
+            print(f"Loading {task} pipeline {name}...")
+            model = self._local_path(name) if self.model_dir else name
+            return pipeline(task, model=model)
+        return self._get((task, name, self.model_dir), load)
+
+    def summarizer(self, name=None):
+        """Return a shared summarization pipeline."""
+        return self._pipeline("summarization", name or DEFAULT_SUMMARIZATION_MODEL)
+
+    def zero_shot(self, name=None):
+        """Return a shared zero-shot classification pipeline."""
+        return self._pipeline("zero-shot-classification", name or DEFAULT_ZERO_SHOT_MODEL)
+
+    def pose(self, **params):
+        """Create a MediaPipe Pose instance.
+
+        Pose keeps per-video tracking state, so unlike the other models each
+        caller gets its own instance.
+        """
+        import mediapipe as mp
+        return mp.solutions.pose.Pose(**params)
+
+    @classmethod
+    def loaded(cls):
+        """Return the keys of the models loaded so far in this process."""
+        with cls._registry_lock:
+            return list(cls._models)
+
+    @classmethod
+    def clear(cls):
+        """Drop every shared model so its memory can be reclaimed."""
+        with cls._registry_lock:
+            cls._models.clear()
+            cls._locks.clear()
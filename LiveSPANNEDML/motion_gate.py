@@ -0,0 +1,82 @@
+import cv2
+import numpy as np
+
+# What MotionGate.check() decides for a frame
+CUT = "cut"
+STATIC = "static"
+MOVING = "moving"
+
+
+class MotionGate:
+    def __init__(self, size=(160, 90), pixel_threshold=12, motion_threshold=0.002, cut_threshold=0.5,
+                 hist_bins=32, max_reuse=15):
+        """Cheap per-frame check of whether pose inference needs to run.
+
+        Each frame is shrunk to a size grayscale thumbnail. A shot cut is a
+        Bhattacharyya distance of more than cut_threshold between the gray
+        histograms of consecutive frames. Otherwise the frame is compared with
+        the thumbnail of the last frame pose ran on: if fewer than
+        motion_threshold of its pixels changed by more than pixel_threshold
+        levels, nothing moved and the previous landmarks can be reused.
+        Comparing against the last inferred frame, not the previous one, lets
+        slow drift add up until it triggers inference, and at most max_reuse
+        frames in a row are reused either way.
+        """
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.motion_threshold = motion_threshold
+        self.cut_threshold = cut_threshold
+        self.hist_bins = hist_bins
+        self.max_reuse = max_reuse
+
+        self.reused = 0
+        self.inferred = 0
+        self.cuts = 0
+        self.last_score = 0.0
+        self._reference = None
+        self._previous_hist = None
+        self._reuse_run = 0
+        self._diff = None
+
+    def reset(self):
+        """Forget the previous frames, e.g. at the start of a new video or chunk."""
+        self._reference = None
+        self._previous_hist = None
+        self._reuse_run = 0
+
+    def check(self, frame, rgb=False):
+        """Return CUT, STATIC or MOVING for a BGR frame, or an RGB one with rgb=True."""
+        small = cv2.cvtColor(cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA),
+                             cv2.COLOR_RGB2GRAY if rgb else cv2.COLOR_BGR2GRAY)
+        hist = cv2.calcHist([small], [0], None, [self.hist_bins], [0, 256])
+        cv2.normalize(hist, hist, 1.0, 0.0, cv2.NORM_L1)
+
+        previous_hist, self._previous_hist = self._previous_hist, hist
+        if previous_hist is not None:
+            self.last_score = cv2.compareHist(previous_hist, hist, cv2.HISTCMP_BHATTACHARYYA)
+            if self.last_score > self.cut_threshold:
+                self.cuts += 1
+                return self._infer(small, CUT)
+
+        if self._reference is None or self._reuse_run >= self.max_reuse:
+            return self._infer(small, MOVING)
+        if self._diff is None or self._diff.shape != small.shape:
+            self._diff = np.empty_like(small)
+        cv2.absdiff(small, self._reference, dst=self._diff)
+        changed = np.count_nonzero(self._diff > self.pixel_threshold) / self._diff.size
+        if changed >= self.motion_threshold:
+            return self._infer(small, MOVING)
+
+        self._reuse_run += 1
+        self.reused += 1
+        return STATIC
+
+    def _infer(self, small, decision):
+        self._reference = small
+        self._reuse_run = 0
+        self.inferred += 1
+        return decision
+
+    def stats(self):
+        """Counts of frames inferred, reused and cut so far."""
+        return {"inferred": self.inferred, "reused": self.reused, "cuts": self.cuts}
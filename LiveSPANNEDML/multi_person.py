@@ -0,0 +1,246 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+
+def box_iou(a, b):
+    """Intersection over union of two (x0, y0, x1, y1) boxes."""
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    if w <= 0 or h <= 0:
+        return 0.0
+    inter = w * h
+    return inter / ((a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter)
+
+
+def landmark_box(landmarks, width, height, min_visibility=0.5):
+    """Pixel (x0, y0, x1, y1) box around the landmarks visible in a width x height frame, or None."""
+    visible = landmarks[landmarks[:, 3] > min_visibility, :2]
+    if len(visible) < 2:
+        return None
+    xs, ys = visible[:, 0] * width, visible[:, 1] * height
+    return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+
+
+class HogPersonDetector:
+    def __init__(self, max_width=640, min_score=0.5, nms_threshold=0.4):
+        """OpenCV's HOG + linear SVM pedestrian detector.
+
+        Frames wider than max_width are downscaled first, which keeps a
+        detection pass cheap enough to run every few frames. Returns
+        (x0, y0, x1, y1, score) boxes in the original frame's pixels, and no
+        boxes for frames smaller than the 64x128 detection window.
+        """
+        self.max_width = max_width
+        self.min_score = min_score
+        self.nms_threshold = nms_threshold
+        self.hog = cv2.HOGDescriptor()
+        self.hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+
+    def __call__(self, frame):
+        scale = min(1.0, self.max_width / frame.shape[1])
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else frame
+        window_w, window_h = self.hog.winSize
+        if small.shape[0] < window_h or small.shape[1] < window_w:
+            # detectMultiScale crashes the process on images smaller than its window
+            return []
+        rects, weights = self.hog.detectMultiScale(small, winStride=(8, 8), padding=(8, 8), scale=1.05)
+        if len(rects) == 0:
+            return []
+        scores = np.asarray(weights, dtype=np.float32).reshape(-1)
+        keep = cv2.dnn.NMSBoxes([list(map(int, r)) for r in rects], scores.tolist(),
+                                self.min_score, self.nms_threshold)
+        boxes = []
+        for i in np.asarray(keep).reshape(-1):
+            x, y, w, h = rects[i] / scale
+            boxes.append((float(x), float(y), float(x + w), float(y + h), float(scores[i])))
+        return boxes
+
+
+class _PersonTrack:
+    def __init__(self, track_id, box, pose):
+        self.id = track_id
+        self.box = box
+        self.pose = pose
+        self.misses = 0  # detection passes in a row without a matching box
+        self.lost = 0  # frames in a row without landmarks
+
+
+class MultiPersonPose:
+    def __init__(self, pose_factory, detector=None, detect_every=10, max_people=6, iou_threshold=0.3,
+                 max_misses=2, crop_margin=0.2, min_visibility=0.5, workers=None):
+        """Pose for every person in the frame, with track IDs that stay stable across frames.
+
+        A person detector (HogPersonDetector by default) runs only every
+        detect_every processed frames. Its boxes are matched to the current
+        tracks by IoU with their crops, or by containing a track's center; unmatched boxes start new tracks (up to max_people) and tracks
+        that go unmatched for more than max_misses passes are dropped. In
+        between, each track's crop follows its person: the box is recomputed
+        from the landmarks found in the last frame, grown by crop_margin.
+
+        Each track owns a Pose instance from pose_factory(), so MediaPipe's
+        own frame-to-frame tracking works within the crop. MediaPipe has no
+        batched API, so the crops of one frame are processed as a batch on a
+        thread pool (MediaPipe releases the GIL while it runs), and the cost
+        per frame is one small-crop inference per person plus an amortized
+        share of the detection pass. Pose instances of dropped tracks are
+        reused for new ones.
+        """
+        self.pose_factory = pose_factory
+        self.detector = detector or HogPersonDetector()
+        self.detect_every = max(1, int(detect_every))
+        self.max_people = max_people
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.crop_margin = crop_margin
+        self.min_visibility = min_visibility
+
+        self.tracks = []
+        self.next_id = 0  # ID of the next new track
+        self._free_poses = []
+        self._until_detect = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers or max_people,
+                                            thread_name_prefix="person-pose")
+
+    def _acquire_pose(self):
+        if self._free_poses:
+            return self._free_poses.pop()
+        return self.pose_factory()
+
+    def _release(self, track):
+        # Forget the previous person's tracking state before reusing the instance
+        reset = getattr(track.pose, "reset", None)
+        if reset is not None:
+            reset()
+            self._free_poses.append(track.pose)
+        else:
+            track.pose.close()
+
+    def _match_score(self, box, detection):
+        # Landmark boxes are tighter than detector boxes, so compare the
+        # detection with the track's crop and accept it if it contains the track
+        x0, y0, x1, y1 = box
+        mx, my = (x1 - x0) * self.crop_margin, (y1 - y0) * self.crop_margin
+        score = box_iou((x0 - mx, y0 - my, x1 + mx, y1 + my), detection)
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        if detection[0] <= cx <= detection[2] and detection[1] <= cy <= detection[3]:
+            score = max(score, self.iou_threshold)
+        return score
+
+    def _update_tracks(self, detections):
+        detections = sorted(detections, key=lambda d: d[4], reverse=True)
+        pairs = sorted(((self._match_score(t.box, d), ti, di) for ti, t in enumerate(self.tracks)
+                        for di, d in enumerate(detections)), reverse=True)
+        matched_tracks, matched_dets = set(), set()
+        for iou, ti, di in pairs:
+            if iou < self.iou_threshold:
+                break
+            if ti in matched_tracks or di in matched_dets:
+                continue
+            track = self.tracks[ti]
+            # Re-center on the detector's box so crops do not drift
+            track.box = detections[di][:4]
+            track.misses = 0
+            matched_tracks.add(ti)
+            matched_dets.add(di)
+
+        kept = []
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.misses += 1
+            if track.misses > self.max_misses:
+                self._release(track)
+            else:
+                kept.append(track)
+        self.tracks = kept
+
+        for di, detection in enumerate(detections):
+            if di in matched_dets or len(self.tracks) >= self.max_people:
+                continue
+            self.tracks.append(_PersonTrack(self.next_id, detection[:4], self._acquire_pose()))
+            self.next_id += 1
+
+    def _crop_box(self, box, width, height):
+        x0, y0, x1, y1 = box
+        mx, my = (x1 - x0) * self.crop_margin, (y1 - y0) * self.crop_margin
+        return (max(0, int(x0 - mx)), max(0, int(y0 - my)),
+                min(width, int(np.ceil(x1 + mx))), min(height, int(np.ceil(y1 + my))))
+
+    def _run_pose(self, track, frame, crop):
+        x0, y0, x1, y1 = crop
+        if x1 - x0 < 8 or y1 - y0 < 8:
+            return None
+        results = track.pose.process(np.ascontiguousarray(frame[y0:y1, x0:x1]))
+        if not results.pose_landmarks:
+            return None
+        height, width = frame.shape[:2]
+        crop_w, crop_h = x1 - x0, y1 - y0
+        landmarks = np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in results.pose_landmarks.landmark],
+                             dtype=np.float32)
+        # Map crop-normalized coordinates back to the full frame
+        landmarks[:, 0] = (x0 + landmarks[:, 0] * crop_w) / width
+        landmarks[:, 1] = (y0 + landmarks[:, 1] * crop_h) / height
+        landmarks[:, 2] *= crop_w / width
+        return landmarks
+
+    def process(self, frame_rgb):
+        """Detect (every detect_every calls) and track people in an RGB frame.
+
+        Returns a list of {"id", "box", "landmarks"} dicts, one per person
+        with landmarks this frame, ordered by track ID. Landmarks are a
+        (33, 4) array normalized to the full frame like single-person Pose
+        results; boxes are (x0, y0, x1, y1) pixels.
+        """
+        height, width = frame_rgb.shape[:2]
+        if self._until_detect == 0:
+            self._update_tracks(self.detector(frame_rgb))
+            self._until_detect = self.detect_every
+        self._until_detect -= 1
+
+        crops = [self._crop_box(track.box, width, height) for track in self.tracks]
+        results = list(self._executor.map(lambda job: self._run_pose(job[0], frame_rgb, job[1]),
+                                          zip(self.tracks, crops)))
+
+        people = []
+        kept = []
+        for track, landmarks in zip(self.tracks, results):
+            if landmarks is None:
+                track.lost += 1
+                # Give up on a person who stayed out of view until the next detection
+                if track.lost > self.detect_every:
+                    self._release(track)
+                    continue
+                kept.append(track)
+                continue
+            track.lost = 0
+            box = landmark_box(landmarks, width, height, self.min_visibility)
+            if box is not None:
+                track.box = box
+            kept.append(track)
+            people.append({"id": track.id, "box": track.box, "landmarks": landmarks})
+        self.tracks = kept
+        return sorted(people, key=lambda p: p["id"])
+
+    def reset(self):
+        """End every track and detect again on the next frame, e.g. after a shot cut."""
+        for track in self.tracks:
+            self._release(track)
+        self.tracks = []
+        self._until_detect = 0
+
+    def close(self):
+        """Release every Pose instance and the worker threads."""
+        for track in self.tracks:
+            track.pose.close()
+        for pose in self._free_poses:
+            pose.close()
+        self.tracks, self._free_poses = [], []
+        self._executor.shutdown()
+
+
+def primary_person(people):
+    """The person with the largest box, usually the speaker in the foreground."""
+    if not people:
+        return None
+    return max(people, key=lambda p: (p["box"][2] - p["box"][0]) * (p["box"][3] - p["box"][1]))
@@ -0,0 +1,155 @@
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+TITLE = "CSPAN Video Analysis"
+SUBTITLE = "Multi-Person Pose Tracking + Speech Analysis"
+
+# Heights of the darkened bars and how strongly they darken the video
+TITLE_BAR_HEIGHT = 61  # rows 0-60; the original rectangle included its end row
+TITLE_BAR_ALPHA = 0.7
+SPEECH_BAR_HEIGHT = 180
+SPEECH_BAR_ALPHA = 0.8  # More opaque for better readability
+
+
+def wrap_text(text, max_width=80):
+    """Split text into lines of at most max_width characters."""
+    lines = []
+    current_line = ""
+    for word in text.split():
+        if len(current_line + " " + word) <= max_width:
+            current_line += " " + word if current_line else word
+        else:
+            lines.append(current_line)
+            current_line = word
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+class _TextLayer:
+    def __init__(self, height, width, draw):
+        """Pre-rendered text for one overlay bar.
+
+        draw(image, color_override) renders the text. It runs once into a
+        color layer over black and once into a single-channel coverage mask,
+        so black shadows are covered too. Since the layer is effectively
+        premultiplied by its coverage, stamping it is frame * (1 - coverage)
+        + layer over the text's bounding box, which keeps antialiased edges
+        blended with the video like drawing the text directly would.
+        """
+        layer = np.zeros((height, width, 3), dtype=np.uint8)
+        mask = np.zeros((height, width), dtype=np.uint8)
+        draw(layer, None)
+        draw(mask, 255)
+
+        ys, xs = np.nonzero(mask)
+        if len(ys) == 0:
+            self.box = None
+            return
+        y0, y1, x0, x1 = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+        self.box = (y0, y1, x0, x1)
+        self.layer = np.ascontiguousarray(layer[y0:y1, x0:x1])
+        self.inverse_coverage = cv2.cvtColor(255 - mask[y0:y1, x0:x1], cv2.COLOR_GRAY2BGR)
+
+    def stamp(self, bar):
+        """Composite the text into bar, a view of the frame region it was rendered for."""
+        if self.box is None:
+            return
+        y0, y1, x0, x1 = self.box
+        box = bar[y0:y1, x0:x1]
+        cv2.multiply(box, self.inverse_coverage, dst=box, scale=1 / 255)
+        cv2.add(box, self.layer, dst=box)
+
+
+class OverlayRenderer:
+    def __init__(self):
+        """Draws the analyzer's overlays while reusing as much work as possible.
+
+        The title bar text depends only on the frame width, so it is rendered
+        once per resolution. The wrapped speech text is rendered again only
+        when the text changes. The bars are darkened in place on their own rows
+        instead of blending full-frame copies. The segmentation background
+        image and mask buffer are allocated once per resolution.
+        """
+        self._title_layers = {}
+        self._speech_key = None
+        self._speech_layer = None
+        self._backgrounds = {}
+        self._mask_buffers = {}
+
+    def _title_layer(self, width):
+        if width not in self._title_layers:
+            text_size = cv2.getTextSize(SUBTITLE, FONT, 0.7, 2)[0]
+
+            def draw(image, color):
+                # Add main title with shadow
+                cv2.putText(image, TITLE, (20, 40), FONT, 1.2, color or (0, 0, 0), 3, cv2.LINE_AA)
+                cv2.putText(image, TITLE, (20, 40), FONT, 1.2, color or (0, 255, 255), 2, cv2.LINE_AA)
+                # Add ML analysis label right-aligned
+                position = (width - text_size[0] - 20, 40)
+                cv2.putText(image, SUBTITLE, position, FONT, 0.7, color or (0, 0, 0), 3, cv2.LINE_AA)
+                cv2.putText(image, SUBTITLE, position, FONT, 0.7, color or (0, 255, 255), 2, cv2.LINE_AA)
+
+            self._title_layers[width] = _TextLayer(TITLE_BAR_HEIGHT, width, draw)
+        return self._title_layers[width]
+
+    def _speech_text_layer(self, text, width, bar_height):
+        key = (text, width, bar_height)
+        if key != self._speech_key:
+            lines = wrap_text(text)
+            # Line positions relative to the bottom bar, which starts SPEECH_BAR_HEIGHT rows from the bottom
+            offset = bar_height - SPEECH_BAR_HEIGHT
+
+            def draw(image, color):
+                for i, line in enumerate(lines):
+                    y_pos = offset + 30 + (i * 30)
+                    # Draw each line with shadow effect for better readability
+                    cv2.putText(image, line, (22, y_pos + 2), FONT, 0.7, color or (0, 0, 0), 2, cv2.LINE_AA)
+                    cv2.putText(image, line, (20, y_pos), FONT, 0.7, color or (255, 255, 255), 2, cv2.LINE_AA)
+
+            self._speech_layer = _TextLayer(bar_height, width, draw)
+            self._speech_key = key
+        return self._speech_layer
+
+    @staticmethod
+    def _darken(region, alpha):
+        """Blend a frame region with black in place."""
+        if region.size:
+            cv2.addWeighted(region, 1 - alpha, region, 0, 0, dst=region)
+
+    def draw_text_overlay(self, frame, text, timestamp_str=None):
+        """Draw the speech bar, title bar and timestamp onto frame in place."""
+        height, width = frame.shape[:2]
+
+        # Add semi-transparent background and speech text at the bottom
+        bottom = frame[max(0, height - SPEECH_BAR_HEIGHT):]
+        self._darken(bottom, SPEECH_BAR_ALPHA)
+        if text:
+            self._speech_text_layer(text, width, bottom.shape[0]).stamp(bottom)
+
+        # Add title with better styling
+        top = frame[:TITLE_BAR_HEIGHT]
+        self._darken(top, TITLE_BAR_ALPHA)
+        self._title_layer(width).stamp(top)
+
+        # Add timestamp if available
+        if timestamp_str is not None:
+            cv2.putText(frame, timestamp_str, (width - 200, 80), FONT, 0.6, (200, 200, 200), 2, cv2.LINE_AA)
+        return frame
+
+    def composite_segmentation(self, frame, segmentation_mask, threshold=0.1, color=(192, 192, 192)):
+        """Replace the background (mask <= threshold) with a flat color, in place."""
+        height, width = frame.shape[:2]
+        key = (height, width, color)
+        if key not in self._backgrounds:
+            self._backgrounds[key] = np.full(frame.shape, color, dtype=np.uint8)
+            self._mask_buffers[(height, width)] = np.empty((height, width), dtype=np.uint8)
+        background = self._backgrounds[key]
+        mask_buffer = self._mask_buffers[(height, width)]
+
+        if segmentation_mask.shape[:2] != (height, width):
+            segmentation_mask = cv2.resize(segmentation_mask, (width, height), interpolation=cv2.INTER_LINEAR)
+        cv2.compare(segmentation_mask, threshold, cv2.CMP_LE, dst=mask_buffer)
+        cv2.copyTo(background, mask_buffer, frame)
+        return frame
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+
+class StubPose:
+    """Stands in for MediaPipe Pose in tests; subclasses place the 33 landmarks with points(image)"""
+
+    def process(self, image):
+        from mediapipe.framework.formats import landmark_pb2
+
+        landmarks = landmark_pb2.NormalizedLandmarkList()
+        for x, y in self.points(image):
+            landmarks.landmark.add(x=x, y=y, z=0.0, visibility=1.0)
+        return SimpleNamespace(pose_landmarks=landmarks, segmentation_mask=None)
+
+    def points(self, image):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class BrightnessPose(StubPose):
+    """Landmarks follow the frame's brightness, so any change in the picture moves them"""
+
+    def points(self, image):
+        level = float(image.mean()) / 255
+        return [(level, (i + 1) / 34) for i in range(33)]
+
+
+class SquarePose(StubPose):
+    """Every landmark sits on the bright square in the frame"""
+
+    def points(self, image):
+        ys, xs = np.nonzero(image[:, :, 0] > 200)
+        return [(xs.mean() / image.shape[1], ys.mean() / image.shape[0])] * 33
@@ -0,0 +1,190 @@
+import os
+
+import numpy as np
+
+# MediaPipe Pose landmark count; each landmark is stored as x, y, z, visibility
+NUM_LANDMARKS = 33
+
+
+class PoseTrack:
+    def __init__(self, capacity=1024, num_landmarks=NUM_LANDMARKS):
+        """Columnar store of per-frame pose landmarks backed by NumPy arrays.
+
+        Landmarks live in one float32 array of shape (frames, landmarks, 4)
+        alongside frame number and timestamp arrays. The arrays grow by
+        doubling, so appends are amortized O(1), and all accessors return
+        views rather than copies. Frames are expected to be appended in time
+        order, which lets time-range lookups use a binary search.
+        """
+        self.num_landmarks = num_landmarks
+        self._landmarks = np.empty((capacity, num_landmarks, 4), dtype=np.float32)
+        self._frames = np.empty(capacity, dtype=np.int64)
+        self._timestamps = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    @classmethod
+    def from_arrays(cls, frames, timestamps, landmarks):
+        """Wrap existing arrays (e.g. memory-mapped ones) without copying them."""
+        track = cls.__new__(cls)
+        track.num_landmarks = landmarks.shape[1]
+        track._frames = frames
+        track._timestamps = timestamps
+        track._landmarks = landmarks
+        track._size = len(frames)
+        return track
+
+    def _reserve(self, needed):
+        capacity = len(self._frames)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 16)
+        landmarks = np.empty((new_capacity, self.num_landmarks, 4), dtype=np.float32)
+        frames = np.empty(new_capacity, dtype=np.int64)
+        timestamps = np.empty(new_capacity, dtype=np.float64)
+        landmarks[:self._size] = self._landmarks[:self._size]
+        frames[:self._size] = self._frames[:self._size]
+        timestamps[:self._size] = self._timestamps[:self._size]
+        self._landmarks, self._frames, self._timestamps = landmarks, frames, timestamps
+
+    def append(self, frame, timestamp, landmarks):
+        """Append one frame's landmarks, given as a (landmarks, 4) array or nested list."""
+        self._reserve(self._size + 1)
+        self._landmarks[self._size] = landmarks
+        self._frames[self._size] = frame
+        self._timestamps[self._size] = timestamp
+        self._size += 1
+
+    def append_pose_landmarks(self, frame, timestamp, pose_landmarks):
+        """Append a MediaPipe NormalizedLandmarkList without building Python lists."""
+        self._reserve(self._size + 1)
+        row = self._landmarks[self._size]
+        for i, lm in enumerate(pose_landmarks.landmark):
+            row[i] = (lm.x, lm.y, lm.z, lm.visibility)
+        self._frames[self._size] = frame
+        self._timestamps[self._size] = timestamp
+        self._size += 1
+
+    def extend(self, other):
+        """Append every frame of another PoseTrack or an iterable of frame dicts."""
+        if isinstance(other, PoseTrack):
+            n = len(other)
+            self._reserve(self._size + n)
+            self._landmarks[self._size:self._size + n] = other.landmarks
+            self._frames[self._size:self._size + n] = other.frames
+            self._timestamps[self._size:self._size + n] = other.timestamps
+            self._size += n
+        else:
+            for frame_data in other:
+                self.append(frame_data['frame'], frame_data['timestamp'], frame_data['landmarks'])
+
+    @classmethod
+    def concatenate(cls, tracks):
+        """Merge tracks into one, ordered by timestamp."""
+        tracks = [t for t in tracks if len(t)]
+        merged = cls(capacity=max(1, sum(len(t) for t in tracks)))
+        for track in tracks:
+            merged.extend(track)
+        timestamps = merged.timestamps
+        if len(timestamps) > 1 and np.any(np.diff(timestamps) < 0):
+            order = np.argsort(timestamps, kind="stable")
+            merged._landmarks[:len(order)] = merged.landmarks[order]
+            merged._frames[:len(order)] = merged.frames[order]
+            merged._timestamps[:len(order)] = timestamps[order]
+        return merged
+
+    @property
+    def landmarks(self):
+        """(frames, landmarks, 4) view of x, y, z, visibility."""
+        return self._landmarks[:self._size]
+
+    @property
+    def frames(self):
+        return self._frames[:self._size]
+
+    @property
+    def timestamps(self):
+        return self._timestamps[:self._size]
+
+    def landmark(self, idx, components=slice(None)):
+        """Zero-copy (frames, n) view of one landmark, e.g. landmark(16, slice(0, 2)) for wrist x, y."""
+        return self._landmarks[:self._size, idx, components]
+
+    def time_range(self, start, end):
+        """Return the (lo, hi) row range with start <= timestamp < end."""
+        timestamps = self.timestamps
+        return (int(np.searchsorted(timestamps, start, side="left")),
+                int(np.searchsorted(timestamps, end, side="left")))
+
+    def slice_time(self, start, end):
+        """Return a PoseTrack viewing the frames with start <= timestamp < end."""
+        lo, hi = self.time_range(start, end)
+        return self[lo:hi]
+
+    def interpolate(self, lo, hi):
+        """Replace the rows strictly between rows lo and hi with a linear blend of the two, by timestamp."""
+        if hi - lo < 2:
+            return
+        t0, t1 = self._timestamps[lo], self._timestamps[hi]
+        weights = (self._timestamps[lo + 1:hi] - t0) / (t1 - t0) if t1 > t0 else np.zeros(hi - lo - 1)
+        weights = weights.astype(np.float32)[:, None, None]
+        self._landmarks[lo + 1:hi] = (1 - weights) * self._landmarks[lo] + weights * self._landmarks[hi]
+
+    def index_of_frame(self, frame):
+        """Return the row holding the given frame number, or None."""
+        frames = self.frames
+        i = int(np.searchsorted(frames, frame))
+        if i < len(frames) and frames[i] == frame:
+            return i
+        return None
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            lo, hi, step = i.indices(self._size)
+            return PoseTrack.from_arrays(self.frames[lo:hi:step], self.timestamps[lo:hi:step],
+                                         self.landmarks[lo:hi:step])
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("pose frame index out of range")
+        return {'frame': int(self._frames[i]), 'timestamp': float(self._timestamps[i]),
+                'landmarks': self._landmarks[i]}
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def __getstate__(self):
+        # Only pickle the filled part of the arrays
+        return {"frames": np.array(self.frames), "timestamps": np.array(self.timestamps),
+                "landmarks": np.array(self.landmarks)}
+
+    def __setstate__(self, state):
+        self.num_landmarks = state["landmarks"].shape[1]
+        self._frames = state["frames"]
+        self._timestamps = state["timestamps"]
+        self._landmarks = state["landmarks"]
+        self._size = len(self._frames)
+
+    def save(self, path):
+        """Save the track as frames.npy, timestamps.npy and landmarks.npy in directory path."""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "frames.npy"), self.frames)
+        np.save(os.path.join(path, "timestamps.npy"), self.timestamps)
+        np.save(os.path.join(path, "landmarks.npy"), self.landmarks)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a saved track, memory-mapping the arrays read-only by default."""
+        mode = "r" if mmap else None
+        return cls.from_arrays(
+            np.load(os.path.join(path, "frames.npy"), mmap_mode=mode),
+            np.load(os.path.join(path, "timestamps.npy"), mmap_mode=mode),
+            np.load(os.path.join(path, "landmarks.npy"), mmap_mode=mode),
+        )
@@ -22,8 +22,9 @@ def main():
     analyzer = CSPANAnalyzer(video_path=VIDEO_PATH)
     
     # Process the video with a higher frame skip for faster processing
-    # Adjust frame_skip as needed (higher = faster but less smooth)
-    analyzer.process_video(output_path="cspan_analyzed_output.mp4", frame_skip=3)
+    # Adjust frame_skip as needed (higher = faster but less smooth).
+    # Skipped frames are only grabbed, and "repeat" keeps the output at the source frame rate
+    analyzer.process_video(output_path="cspan_analyzed_output.mp4", frame_skip=3, skip_mode="repeat")
     
     # Generate analytics about the video
     analyzer.generate_analytics()
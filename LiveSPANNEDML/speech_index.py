@@ -0,0 +1,169 @@
+import bisect
+import threading
+from array import array
+
+
+class SpeechIndex:
+    def __init__(self, segments=None):
+        """Sorted, array-backed index of timestamped speech segments.
+
+        Segment starts and ends live in parallel float arrays ordered by start
+        time, so timestamp lookups are a bisect instead of a scan over the whole
+        transcript. A running maximum of end times makes range queries correct
+        even if segments overlap. The index behaves like the list of
+        {"start", "end", "text"} dicts it replaces: it can be iterated, indexed,
+        measured with len() and appended to. Lookups may run while another
+        thread appends, as a streaming transcriber does.
+        """
+        self._starts = array("d")
+        self._ends = array("d")
+        self._max_ends = array("d")  # max(ends[:i + 1]) for range queries
+        self._texts = []
+        self._inserts = 0  # Out-of-order inserts so far, which shift positions
+        self._lock = threading.Lock()
+        if segments:
+            self.extend(segments)
+
+    def append(self, segment):
+        """Add a segment, keeping the index sorted by start time."""
+        start, end = float(segment["start"]), float(segment["end"])
+        with self._lock:
+            if not self._starts or start >= self._starts[-1]:
+                # Transcripts arrive in order, so this is the common case
+                self._starts.append(start)
+                self._ends.append(end)
+                self._texts.append(segment["text"])
+                self._max_ends.append(max(end, self._max_ends[-1]) if self._max_ends else end)
+                return
+            i = bisect.bisect_right(self._starts, start)
+            self._starts.insert(i, start)
+            self._ends.insert(i, end)
+            self._texts.insert(i, segment["text"])
+            self._rebuild_max_ends(i)
+            self._inserts += 1
+
+    def extend(self, segments):
+        for segment in segments:
+            self.append(segment)
+
+    def _rebuild_max_ends(self, i):
+        del self._max_ends[i:]
+        running = self._max_ends[-1] if self._max_ends else float("-inf")
+        for end in self._ends[i:]:
+            running = max(running, end)
+            self._max_ends.append(running)
+
+    def _segment(self, i):
+        return {"start": self._starts[i], "end": self._ends[i], "text": self._texts[i]}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._texts)
+
+    def __iter__(self):
+        # Iterate over a snapshot, so segments appended meanwhile cannot shift it
+        with self._lock:
+            segments = [self._segment(i) for i in range(len(self._texts))]
+        return iter(segments)
+
+    def __getitem__(self, i):
+        with self._lock:
+            count = len(self._texts)
+            if isinstance(i, slice):
+                return [self._segment(j) for j in range(*i.indices(count))]
+            if i < 0:
+                i += count
+            if not 0 <= i < count:
+                raise IndexError("speech segment index out of range")
+            return self._segment(i)
+
+    def index_at(self, timestamp, tolerance=0.0):
+        """Return the index of the segment containing timestamp, or None.
+
+        If no segment contains the timestamp, the nearest segment within
+        tolerance seconds of it is returned instead, so short gaps between
+        segments can still resolve to the surrounding speech.
+        """
+        with self._lock:
+            return self._index_at(timestamp, tolerance)
+
+    def _index_at(self, timestamp, tolerance):
+        # The caller holds _lock
+        i = bisect.bisect_right(self._starts, timestamp) - 1
+        # Walk back over earlier segments that could still overlap the timestamp
+        j = i
+        while j >= 0 and self._max_ends[j] >= timestamp:
+            if self._ends[j] >= timestamp:
+                return j
+            j -= 1
+
+        if tolerance <= 0:
+            return None
+        best, best_gap = None, tolerance
+        if i >= 0 and timestamp - self._ends[i] <= best_gap:
+            best, best_gap = i, timestamp - self._ends[i]
+        if i + 1 < len(self._starts) and self._starts[i + 1] - timestamp <= best_gap:
+            best = i + 1
+        return best
+
+    def at(self, timestamp, tolerance=0.0):
+        """Return the segment dict at timestamp (see index_at), or None."""
+        with self._lock:
+            i = self._index_at(timestamp, tolerance)
+            return None if i is None else self._segment(i)
+
+    def text_at(self, timestamp, tolerance=0.0):
+        """Return the text spoken at timestamp, or "" in a gap."""
+        with self._lock:
+            return self._text_at(timestamp, tolerance)
+
+    def _text_at(self, timestamp, tolerance):
+        i = self._index_at(timestamp, tolerance)
+        return "" if i is None else self._texts[i]
+
+    def overlapping(self, start, end):
+        """Return all segments that overlap the window [start, end], in start order."""
+        with self._lock:
+            hi = bisect.bisect_right(self._starts, end)
+            # First position whose running max end reaches the window
+            lo = bisect.bisect_left(self._max_ends, start, 0, hi)
+            return [self._segment(i) for i in range(lo, hi) if self._ends[i] >= start]
+
+    def cursor(self, tolerance=0.0):
+        """Return a SpeechCursor for forward-only lookups."""
+        return SpeechCursor(self, tolerance)
+
+
+class SpeechCursor:
+    def __init__(self, index, tolerance=0.0):
+        """Cursor for lookups with non-decreasing timestamps, like a frame loop.
+
+        Each lookup resumes from the previous position, so walking a whole
+        video costs amortized O(1) per call. A timestamp earlier than the last
+        one falls back to a bisect on the index, as does the first lookup
+        after a segment was inserted out of order.
+        """
+        self.index = index
+        self.tolerance = tolerance
+        self._pos = 0
+        self._last = float("-inf")
+        self._inserts = index._inserts
+
+    def text_at(self, timestamp):
+        index = self.index
+        with index._lock:
+            if timestamp < self._last:
+                return index._text_at(timestamp, self.tolerance)
+            self._last = timestamp
+
+            starts = index._starts
+            if self._inserts != index._inserts:
+                # An insert may have shifted the segment under the cursor
+                self._inserts = index._inserts
+                self._pos = max(0, bisect.bisect_right(starts, timestamp) - 1)
+            while self._pos + 1 < len(starts) and starts[self._pos + 1] <= timestamp:
+                self._pos += 1
+            if starts and starts[self._pos] <= timestamp <= index._ends[self._pos]:
+                return index._texts[self._pos]
+            # Overlapping segments or a gap: let the index resolve it
+            return index._text_at(timestamp, self.tolerance)
@@ -0,0 +1,322 @@
+import math
+
+import numpy as np
+
+# Landmarks whose x, y movement is summarized, as in CSPANAnalyzer.analyze_movement
+MOVEMENT_POINTS = {
+    "right_hand_variance": 16,  # RIGHT_WRIST
+    "left_hand_variance": 15,  # LEFT_WRIST
+    "head_variance": 0,  # NOSE
+}
+_POINT_INDICES = list(MOVEMENT_POINTS.values())
+
+
+class RunningStats:
+    def __init__(self, shape=()):
+        """Count, mean and variance of a stream of values, in constant memory.
+
+        Values are arrays of the given shape (scalars by default), updated
+        one at a time with Welford's method or a batch at a time, and two
+        RunningStats of different parts of a stream merge into the stats of
+        the whole (Chan et al.), so separately processed chunks can be
+        combined. Unlike keeping sums of squares, this does not lose
+        precision when the variance is small next to the mean.
+        """
+        self.shape = tuple(shape)
+        self.count = 0
+        self.mean = np.zeros(self.shape)
+        self.m2 = np.zeros(self.shape)
+
+    def add(self, value):
+        """Add one value."""
+        value = np.asarray(value, dtype=np.float64)
+        self.count += 1
+        delta = value - self.mean
+        self.mean = self.mean + delta / self.count
+        self.m2 = self.m2 + delta * (value - self.mean)
+
+    def add_batch(self, values):
+        """Add values stacked along the first axis."""
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        mean = values.mean(axis=0)
+        self._combine(len(values), mean, ((values - mean) ** 2).sum(axis=0))
+
+    def merge(self, other):
+        """Fold in the stats of another part of the stream."""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+        return self
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 = self.m2 + m2 + delta * delta * (self.count * count / total)
+        self.mean = self.mean + delta * (count / total)
+        self.count = total
+
+    @property
+    def variance(self):
+        """Population variance, like np.var; zero before any value is added."""
+        return self.m2 / self.count if self.count else np.zeros(self.shape)
+
+    def copy(self):
+        stats = RunningStats(self.shape)
+        stats.count, stats.mean, stats.m2 = self.count, self.mean.copy(), self.m2.copy()
+        return stats
+
+
+class RollingStats:
+    def __init__(self, window_seconds=30.0, shape=(), buckets=10):
+        """RunningStats over the last window_seconds of a timestamped stream.
+
+        The window is split into a fixed number of time buckets, each a
+        RunningStats, so memory stays constant however many values arrive.
+        Buckets older than the window are dropped, which makes the window's
+        start accurate to window_seconds / buckets. Values must be added in
+        roughly time order; ones older than the window are ignored.
+        """
+        self.window_seconds = window_seconds
+        self.shape = tuple(shape)
+        self.bucket_seconds = window_seconds / buckets
+        self.buckets = {}
+        self.latest = -math.inf
+
+    def _bucket(self, timestamp):
+        index = math.floor(timestamp / self.bucket_seconds)
+        if index not in self.buckets:
+            self.buckets[index] = RunningStats(self.shape)
+        return self.buckets[index]
+
+    def _trim(self):
+        if self.latest == -math.inf:
+            return  # Nothing added yet
+        oldest = math.floor((self.latest - self.window_seconds) / self.bucket_seconds) + 1
+        for index in [i for i in self.buckets if i < oldest]:
+            del self.buckets[index]
+
+    def add(self, timestamp, value):
+        if timestamp <= self.latest - self.window_seconds:
+            return
+        self._bucket(timestamp).add(value)
+        if timestamp > self.latest:
+            self.latest = timestamp
+            self._trim()
+
+    def add_batch(self, timestamps, values):
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if not len(timestamps):
+            return
+        values = np.asarray(values, dtype=np.float64)
+        self.latest = max(self.latest, float(timestamps.max()))
+        keep = timestamps > self.latest - self.window_seconds
+        indices = np.floor(timestamps[keep] / self.bucket_seconds).astype(np.int64)
+        values = values[keep]
+        for index in np.unique(indices):
+            # Not _bucket(index * bucket_seconds): the float round trip can floor into the bucket below
+            self.buckets.setdefault(int(index), RunningStats(self.shape)).add_batch(values[indices == index])
+        self._trim()
+
+    def merge(self, other):
+        """Fold in another stream's buckets, e.g. the chunk after this one."""
+        for index, bucket in other.buckets.items():
+            if index in self.buckets:
+                self.buckets[index].merge(bucket)
+            else:
+                self.buckets[index] = bucket.copy()
+        self.latest = max(self.latest, other.latest)
+        self._trim()
+        return self
+
+    def stats(self, now=None):
+        """RunningStats of the window ending at now (default: the latest value)."""
+        now = self.latest if now is None else now
+        stats = RunningStats(self.shape)
+        if now == -math.inf:
+            return stats
+        oldest = math.floor((now - self.window_seconds) / self.bucket_seconds) + 1
+        for index in sorted(self.buckets):
+            if oldest <= index <= math.floor(now / self.bucket_seconds):
+                stats.merge(self.buckets[index])
+        return stats
+
+
+class DecayingStats:
+    def __init__(self, half_life_seconds=10.0, shape=()):
+        """Exponentially weighted mean and variance of a timestamped stream.
+
+        A value's weight halves every half_life_seconds, so the stats follow
+        what happened recently without keeping any history. The state is a
+        weighted Welford accumulator referred to the latest timestamp, so two
+        DecayingStats merge exactly, as if one had seen both streams.
+        """
+        self.half_life_seconds = half_life_seconds
+        self.shape = tuple(shape)
+        self.weight = 0.0
+        self.mean = np.zeros(self.shape)
+        self.m2 = np.zeros(self.shape)
+        self.latest = None
+
+    def _decay_to(self, timestamp):
+        if self.latest is None:
+            self.latest = timestamp
+        elif timestamp > self.latest:
+            factor = 0.5 ** ((timestamp - self.latest) / self.half_life_seconds)
+            self.weight *= factor
+            self.m2 = self.m2 * factor
+            self.latest = timestamp
+
+    def _combine(self, weight, mean, m2):
+        total = self.weight + weight
+        if total <= 0:
+            return
+        delta = mean - self.mean
+        self.m2 = self.m2 + m2 + delta * delta * (self.weight * weight / total)
+        self.mean = self.mean + delta * (weight / total)
+        self.weight = total
+
+    def add(self, timestamp, value):
+        """Add one value; a value older than the latest counts as if it arrived at the latest."""
+        self._decay_to(timestamp)
+        self._combine(1.0, np.asarray(value, dtype=np.float64), np.zeros(self.shape))
+
+    def add_batch(self, timestamps, values):
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if not len(timestamps):
+            return
+        values = np.asarray(values, dtype=np.float64)
+        self._decay_to(float(timestamps.max()))
+        weights = 0.5 ** ((self.latest - np.minimum(timestamps, self.latest)) / self.half_life_seconds)
+        weights = weights.reshape((-1,) + (1,) * len(self.shape))
+        weight = float(weights.sum())
+        mean = (weights * values).sum(axis=0) / weight
+        self._combine(weight, mean, (weights * (values - mean) ** 2).sum(axis=0))
+
+    def merge(self, other):
+        """Fold in the stats of another part of the stream."""
+        if other.latest is None:
+            return self
+        weight, m2 = other.weight, other.m2
+        if self.latest is not None and self.latest > other.latest:
+            factor = 0.5 ** ((self.latest - other.latest) / self.half_life_seconds)
+            weight, m2 = weight * factor, m2 * factor
+        else:
+            self._decay_to(other.latest)
+        self._combine(weight, other.mean, m2)
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / self.weight if self.weight > 0 else np.zeros(self.shape)
+
+
+class MovementStats:
+    def __init__(self, window_seconds=30.0, half_life_seconds=10.0):
+        """Whole-video, rolling and decaying movement variance of the hands and head.
+
+        Pose frames are added as they are analyzed, and the variance of each
+        key point's x, y position (summed over x and y, like
+        analyze_movement) is available at any moment for the whole video so
+        far (summary()), the last window_seconds (rolling()) and with
+        exponential decay (recent()). Stats of separately processed chunks
+        merge with merge().
+        """
+        shape = (len(_POINT_INDICES), 2)
+        self.total = RunningStats(shape)
+        self.window = RollingStats(window_seconds, shape)
+        self.decaying = DecayingStats(half_life_seconds, shape)
+
+    def add(self, timestamps, landmarks):
+        """Add frames given as timestamps and a (frames, landmarks, 4) array."""
+        xy = np.asarray(landmarks)[:, _POINT_INDICES, :2]
+        self.total.add_batch(xy)
+        self.window.add_batch(timestamps, xy)
+        self.decaying.add_batch(timestamps, xy)
+
+    def merge(self, other):
+        self.total.merge(other.total)
+        self.window.merge(other.window)
+        self.decaying.merge(other.decaying)
+        return self
+
+    @staticmethod
+    def _named(stats):
+        if not stats.count:
+            return {}
+        return {name: float(v) for name, v in zip(MOVEMENT_POINTS, stats.variance.sum(axis=-1))}
+
+    def summary(self):
+        """Movement variance over every frame added."""
+        return self._named(self.total)
+
+    def rolling(self, now=None):
+        """Movement variance over the window_seconds before now (default: the latest frame)."""
+        return self._named(self.window.stats(now))
+
+    def recent(self):
+        """Exponentially decaying movement variance as of the latest frame."""
+        if self.decaying.latest is None:
+            return {}
+        return {name: float(v) for name, v in zip(MOVEMENT_POINTS, self.decaying.variance.sum(axis=-1))}
+
+
+class SpeechStats:
+    def __init__(self, window_seconds=60.0, half_life_seconds=30.0):
+        """Whole-video, rolling and decaying speech rate of transcript segments.
+
+        Only counts and sums are kept, never the segments. Words per minute
+        is words over seconds of speech, like analyze_speech; rolling()
+        covers the segments starting in the last window_seconds and recent()
+        weighs segments down by half every half_life_seconds. Stats of
+        separately transcribed parts merge with merge().
+        """
+        self.segments = 0
+        self.words = 0
+        self.duration = 0.0
+        # Per segment: [words, seconds of speech]
+        self.window = RollingStats(window_seconds, shape=(2,))
+        self.decaying = DecayingStats(half_life_seconds, shape=(2,))
+
+    def add(self, segment):
+        """Add a {"start", "end", "text"} segment."""
+        words = len(segment["text"].split())
+        duration = segment["end"] - segment["start"]
+        self.segments += 1
+        self.words += words
+        self.duration += duration
+        self.window.add(segment["start"], (words, duration))
+        self.decaying.add(segment["start"], (words, duration))
+
+    def merge(self, other):
+        self.segments += other.segments
+        self.words += other.words
+        self.duration += other.duration
+        self.window.merge(other.window)
+        self.decaying.merge(other.decaying)
+        return self
+
+    @staticmethod
+    def _rate(words, duration):
+        return float(words / duration) * 60 if duration > 0 else 0
+
+    def summary(self):
+        """The analyze_speech dict over every segment added."""
+        if not self.segments:
+            return {}
+        return {
+            "total_segments": self.segments,
+            "total_words": self.words,
+            "total_speech_duration": self.duration,
+            "words_per_minute": self._rate(self.words, self.duration),
+        }
+
+    def rolling(self, now=None):
+        """Words per minute of the segments starting in the window_seconds before now."""
+        stats = self.window.stats(now)
+        # Mean words over mean duration is total words over total duration
+        return self._rate(*stats.mean) if stats.count else 0
+
+    def recent(self):
+        """Exponentially decaying words per minute as of the latest segment."""
+        return self._rate(*self.decaying.mean) if self.decaying.weight > 0 else 0
@@ -0,0 +1,153 @@
+import math
+import subprocess
+import threading
+import time
+
+import numpy as np
+
+# Whisper models expect 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Text of the placeholder segment used when transcription fails
+FAILED_TRANSCRIPT_TEXT = "Speech transcription failed. Processing video without speech analysis."
+
+
+def load_audio_window(path, start, duration, sample_rate=SAMPLE_RATE):
+    """Decode [start, start + duration) seconds of a file's audio to float32 mono with ffmpeg."""
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-ss", f"{start:.3f}", "-t", f"{duration:.3f}", "-i", path,
+        "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-",
+    ]
+    raw = subprocess.run(cmd, capture_output=True, check=True).stdout
+    return np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
+
+
+class StreamingTranscriber:
+    def __init__(self, speech_model, video_path, duration, segments, window_seconds=30.0, overlap_seconds=5.0,
+                 poll_interval=1.0, metrics=None):
+        """Transcribe a video's audio in overlapping windows on a background thread.
+
+        Finished segments are appended to the segments list as each window
+        completes. A window only commits segments that start before the middle
+        of its overlap with the next window; the rest are transcribed again with
+        more context by the next window, so words cut at a window edge are not
+        lost or duplicated.
+
+        For a source that is still being written, duration can be a callable
+        returning how many seconds are available so far. Windows are then only
+        transcribed once they are complete, checking every poll_interval
+        seconds, until finish() is called and the remainder is transcribed.
+
+        With metrics set, decoding and transcribing each window are timed as
+        the "audio_decode" and "transcribe" stages.
+        """
+        if overlap_seconds >= window_seconds:
+            raise ValueError("overlap_seconds must be smaller than window_seconds")
+        self.speech_model = speech_model
+        self.video_path = video_path
+        self.duration = duration
+        self.segments = segments
+        self.window_seconds = window_seconds
+        self.overlap_seconds = overlap_seconds
+        self.poll_interval = poll_interval
+        self.metrics = metrics
+
+        self.transcribed_until = 0.0
+        self.done = False
+        self.error = None
+        self._cond = threading.Condition()
+        self._thread = None
+        self._finished = threading.Event()
+        if not callable(duration):
+            self._finished.set()
+
+    def _available(self):
+        return self.duration() if callable(self.duration) else self.duration
+
+    def start(self):
+        """Start transcribing in the background."""
+        self._thread = threading.Thread(target=self._run, name="streaming-transcriber", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        step = self.window_seconds - self.overlap_seconds
+        committed_end = 0.0
+        prompt = None
+        window_start = 0.0
+        try:
+            while True:
+                final = self._finished.is_set()
+                available = self._available()
+                if window_start >= available:
+                    if final:
+                        break
+                    self._finished.wait(self.poll_interval)
+                    continue
+                window_end = min(window_start + self.window_seconds, available)
+                is_last = final and window_end >= available
+                if not is_last and window_end < window_start + self.window_seconds:
+                    # Wait for a live source to fill the window
+                    self._finished.wait(self.poll_interval)
+                    continue
+                cut = available if is_last else window_end - self.overlap_seconds / 2
+
+                start_time = time.perf_counter()
+                audio = load_audio_window(self.video_path, window_start, window_end - window_start)
+                decoded_time = time.perf_counter()
+                result = self.speech_model.transcribe(audio, initial_prompt=prompt)
+                if self.metrics is not None:
+                    self.metrics.observe("audio_decode", decoded_time - start_time)
+                    self.metrics.observe("transcribe", time.perf_counter() - decoded_time)
+
+                new_segments = []
+                for segment in result["segments"]:
+                    start = window_start + segment["start"]
+                    end = window_start + segment["end"]
+                    # Skip what the previous window already committed, and leave
+                    # segments starting near this window's edge to the next one
+                    if start < committed_end - 0.05 or start >= cut:
+                        continue
+                    new_segments.append({"start": start, "end": end, "text": segment["text"]})
+
+                with self._cond:
+                    self.segments.extend(new_segments)
+                    if new_segments:
+                        committed_end = new_segments[-1]["end"]
+                        prompt = new_segments[-1]["text"]
+                    self.transcribed_until = cut
+                    self._cond.notify_all()
+
+                if is_last:
+                    break
+                window_start += step
+        except Exception as e:
+            print(f"Error during streaming speech transcription: {e}")
+            self.error = e
+        finally:
+            with self._cond:
+                if self.error is not None and not self.segments:
+                    # Add a dummy segment to avoid errors
+                    self.segments.append({
+                        "start": 0,
+                        "end": 100000,  # Very large end time
+                        "text": FAILED_TRANSCRIPT_TEXT
+                    })
+                self.done = True
+                self.transcribed_until = math.inf
+                self._cond.notify_all()
+
+    def wait_until(self, timestamp, timeout=None):
+        """Block until the transcript covers timestamp; returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.transcribed_until >= timestamp, timeout=timeout)
+
+    def finish(self):
+        """Tell a live transcriber that the source has stopped growing."""
+        self._finished.set()
+
+    def join(self):
+        """Wait for the whole transcript."""
+        if self._thread is not None:
+            self._thread.join()
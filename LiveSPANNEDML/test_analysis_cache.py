@@ -0,0 +1,67 @@
+import os
+import pathlib
+import tempfile
+
+import pytest
+
+import analysis_cache
+from analysis_cache import AnalysisCache
+
+
+def test_keys_follow_content_and_parameters(tmp_path):
+    first, copy = tmp_path / "a.mp4", tmp_path / "b.mp4"
+    first.write_bytes(b"video bytes")
+    copy.write_bytes(b"video bytes")
+    cache = AnalysisCache(str(tmp_path / "cache"))
+
+    # Content addressed: a copy of the video under another name hits the same entries
+    video_hash = cache.video_hash(str(first))
+    assert cache.video_hash(str(copy)) == video_hash
+    key = cache.make_key("pose", video_hash, frame_skip=2, model_complexity=1)
+    assert key.startswith("pose-")
+    assert cache.make_key("pose", video_hash, model_complexity=1, frame_skip=2) == key
+    assert cache.make_key("pose", video_hash, frame_skip=3, model_complexity=1) != key
+    assert cache.make_key("transcript", video_hash, frame_skip=2, model_complexity=1) != key
+
+    first.write_bytes(b"edited video")
+    assert cache.video_hash(str(first)) != video_hash
+
+
+def test_entries_from_another_cache_version_are_discarded(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    cache.put("transcript-1", [{"start": 0.0, "end": 1.0, "text": "hello"}])
+    assert cache.get("transcript-1")[0]["text"] == "hello"
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(analysis_cache, "CACHE_VERSION", analysis_cache.CACHE_VERSION + 1)
+        assert cache.get("transcript-1") is None
+    assert not os.path.exists(cache._entry_path("transcript-1"))
+
+    with open(cache._entry_path("broken"), "wb") as f:
+        f.write(b"not a pickle")
+    assert cache.get("broken") is None
+    assert not os.path.exists(cache._entry_path("broken"))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    cache.put("a", b"x" * 1000)
+    entry_size = os.path.getsize(cache._entry_path("a"))
+    cache.max_bytes = 2 * entry_size
+    cache.put("b", b"y" * 1000)
+    os.utime(cache._entry_path("a"), (1000, 1000))
+    os.utime(cache._entry_path("b"), (2000, 2000))
+
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == b"x" * 1000
+    cache.put("c", b"z" * 1000)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.evict() <= cache.max_bytes
+
+
+if __name__ == "__main__":
+    test_keys_follow_content_and_parameters(pathlib.Path(tempfile.mkdtemp()))
+    test_entries_from_another_cache_version_are_discarded(pathlib.Path(tempfile.mkdtemp()))
+    test_least_recently_used_entries_are_evicted(pathlib.Path(tempfile.mkdtemp()))
+    print("Analysis cache tests passed!")
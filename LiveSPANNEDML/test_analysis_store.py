@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+import pytest
+
+from analysis_store import AnalysisWriter, load_analysis
+from benchmark import make_fixture
+from pose_stubs import BrightnessPose
+
+
+def check_round_trip(fmt):
+    """Everything written should load back the same, split across several shards"""
+    rng = np.random.default_rng(0)
+    landmarks = rng.random((25, 33, 4)).astype(np.float32)
+    frames = np.arange(25) * 2
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = AnalysisWriter(tmp, shard_frames=10, shard_rows=2, fmt=fmt)
+        writer.write_meta(video_path="video.mp4", frame_skip=2)
+        for i in range(0, 25, 5):
+            writer.add_poses(frames[i:i + 5], frames[i:i + 5] / 30.0, landmarks[i:i + 5])
+        # Only finished shards are visible before close()
+        partial = load_analysis(tmp)
+        assert len(partial["pose_data"]) == 20 and not partial["meta"]["complete"]
+
+        for frame in frames[:3]:
+            writer.add_person(1, frame, frame / 30.0, landmarks[0])
+            writer.add_person(0, frame, frame / 30.0, landmarks[1])
+        writer.add_speech({"start": 0.0, "end": 2.0, "text": " Hello"})
+        writer.add_context({"timestamp": 1.0, "text": "Hello there everyone in the chamber",
+                            "topics": {"labels": ["budget"], "scores": [np.float32(0.5)]}, "summary": ""})
+        writer.close()
+
+        shards = [name for _, _, names in os.walk(tmp) for name in names if name.startswith("part-")]
+        assert shards and all(name.endswith("." + fmt) for name in shards)
+        data = load_analysis(tmp)
+    assert data["meta"]["complete"] and data["meta"]["frame_skip"] == 2
+    assert np.array_equal(data["pose_data"].landmarks, landmarks)
+    assert np.array_equal(data["pose_data"].frames, frames)
+    assert sorted(data["person_tracks"]) == [0, 1]
+    assert np.array_equal(data["person_tracks"][0].frames, frames[:3])
+    assert np.array_equal(data["person_tracks"][1].landmarks[2], landmarks[0])
+    assert data["speech_segments"] == [{"start": 0.0, "end": 2.0, "text": " Hello"}]
+    assert data["context_data"][0]["topics"] == {"labels": ["budget"], "scores": [0.5]}
+
+
+
+def test_shards_round_trip():
+    check_round_trip("npz")
+
+
+def test_parquet_shards_round_trip():
+    pytest.importorskip("pyarrow")
+    check_round_trip("parquet")
+
+
+def test_render_from_data_on_the_command_line():
+    """--render-from draws the video from a --data-dir analysis without loading any model"""
+    pytest.importorskip("mediapipe")
+    from cspan_analyzer_working import CSPANAnalyzer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "fixture.mp4")
+        make_fixture(video, width=160, height=90, seconds=2, fps=10, motion="high", audio=False)
+        analyzer = CSPANAnalyzer(video_path=video, enable_speech=False, enable_context=False)
+        analyzer.pose = BrightnessPose()
+        data_dir = os.path.join(tmp, "data")
+        assert analyzer.process_video(frame_skip=2, render=False, data_dir=data_dir)
+
+        output = os.path.join(tmp, "rendered.mp4")
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cspan_analyzer_working.py")
+        result = subprocess.run([sys.executable, script, "--render-from", data_dir, "--output", output,
+                                 "--skip-mode", "repeat"], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        # The source video and frame_skip come from the data
+        assert int(cv2.VideoCapture(output).get(cv2.CAP_PROP_FRAME_COUNT)) == 20
+
+
+if __name__ == "__main__":
+    test_shards_round_trip()
+    test_parquet_shards_round_trip()
+    test_render_from_data_on_the_command_line()
+    print("Analysis store tests passed!")
@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+
+from batch_runner import BatchRunner, DirectoryWatcher, JobQueue
+
+
+def fake_job(job, analyzer_options):
+    """Stands in for run_job so the test does not need the models"""
+    if job["video"].endswith("bad.mp4"):
+        raise ValueError("unreadable video")
+    return {"pid": os.getpid(), "frame_skip": job["options"]["frame_skip"]}
+
+
+def test_job_queue_orders_by_priority_then_arrival():
+    jobs = JobQueue()
+    for name, priority in (("a", 0), ("b", 5), ("c", 0), ("d", 5)):
+        jobs.push({"id": name, "priority": priority})
+    assert [jobs.pop()["id"] for _ in range(len(jobs))] == ["b", "d", "a", "c"]
+
+
+def test_watcher_waits_for_files_to_settle():
+    with tempfile.TemporaryDirectory() as tmp:
+        watcher = DirectoryWatcher(tmp, settle_seconds=0)
+        path = os.path.join(tmp, "hearing.mp4")
+        with open(path, "wb") as f:
+            f.write(b"x" * 10)
+        open(os.path.join(tmp, "notes.txt"), "w").close()
+        assert watcher.scan() == []  # Size not seen before
+        assert watcher.scan() == [path]
+        assert watcher.scan() == []  # Only reported once
+
+
+def test_batch_runs_jobs_on_warm_workers_and_records_status():
+    """Workers should be reused across jobs, failures recorded, and done jobs skipped on a rerun"""
+    with tempfile.TemporaryDirectory() as tmp:
+        status = os.path.join(tmp, "status.jsonl")
+        runner = BatchRunner(workers=1, status_path=status, output_dir=os.path.join(tmp, "out"), warm=False,
+                             options={"frame_skip": 3}, poll_seconds=0.05, job_fn=fake_job)
+        first = runner.submit("one.mp4", options={"frame_skip": 1})
+        second = runner.submit("two.mp4", priority=1)
+        bad = runner.submit("bad.mp4")
+        results = runner.run()
+
+        assert results[first]["status"] == "done" and results[first]["result"]["frame_skip"] == 1
+        assert results[second]["result"]["frame_skip"] == 3
+        assert results[first]["result"]["pid"] == results[second]["result"]["pid"]
+        assert results[bad]["status"] == "failed" and "unreadable video" in results[bad]["error"]
+
+        with open(status) as f:
+            records = [json.loads(line) for line in f]
+        started = [r["job"] for r in records if r.get("status") == "started"]
+        assert started[0] == second  # Higher priority first
+        assert all(r["run_seconds"] >= 0 for r in records if r.get("status") == "done")
+
+        rerun = BatchRunner(status_path=status, job_fn=fake_job)
+        assert rerun.submit("one.mp4") is None
+        assert rerun.submit("bad.mp4") is not None
+        rerun.status.close()
+
+
+if __name__ == "__main__":
+    test_job_queue_orders_by_priority_then_arrival()
+    test_watcher_waits_for_files_to_settle()
+    test_batch_runs_jobs_on_warm_workers_and_records_status()
+    print("Batch runner tests passed!")
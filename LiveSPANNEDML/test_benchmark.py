@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from benchmark import compare, make_fixture
+
+
+def read_frames(path):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return np.array(frames)
+
+
+def test_fixtures_are_deterministic():
+    """The same fixture settings should always render the same frames"""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"fixture_{i}.mp4") for i in range(2)]
+        for path in paths:
+            make_fixture(path, width=160, height=90, seconds=1, fps=10, motion="high", audio=False)
+        first, second = read_frames(paths[0]), read_frames(paths[1])
+    assert first.shape == (10, 90, 160, 3)
+    assert np.array_equal(first, second)
+    # The speaker moves between frames
+    assert not np.array_equal(first[0], first[5])
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": [{"fixture": "360p_static", "config": "default", "frames_per_second": 100.0,
+                             "first_result_seconds": 1.0, "peak_rss_mb": 500.0}]}
+    current = {"results": [{"fixture": "360p_static", "config": "default", "frames_per_second": 80.0,
+                            "first_result_seconds": 1.05, "peak_rss_mb": 600.0}]}
+    regressed = {row[2]: row[-1] for row in compare(baseline, current, threshold=0.1)}
+    assert regressed == {"frames_per_second": True, "first_result_seconds": False, "peak_rss_mb": True}
+
+
+if __name__ == "__main__":
+    test_fixtures_are_deterministic()
+    test_compare_flags_regressions()
+    print("Benchmark tests passed!")
@@ -0,0 +1,131 @@
+import os
+import tempfile
+
+import cv2
+import numpy as np
+import pytest
+
+from benchmark import make_fixture
+from checkpoint import CheckpointStore
+from model_registry import ModelRegistry
+from pose_stubs import BrightnessPose
+from pose_track import PoseTrack
+
+
+def make_part(start):
+    frames = np.arange(start, start + 3)
+    return {"pose_data": PoseTrack.from_arrays(frames, frames / 30.0, np.full((3, 33, 4), start, np.float32)),
+            "context_requests": [("text", start / 30.0)]}
+
+
+def test_resume_restores_saved_parts():
+    """A reopened checkpoint should return every completed range in order"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CheckpointStore(os.path.join(tmp, "ckpt"))
+        parts = [store.save_part(i, make_part(i * 3)) for i in range(2)]
+        store.save({"video": "a.mp4"}, 6, parts, [store.segment_path(0), store.segment_path(1)], transcript=None)
+
+        state = CheckpointStore(os.path.join(tmp, "ckpt")).load({"video": "a.mp4"})
+        assert state["next_frame"] == 6 and state["transcript"] is None
+        assert state["segments"] == [store.segment_path(0), store.segment_path(1)]
+        tracks = [part["pose_data"] for part in state["part_data"]]
+        assert [list(track.frames) for track in tracks] == [[0, 1, 2], [3, 4, 5]]
+        assert tracks[1].landmarks[0, 0, 0] == 3
+
+
+def test_mismatched_or_broken_checkpoint_is_discarded():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CheckpointStore(tmp)
+        store.save({"frame_skip": 1}, 3, [store.save_part(0, make_part(0))], [])
+        assert store.load({"frame_skip": 2}) is None
+        assert os.listdir(tmp) == []
+
+        store.save({"frame_skip": 1}, 3, ["part_00000.pkl"], [])
+        assert store.load({"frame_skip": 1}) is None
+
+
+class StubWhisper:
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio):
+        self.calls += 1
+        return {"segments": [{"start": 0.0, "end": 1.5, "text": " Order in the chamber"},
+                             {"start": 1.5, "end": 3.0, "text": " The gentleman is recognized"}]}
+
+
+def read_frames(path):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def test_interrupted_run_resumes_to_the_same_results():
+    """Crashing after two checkpointed ranges and resuming should give an uninterrupted run's results"""
+    pytest.importorskip("mediapipe")
+    from cspan_analyzer_working import CSPANAnalyzer
+
+    class Interrupted(Exception):
+        pass
+
+    def analyzer(video):
+        analyzer = CSPANAnalyzer(video_path=video, enable_context=False)
+        analyzer.speech_model = StubWhisper()
+        return analyzer
+
+    with tempfile.TemporaryDirectory() as tmp, pytest.MonkeyPatch.context() as patch:
+        patch.setattr(ModelRegistry, "pose", lambda self, **params: BrightnessPose())
+        video = os.path.join(tmp, "fixture.mp4")
+        make_fixture(video, width=160, height=90, seconds=3, fps=10, motion="high", audio=False)
+        # 0.5 seconds is 5 frames, rounded up to 6 to stay on the frame_skip grid: five ranges
+        options = dict(frame_skip=2, checkpoint_seconds=0.5)
+
+        reference = analyzer(video)
+        assert reference.process_video(os.path.join(tmp, "reference.mp4"),
+                                       checkpoint_dir=os.path.join(tmp, "reference-ckpt"), **options)
+
+        checkpoint_dir = os.path.join(tmp, "ckpt")
+        output = os.path.join(tmp, "resumed.mp4")
+        save = CheckpointStore.save
+        saved = []
+
+        def save_then_crash(store, *args, **kwargs):
+            save(store, *args, **kwargs)
+            saved.append(args[1])
+            if len(saved) == 2:
+                raise Interrupted()
+
+        with pytest.MonkeyPatch.context() as crash:
+            crash.setattr(CheckpointStore, "save", save_then_crash)
+            with pytest.raises(Interrupted):
+                analyzer(video).process_video(output, checkpoint_dir=checkpoint_dir, **options)
+        assert saved == [6, 12]
+
+        resumed = analyzer(video)
+        assert resumed.process_video(output, checkpoint_dir=checkpoint_dir, **options)
+        # The transcript came back from the checkpoint rather than being transcribed again
+        assert resumed.speech_model.calls == 0
+        assert not os.path.exists(checkpoint_dir)
+
+        assert list(resumed.pose_data.frames) == list(reference.pose_data.frames) == list(range(0, 30, 2))
+        assert np.array_equal(resumed.pose_data.landmarks, reference.pose_data.landmarks)
+        assert list(resumed.speech_segments) == list(reference.speech_segments)
+        assert len(resumed.speech_segments) == 2
+        # Segments are encoded alike, so the joined videos decode to the same frames
+        expected = read_frames(os.path.join(tmp, "reference.mp4"))
+        actual = read_frames(output)
+        assert len(actual) == len(expected) == 15
+        assert all(np.array_equal(a, b) for a, b in zip(actual, expected))
+
+
+if __name__ == "__main__":
+    test_resume_restores_saved_parts()
+    test_mismatched_or_broken_checkpoint_is_discarded()
+    test_interrupted_run_resumes_to_the_same_results()
+    print("Checkpoint tests passed!")
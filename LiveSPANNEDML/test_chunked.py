@@ -0,0 +1,72 @@
+import os
+import tempfile
+
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("mediapipe")
+
+import cspan_analyzer_working
+from benchmark import make_fixture
+from cspan_analyzer_working import CSPANAnalyzer
+from model_registry import ModelRegistry
+from pose_stubs import BrightnessPose
+
+
+class InlineExecutor:
+    """Runs the chunk jobs one after another in this process, where the stub pose is installed"""
+
+    def __init__(self, max_workers=None, mp_context=None):
+        self.jobs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, fn, jobs):
+        self.jobs = list(jobs)
+        InlineExecutor.last = self
+        return [fn(job) for job in self.jobs]
+
+
+def frame_count(path):
+    cap = cv2.VideoCapture(path)
+    count = 0
+    while cap.read()[0]:
+        count += 1
+    cap.release()
+    return count
+
+
+def test_chunks_match_a_single_pass():
+    """Chunks start on analyzed frames, so the merged results equal those of process_video"""
+    with tempfile.TemporaryDirectory() as tmp, pytest.MonkeyPatch.context() as patch:
+        patch.setattr(ModelRegistry, "pose", lambda self, **params: BrightnessPose())
+        patch.setattr(cspan_analyzer_working, "ProcessPoolExecutor", InlineExecutor)
+        video = os.path.join(tmp, "fixture.mp4")
+        make_fixture(video, width=160, height=90, seconds=3, fps=10, motion="high", audio=False)
+
+        single = CSPANAnalyzer(video_path=video, enable_speech=False, enable_context=False)
+        assert single.process_video(os.path.join(tmp, "single.mp4"), frame_skip=2)
+        chunked = CSPANAnalyzer(video_path=video, enable_speech=False, enable_context=False)
+        output = os.path.join(tmp, "chunked.mp4")
+        # 1.1 seconds is 11 frames, rounded up to 12 to stay on the frame_skip grid
+        assert chunked.process_video_chunked(output, frame_skip=2, workers=2, chunk_seconds=1.1)
+
+        jobs = InlineExecutor.last.jobs
+        assert [(job["start_frame"], job["end_frame"]) for job in jobs] == [(0, 12), (12, 24), (24, 30)]
+        assert frame_count(output) == frame_count(os.path.join(tmp, "single.mp4")) == 15
+        assert not os.path.exists(output + ".chunks")
+
+    assert list(chunked.pose_data.frames) == list(single.pose_data.frames) == list(range(0, 30, 2))
+    assert np.array_equal(chunked.pose_data.landmarks, single.pose_data.landmarks)
+    assert chunked.metrics.counters["frames_analyzed"] == 15
+    assert chunked.analyze_movement() == pytest.approx(single.analyze_movement())
+
+
+if __name__ == "__main__":
+    test_chunks_match_a_single_pass()
+    print("Chunked processing tests passed!")
@@ -0,0 +1,120 @@
+import threading
+
+from context_analyzer import ContextAnalyzer, UNKNOWN_TOPICS
+
+TOPICS = ["economy", "healthcare"]
+
+
+class StubClassifier:
+    """Zero-shot classifier stand-in recording the batches it is called with"""
+
+    def __init__(self, gate=None):
+        self.batches = []
+        self.gate = gate
+        self.entered = threading.Event()
+
+    def __call__(self, texts, candidate_labels, batch_size):
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait()
+        self.batches.append(list(texts))
+        return [{"labels": [f"topic of {text}"], "scores": [1.0]} for text in texts]
+
+
+class StubSummarizer:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts, **kwargs):
+        self.batches.append(list(texts))
+        return [{"summary_text": f"summary of {text[:10]}"} for text in texts]
+
+
+def test_unique_texts_are_analyzed_in_batches():
+    classifier, summarizer = StubClassifier(), StubSummarizer()
+    context = ContextAnalyzer(classifier, summarizer, TOPICS, batch_size=4)
+    long_text = "a long speech " * 10
+    texts = [f"speech {i}" for i in range(9)] + [long_text]
+    for i, text in enumerate(texts):
+        context.submit(text, float(i))
+    assert context.pending_count() == 10
+
+    contexts = context.flush()
+    assert [len(batch) for batch in classifier.batches] == [4, 4, 2]
+    # Only texts over 100 characters are summarized
+    assert summarizer.batches == [[long_text]]
+    assert [c["text"] for c in contexts] == texts
+    assert contexts[0]["topics"]["labels"] == ["topic of speech 0"] and contexts[0]["summary"] == ""
+    assert contexts[-1]["summary"] == "summary of a long spe"
+
+
+def test_repeated_text_is_analyzed_once():
+    classifier = StubClassifier()
+    memo = {"cached speech": (UNKNOWN_TOPICS, "from the cache")}
+    context = ContextAnalyzer(classifier, StubSummarizer(), TOPICS, memo=memo)
+    for timestamp in (0.0, 3.0, 6.0):
+        context.submit("the same speech on screen", timestamp)
+    context.submit("cached speech", 9.0)
+    assert context.pending_count() == 1
+
+    contexts = context.flush()
+    assert classifier.batches == [["the same speech on screen"]]
+    assert [c["timestamp"] for c in contexts] == [0.0, 3.0, 6.0, 9.0]
+    assert contexts[-1]["summary"] == "from the cache"
+    # The memo outlives the flush, like a persistent cache
+    context.submit("the same speech on screen", 12.0)
+    assert context.pending_count() == 0 and len(context.flush()) == 1
+    assert len(classifier.batches) == 1
+
+
+def test_background_flush_waits_for_the_worker_and_sorts_by_time():
+    gate = threading.Event()
+    classifier = StubClassifier(gate)
+    context = ContextAnalyzer(classifier, StubSummarizer(), TOPICS, batch_size=2, background=True).start()
+    # Requests arrive out of order, e.g. from chunks finishing in any order
+    for timestamp in (9.0, 3.0, 6.0, 0.0, 12.0):
+        context.submit(f"speech at {timestamp:g}", timestamp)
+    # Flush while the worker is in the middle of its first batch
+    assert classifier.entered.wait(timeout=5)
+    gate.set()
+    contexts = context.flush()
+
+    assert [c["timestamp"] for c in contexts] == [0.0, 3.0, 6.0, 9.0, 12.0]
+    assert all(c["topics"]["labels"] == [f"topic of {c['text']}"] for c in contexts)
+    analyzed = [text for batch in classifier.batches for text in batch]
+    assert sorted(analyzed) == sorted(c["text"] for c in contexts)
+    assert context._thread is None
+
+
+def test_failures_fall_back_to_unknown_topics():
+    def failing(*args, **kwargs):
+        raise RuntimeError("model unavailable")
+
+    memo = {}
+    context = ContextAnalyzer(failing, failing, TOPICS, memo=memo)
+    long_text = "x" * 150
+    context.submit(long_text, 0.0)
+    [result] = context.flush()
+    assert result["topics"] == UNKNOWN_TOPICS
+    assert result["summary"] == "x" * 100 + "..."
+    # The fallback is reused for this analyzer but never memoized, so it is not cached
+    assert memo == {}
+    context.submit(long_text, 3.0)
+    assert context.pending_count() == 0
+    assert context.result(long_text) == (UNKNOWN_TOPICS, "x" * 100 + "...")
+
+    # A later run sharing the memo tries the models again
+    classifier = StubClassifier()
+    retry = ContextAnalyzer(classifier, StubSummarizer(), TOPICS, memo=memo)
+    retry.submit(long_text, 0.0)
+    [result] = retry.flush()
+    assert classifier.batches == [[long_text]]
+    assert memo[long_text] == (result["topics"], result["summary"]) and result["topics"] != UNKNOWN_TOPICS
+
+
+if __name__ == "__main__":
+    test_unique_texts_are_analyzed_in_batches()
+    test_repeated_text_is_analyzed_once()
+    test_background_flush_waits_for_the_worker_and_sorts_by_time()
+    test_failures_fall_back_to_unknown_topics()
+    print("Context analyzer tests passed!")
@@ -0,0 +1,55 @@
+import numpy as np
+
+from event_detector import DEFAULT_RULES, EventDetector, LANDMARKS, keyword_rule
+from pose_track import PoseTrack
+
+
+def make_track(seconds=4, fps=30):
+    """A speaker facing the camera who raises the right hand from 1s to 2s and turns the head at 3s"""
+    n = seconds * fps
+    landmarks = np.zeros((n, 33, 4), dtype=np.float32)
+    landmarks[..., 3] = 1.0
+    positions = {"nose": (0.5, 0.35), "left_ear": (0.53, 0.33), "right_ear": (0.47, 0.33),
+                 "left_shoulder": (0.6, 0.5), "right_shoulder": (0.4, 0.5),
+                 "left_wrist": (0.62, 0.8), "right_wrist": (0.38, 0.8)}
+    for name, xy in positions.items():
+        landmarks[:, LANDMARKS[name], :2] = xy
+    landmarks[fps:2 * fps, LANDMARKS["right_wrist"], 1] = 0.3
+    landmarks[3 * fps:, LANDMARKS["nose"], 0] = 0.52
+    frames = np.arange(n)
+    return PoseTrack.from_arrays(frames, frames / fps, landmarks)
+
+
+def test_batch_detects_pose_and_keyword_events():
+    rules = dict(DEFAULT_RULES, mention_coal=keyword_rule("coal", "coal miners"))
+    segment = {"start": 10.0, "end": 14.0, "text": "We will protect Coal country"}
+    events = EventDetector(rules).detect(make_track(), [segment])
+    by_type = {event["type"]: event for event in events}
+
+    raised = by_type["right_hand_raised"]
+    assert np.isclose(raised["start"], 1.0) and np.isclose(raised["end"], 59 / 30)
+    assert 0.5 < raised["confidence"] <= 1.0
+    assert np.isclose(by_type["head_turn_left"]["start"], 3.0)
+    # The single-frame jumps of the wrist are too short to count as bursts
+    assert set(by_type) == {"right_hand_raised", "head_turn_left", "mention_coal"}
+    assert by_type["mention_coal"]["match"] == "Coal" and 10.0 < by_type["mention_coal"]["start"] < 14.0
+
+
+def test_incremental_matches_batch():
+    """Adding frames a few at a time should give the same events as one batch pass"""
+    track = make_track()
+    detector = EventDetector()
+    events, pending = [], []
+    for start in range(0, len(track), 7):
+        events += detector.add_poses(track.timestamps[start:start + 7], track.landmarks[start:start + 7])
+        pending.append(detector.pending_since)
+    events += detector.flush()
+    # While the hand is up its event is held back, and released once it is down
+    assert pending[5] == 1.0 and pending[10] is None
+    assert events == EventDetector().detect(track)
+
+
+if __name__ == "__main__":
+    test_batch_detects_pose_and_keyword_events()
+    test_incremental_matches_batch()
+    print("Event detector tests passed!")
@@ -0,0 +1,112 @@
+import os
+import pathlib
+import tempfile
+
+import cv2
+import numpy as np
+import pytest
+
+import ffmpeg_io
+from benchmark import make_fixture
+from ffmpeg_io import FFmpegCapture, FFmpegWriter, VideoIO, ffmpeg_available, parse_showinfo
+from pose_stubs import BrightnessPose
+
+
+def test_parse_showinfo():
+    """Frame number and presentation time come from showinfo lines; other log lines are ignored"""
+    line = ("[Parsed_showinfo_0 @ 0x55d0c1a2b3c0] n:  12 pts:   6144 pts_time:0.48    duration:512 "
+            "duration_time:0.04 fmt:yuv420p sar:1/1 s:1280x720 i:P iskey:0 type:P")
+    assert parse_showinfo(line) == (12, 0.48)
+    assert parse_showinfo("Stream #0:0: Video: h264 (High), yuv420p, 1280x720, 25 fps") is None
+
+
+def test_video_io_falls_back_to_opencv(tmp_path):
+    with pytest.raises(ValueError, match="decoder must be one of"):
+        VideoIO(decoder="gstreamer")
+    video_io = VideoIO(decoder="ffmpeg", encoder="ffmpeg", preset="ultrafast")
+    assert video_io.encoding == ("ffmpeg", "libx264", "ultrafast")
+
+    path = str(tmp_path / "fixture.mp4")
+    make_fixture(path, width=160, height=90, seconds=1, fps=10, motion="high", audio=False)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(ffmpeg_io, "ffmpeg_available", lambda ffmpeg="ffmpeg": False)
+        cap = video_io.open_capture(path, rgb=True)
+        assert isinstance(cap, cv2.VideoCapture) and cap.read()[0]
+        cap.release()
+        writer = video_io.open_writer(str(tmp_path / "out.mp4"), 10, (160, 90))
+        assert isinstance(writer, cv2.VideoWriter)
+        writer.release()
+
+
+def read_frames(path):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+@pytest.mark.skipif(not ffmpeg_available(), reason="ffmpeg not installed")
+def test_capture_and_writer_round_trip():
+    """Ring-buffered frames match OpenCV's decode, with exact timestamps, seeking and re-encoding"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fixture.mp4")
+        make_fixture(path, width=160, height=90, seconds=2, fps=10, motion="high", audio=False)
+        reference = read_frames(path)
+
+        cap = FFmpegCapture(path, ring_size=3)
+        frames = []
+        for i in range(3):
+            ret, frame = cap.read()
+            assert np.abs(frame.astype(int) - reference[i]).mean() < 2
+            assert np.isclose(cap.timestamp, i / 10)
+            frames.append(frame)
+        # The fourth frame is decoded into the first one's buffer
+        assert np.shares_memory(cap.read()[1], frames[0])
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 15)
+        ret, frame = cap.read()
+        assert np.isclose(cap.timestamp, 1.5) and np.abs(frame.astype(int) - reference[15]).mean() < 2
+        cap.release()
+
+        out_path = os.path.join(tmp, "out.mp4")
+        writer = FFmpegWriter(out_path, 10, (160, 90), preset="ultrafast")
+        for frame in reference:
+            writer.write(frame)
+        writer.release()
+        assert int(cv2.VideoCapture(out_path).get(cv2.CAP_PROP_FRAME_COUNT)) == len(reference)
+
+
+@pytest.mark.skipif(not ffmpeg_available(), reason="ffmpeg not installed")
+def test_ffmpeg_decoder_output_matches_opencv():
+    """Frames annotated in their ring slots give the same output video as OpenCV's decoder"""
+    pytest.importorskip("mediapipe")
+    from cspan_analyzer_working import CSPANAnalyzer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fixture.mp4")
+        make_fixture(path, width=160, height=90, seconds=2, fps=10, motion="high", audio=False)
+        for options in (dict(pipelined=True, queue_size=2), dict(frame_skip=2, skip_mode="repeat"),
+                        dict(frame_skip=2, skip_mode="passthrough")):
+            outputs = {}
+            for decoder in ("opencv", "ffmpeg"):
+                analyzer = CSPANAnalyzer(video_path=path, enable_speech=False, enable_context=False,
+                                         video_io=VideoIO(decoder=decoder))
+                analyzer.pose = BrightnessPose()
+                output = os.path.join(tmp, f"{decoder}.mp4")
+                assert analyzer.process_video(output, **options)
+                outputs[decoder] = read_frames(output)
+            assert len(outputs["ffmpeg"]) == len(outputs["opencv"]) == 20
+            assert all(np.array_equal(a, b) for a, b in zip(outputs["ffmpeg"], outputs["opencv"])), options
+
+
+if __name__ == "__main__":
+    test_parse_showinfo()
+    test_video_io_falls_back_to_opencv(pathlib.Path(tempfile.mkdtemp()))
+    if ffmpeg_available():
+        test_capture_and_writer_round_trip()
+        test_ffmpeg_decoder_output_matches_opencv()
+    print("ffmpeg I/O tests passed!")
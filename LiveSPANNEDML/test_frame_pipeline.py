@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from frame_pipeline import FramePipeline
+
+
+def test_pipeline_preserves_order():
+    """Items should reach the sink in source order after passing every stage"""
+    def slow_double(x):
+        time.sleep(0.001)
+        return x * 2
+
+    results = []
+    FramePipeline(range(200), [("double", slow_double), ("inc", lambda x: x + 1)],
+                  results.append, queue_size=4).run()
+    assert results == [x * 2 + 1 for x in range(200)]
+
+
+def test_pipeline_reraises_stage_error():
+    """An exception in any stage should stop the pipeline and be re-raised"""
+    def fail_at_ten(x):
+        if x == 10:
+            raise ValueError("stage failed")
+        return x
+
+    results = []
+    with pytest.raises(ValueError, match="stage failed"):
+        FramePipeline(range(1000), [("check", fail_at_ten)], results.append, queue_size=2).run()
+    assert len(results) < 1000
+
+
+def test_max_in_flight_covers_pipeline():
+    """No more items than max_in_flight are ever alive between the source and the sink"""
+    alive, peak = set(), [0]
+
+    def source():
+        for i in range(300):
+            alive.add(i)
+            peak[0] = max(peak[0], len(alive))
+            yield i
+
+    FramePipeline(source(), [("a", lambda x: x), ("b", lambda x: x)], alive.discard, queue_size=2).run()
+    assert peak[0] <= FramePipeline.max_in_flight(2, 2)
+
+
+if __name__ == "__main__":
+    test_pipeline_preserves_order()
+    test_pipeline_reraises_stage_error()
+    test_max_in_flight_covers_pipeline()
+    print("Frame pipeline tests passed!")
@@ -0,0 +1,84 @@
+import os
+import tempfile
+
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("mediapipe")
+
+from benchmark import make_fixture
+from cspan_analyzer_working import CSPANAnalyzer
+from pose_stubs import BrightnessPose
+
+
+def read_frames(path):
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return fps, np.array(frames)
+
+
+def run(tmp, name, **options):
+    """Analyze a 3 second, 10 FPS fixture; returns the analyzer and the output's fps and frames"""
+    video = os.path.join(tmp, "fixture.mp4")
+    if not os.path.exists(video):
+        make_fixture(video, width=160, height=90, seconds=3, fps=10, motion="high", audio=False)
+    analyzer = CSPANAnalyzer(video_path=video, enable_speech=False, enable_context=False)
+    analyzer.pose = BrightnessPose()
+    output = os.path.join(tmp, f"{name}.mp4")
+    assert analyzer.process_video(output, **options)
+    return (analyzer, *read_frames(output))
+
+
+def test_skip_modes_set_output_frames_and_fps():
+    """Only every third frame is analyzed; the output keeps its duration in every mode"""
+    with tempfile.TemporaryDirectory() as tmp:
+        drop, drop_fps, drop_frames = run(tmp, "drop", frame_skip=3, skip_mode="drop")
+        repeat, repeat_fps, repeat_frames = run(tmp, "repeat", frame_skip=3, skip_mode="repeat")
+        passthrough, passthrough_fps, passthrough_frames = run(tmp, "passthrough", frame_skip=3,
+                                                               skip_mode="passthrough")
+
+    for analyzer in (drop, repeat, passthrough):
+        assert list(analyzer.pose_data.frames) == list(range(0, 30, 3))
+        assert analyzer.metrics.counters["frames_analyzed"] == 10
+    assert np.array_equal(drop.pose_data.landmarks, repeat.pose_data.landmarks)
+
+    assert drop_fps == pytest.approx(10 / 3, rel=1e-3) and len(drop_frames) == 10
+    assert repeat_fps == pytest.approx(10) and len(repeat_frames) == 30
+    assert passthrough_fps == pytest.approx(10) and len(passthrough_frames) == 30
+
+    # "repeat" writes each annotated frame three times; "passthrough" follows it with two raw frames,
+    # which lack the overlays
+    repeat_frames = repeat_frames.astype(int)
+    assert np.abs(repeat_frames[1:3] - repeat_frames[0]).mean() < 1
+    passthrough_frames = passthrough_frames.astype(int)
+    assert np.abs(passthrough_frames[1:3] - passthrough_frames[0]).mean() > 10
+
+
+def test_long_skips_seek_instead_of_grabbing():
+    """Skips of at least seek_threshold frames seek, and analyze the same frames as grabbing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        # The default threshold is two seconds, 20 frames, so a skip of 3 grabs
+        grabbed, _, grabbed_frames = run(tmp, "grab", frame_skip=3)
+        sought, _, sought_frames = run(tmp, "seek", frame_skip=3, seek_threshold=3)
+
+    assert grabbed.metrics.counters["frames_skipped"] == 20
+    assert "frames_skipped" not in sought.metrics.counters
+    for analyzer in (grabbed, sought):
+        assert analyzer.metrics.counters["frames_decoded"] == 10
+    assert list(sought.pose_data.frames) == list(grabbed.pose_data.frames)
+    assert np.allclose(sought.pose_data.landmarks, grabbed.pose_data.landmarks, atol=1e-2)
+    assert len(sought_frames) == len(grabbed_frames) == 10
+
+
+if __name__ == "__main__":
+    test_skip_modes_set_output_frames_and_fps()
+    test_long_skips_seek_instead_of_grabbing()
+    print("Frame skip tests passed!")
@@ -0,0 +1,37 @@
+import numpy as np
+
+from inference_resize import InferenceResizer, fit_size, parse_size
+
+
+def test_fit_size():
+    assert fit_size(None, 1920, 1080) is None
+    assert fit_size(640, 1920, 1080) == (640, 360)
+    assert fit_size(4000, 1920, 1080) is None  # never upscale
+    assert fit_size((256, 256), 1920, 1080) == (256, 256)
+    # Tuples never upscale either: they shrink to fit the frame, keeping their shape
+    assert fit_size((3840, 2160), 1920, 1080) is None
+    assert fit_size((1080, 1080), 1280, 720) == (720, 720)
+    assert fit_size((2000, 500), 1920, 1080) == (1920, 480)
+    assert parse_size("640") == 640 and parse_size("640x360") == (640, 360)
+
+
+def test_letterbox_round_trip():
+    """A point in the frame should map back to itself through the padded inference image"""
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    frame[360:, :640] = 255  # bottom-left quadrant
+    resizer = InferenceResizer((256, 256), letterbox=True)
+    image = resizer.prepare(frame)
+    assert image.shape == (256, 256, 3)
+    # 1280x720 scales to 256x144, padded by 56 rows above and below
+    assert image[0, 0].sum() == 0 and image[190, 10].sum() == 3 * 255
+
+    inference_point = np.array([[10 / 256, 190 / 256, 0.0, 1.0]], dtype=np.float32)
+    frame_point = resizer.map_array(inference_point)[0]
+    assert np.allclose(frame_point[:2], [10 * 5 / 1280, (190 - 56) * 5 / 720])
+    assert np.allclose(resizer.map_box((0, 56, 256, 200)), (0, 0, 1280, 720))
+
+
+if __name__ == "__main__":
+    test_fit_size()
+    test_letterbox_round_trip()
+    print("Inference resize tests passed!")
@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import pytest
+
+import live_stream
+from live_stream import LiveAnalyzer
+
+
+class StubAnalyzer:
+    """Just the pose settings LiveAnalyzer adapts"""
+    enable_pose = True
+
+    def __init__(self, complexity=2):
+        self.pose_params = {"model_complexity": complexity}
+        self.changes = []
+
+    def set_pose_complexity(self, complexity):
+        self.pose_params["model_complexity"] = complexity
+        self.changes.append(complexity)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+def make_live(**options):
+    live = LiveAnalyzer(StubAnalyzer(), "live.ts", **options)
+    live.fps = 30.0
+    return live
+
+
+def test_frame_skip_follows_the_frame_cost():
+    clock = Clock()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(live_stream, "time", SimpleNamespace(monotonic=clock.monotonic))
+        live = make_live(max_frame_skip=8)
+        live._adapt(0.001)
+        assert live.frame_skip == 1
+        # 100ms per frame at 30 fps, with 10% headroom: every 4th frame
+        live._adapt(0.1)
+        assert live.frame_cost == pytest.approx(0.0208)
+        for _ in range(30):
+            live._adapt(0.1)
+        assert live.frame_skip == 4
+        for _ in range(30):
+            live._adapt(1.0)
+        assert live.frame_skip == 8
+        for _ in range(50):
+            live._adapt(0.01)
+        assert live.frame_skip == 1
+    # Without a latency budget the pose model is never switched
+    assert live.analyzer.changes == []
+
+
+def test_complexity_steps_down_once_per_cooldown():
+    clock = Clock()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(live_stream, "time", SimpleNamespace(monotonic=clock.monotonic))
+        live = make_live(latency_budget=0.05, complexity_cooldown=5.0, min_pose_complexity=1)
+        live._adapt(0.1)
+        assert live.analyzer.changes == [1]
+        # The new model's cost is measured afresh
+        assert live.frame_cost is None
+
+        clock.now += 1.0
+        live._adapt(0.1)
+        assert live.analyzer.changes == [1]
+        clock.now += 5.0
+        live._adapt(0.1)
+        # Already at min_pose_complexity
+        assert live.analyzer.changes == [1]
+        assert live.frame_skip == 4
+
+
+def test_complexity_steps_back_up_when_it_fits_the_budget():
+    clock = Clock()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(live_stream, "time", SimpleNamespace(monotonic=clock.monotonic))
+        live = make_live(latency_budget=0.05, complexity_cooldown=5.0)
+        live._adapt(0.1)
+        assert live.analyzer.changes == [1]
+
+        # Complexity 2 measured 100ms not long ago, so 10ms at complexity 1 does not step up
+        clock.now += 6.0
+        live._adapt(0.01)
+        assert not live._fits_budget(2, clock.now)
+        assert live.analyzer.changes == [1]
+
+        # Once that measurement is older than ten cooldowns, 3x the current cost decides
+        clock.now += 50.0
+        assert live._fits_budget(2, clock.now)
+        live._adapt(0.01)
+        assert live.analyzer.changes == [1, 2]
+
+
+def test_unmeasured_complexity_needs_plenty_of_room():
+    clock = Clock()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(live_stream, "time", SimpleNamespace(monotonic=clock.monotonic))
+        live = make_live(latency_budget=0.05)
+        live.frame_cost = 0.02
+        assert not live._fits_budget(1, clock.now)
+        live.frame_cost = 0.015
+        assert live._fits_budget(1, clock.now)
+
+
+if __name__ == "__main__":
+    test_frame_skip_follows_the_frame_cost()
+    test_complexity_steps_down_once_per_cooldown()
+    test_complexity_steps_back_up_when_it_fits_the_budget()
+    test_unmeasured_complexity_needs_plenty_of_room()
+    print("Live stream tests passed!")
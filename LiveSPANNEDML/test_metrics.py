@@ -0,0 +1,56 @@
+import json
+import pickle
+
+from metrics import Metrics
+
+
+def test_histograms_counters_and_formats():
+    """Stage latencies should land in the right buckets and show up in both output formats"""
+    metrics = Metrics(buckets=(0.001, 0.01, 0.1))
+    for seconds in (0.0005, 0.002, 0.003, 0.05):
+        metrics.observe("pose", seconds)
+    metrics.increment("frames_analyzed", 4)
+    metrics.set_gauge("queue_depth", 2, stage="pose")
+    snapshots = []
+    metrics.add_observer(snapshots.append)
+    metrics.notify()
+
+    stage = snapshots[0]["stages"]["pose"]
+    assert stage["count"] == 4 and stage["max_seconds"] == 0.05
+    assert stage["p50_seconds"] == 0.01 and stage["p99_seconds"] == 0.05
+    assert snapshots[0]["counters"] == {"frames_analyzed": 4}
+    assert json.loads(metrics.to_json())["gauges"] == {"queue_depth[stage=pose]": 2}
+
+    text = metrics.to_prometheus()
+    assert 'cspan_stage_seconds_bucket{stage="pose",le="0.01"} 3' in text
+    assert 'cspan_stage_seconds_bucket{stage="pose",le="+Inf"} 4' in text
+    assert "cspan_frames_analyzed_total 4" in text
+    assert 'cspan_queue_depth{stage="pose"} 2' in text
+
+
+def test_merge_worker_metrics():
+    """Metrics pickled in a worker process should merge into the parent's"""
+    parent, worker = Metrics(), Metrics()
+    parent.observe("decode", 0.002)
+    worker.observe("decode", 0.004)
+    worker.increment("frames_decoded", 10)
+    parent.merge(pickle.loads(pickle.dumps(worker)))
+
+    snapshot = parent.snapshot()
+    assert snapshot["stages"]["decode"]["count"] == 2
+    assert snapshot["counters"]["frames_decoded"] == 10
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    with metrics.time("pose"):
+        pass
+    metrics.increment("frames_analyzed")
+    assert metrics.snapshot()["stages"] == {} and metrics.snapshot()["counters"] == {}
+
+
+if __name__ == "__main__":
+    test_histograms_counters_and_formats()
+    test_merge_worker_metrics()
+    test_disabled_metrics_record_nothing()
+    print("Metrics tests passed!")
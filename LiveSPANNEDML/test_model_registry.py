@@ -0,0 +1,98 @@
+import os
+import pathlib
+import sys
+import tempfile
+import threading
+import time
+import types
+
+import pytest
+
+from model_registry import ModelRegistry, DEFAULT_ZERO_SHOT_MODEL
+
+
+def fake_libraries(patch, loads):
+    """Replace whisper and transformers with modules that record what they load"""
+    def load_model(name):
+        time.sleep(0.01)  # Long enough for concurrent callers to overlap
+        loads.append(("whisper", name))
+        return object()
+
+    def pipeline(task, model=None):
+        loads.append((task, model))
+        return object()
+
+    patch.setitem(sys.modules, "whisper", types.SimpleNamespace(load_model=load_model))
+    patch.setitem(sys.modules, "transformers", types.SimpleNamespace(pipeline=pipeline))
+
+
+def test_models_are_loaded_once_per_process():
+    loads = []
+    ModelRegistry.clear()
+    try:
+        with pytest.MonkeyPatch.context() as patch:
+            fake_libraries(patch, loads)
+            first, second = ModelRegistry(), ModelRegistry()
+            models = []
+            threads = [threading.Thread(target=lambda: models.append(first.whisper("base"))) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert second.whisper("base") is models[0]
+            assert all(model is models[0] for model in models)
+            assert second.whisper("tiny") is not models[0]
+            assert first.zero_shot() is second.zero_shot()
+        assert loads == [("whisper", "base"), ("whisper", "tiny"), ("zero-shot-classification", DEFAULT_ZERO_SHOT_MODEL)]
+        assert ("whisper", "base", None) in ModelRegistry.loaded()
+    finally:
+        ModelRegistry.clear()
+
+
+def test_analyzers_share_the_registry_models():
+    pytest.importorskip("mediapipe")
+    from cspan_analyzer_working import CSPANAnalyzer
+
+    loads = []
+    ModelRegistry.clear()
+    try:
+        with pytest.MonkeyPatch.context() as patch:
+            fake_libraries(patch, loads)
+            first, second = CSPANAnalyzer(whisper_model="tiny"), CSPANAnalyzer(whisper_model="tiny")
+            # Nothing is loaded until a model is used
+            assert loads == []
+            assert first.speech_model is second.speech_model
+            assert first.topic_classifier is second.topic_classifier
+        assert [task for task, _ in loads] == ["whisper", "zero-shot-classification"]
+    finally:
+        ModelRegistry.clear()
+
+
+def test_model_dir_only_loads_local_files(tmp_path):
+    loads = []
+    ModelRegistry.clear()
+    try:
+        with pytest.MonkeyPatch.context() as patch:
+            fake_libraries(patch, loads)
+            registry = ModelRegistry(model_dir=str(tmp_path))
+            with pytest.raises(FileNotFoundError, match="not found in local model directory"):
+                registry.whisper("base")
+            with pytest.raises(FileNotFoundError, match="bart-large-mnli"):
+                registry.zero_shot("bart-large-mnli")
+            assert loads == []
+
+            (tmp_path / "base.pt").write_bytes(b"weights")
+            os.mkdir(tmp_path / "bart-large-mnli")
+            registry.whisper("base")
+            registry.zero_shot("bart-large-mnli")
+        assert loads == [("whisper", str(tmp_path / "base.pt")),
+                         ("zero-shot-classification", str(tmp_path / "bart-large-mnli"))]
+    finally:
+        ModelRegistry.clear()
+
+
+if __name__ == "__main__":
+    test_models_are_loaded_once_per_process()
+    test_analyzers_share_the_registry_models()
+    test_model_dir_only_loads_local_files(pathlib.Path(tempfile.mkdtemp()))
+    print("Model registry tests passed!")
@@ -0,0 +1,35 @@
+import numpy as np
+
+from motion_gate import MotionGate, CUT, STATIC, MOVING
+
+
+def test_static_moving_and_cut_frames():
+    """Unchanged frames are static, a moving block is motion and a new scene is a cut"""
+    rng = np.random.default_rng(0)
+    scene = (rng.random((180, 320, 3)) * 120).astype(np.uint8)
+    gate = MotionGate(max_reuse=100)
+
+    assert gate.check(scene) == MOVING  # nothing to compare the first frame with
+    assert gate.check(scene.copy()) == STATIC
+
+    moved = scene.copy()
+    moved[60:120, 100:160] = 255
+    assert gate.check(moved) == MOVING
+
+    other_scene = (rng.random((180, 320, 3)) * 80 + 170).astype(np.uint8)
+    assert gate.check(other_scene) == CUT
+    assert gate.stats() == {"inferred": 3, "reused": 1, "cuts": 1}
+
+
+def test_reuse_is_capped():
+    """At most max_reuse static frames in a row skip inference"""
+    frame = np.full((90, 160, 3), 100, dtype=np.uint8)
+    gate = MotionGate(max_reuse=3)
+    decisions = [gate.check(frame) for _ in range(9)]
+    assert decisions == [MOVING, STATIC, STATIC, STATIC, MOVING, STATIC, STATIC, STATIC, MOVING]
+
+
+if __name__ == "__main__":
+    test_static_moving_and_cut_frames()
+    test_reuse_is_capped()
+    print("Motion gate tests passed!")
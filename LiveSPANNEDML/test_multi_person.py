@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from multi_person import HogPersonDetector, MultiPersonPose, box_iou
+
+
+class FakePose:
+    """Finds a person spanning the middle of whatever crop it is given"""
+    def process(self, image):
+        landmarks = [SimpleNamespace(x=0.25 + 0.5 * (i % 2), y=0.25 + 0.5 * (i % 3 == 0), z=0.0, visibility=0.9)
+                     for i in range(33)]
+        return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=landmarks))
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_tracks_keep_ids_between_detections():
+    """People should keep their IDs, and detection should only run every detect_every frames"""
+    calls = []
+
+    def detector(frame):
+        calls.append(1)
+        return [(20, 20, 120, 220, 0.9), (200, 30, 300, 230, 0.8)]
+
+    people_pose = MultiPersonPose(FakePose, detector=detector, detect_every=4)
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    for _ in range(12):
+        people = people_pose.process(frame)
+    people_pose.close()
+
+    assert len(calls) == 3
+    assert [p["id"] for p in people] == [0, 1]
+    # Landmarks are mapped from the crop back to full-frame coordinates
+    left, right = people[0]["landmarks"], people[1]["landmarks"]
+    assert left[:, 0].max() < 0.5 < right[:, 0].min()
+
+
+def test_box_iou():
+    assert box_iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert box_iou((0, 0, 10, 10), (5, 0, 15, 10)) == 50 / 150
+    assert box_iou((0, 0, 10, 10), (20, 20, 30, 30)) == 0.0
+
+
+def test_hog_skips_frames_smaller_than_its_window():
+    detector = HogPersonDetector()
+    # 192x108 is what --inference-size 192 makes of 16:9 video
+    for height, width in [(90, 160), (108, 192), (127, 640), (200, 63), (300, 2000)]:
+        assert detector(np.zeros((height, width, 3), np.uint8)) == []
+    assert detector(np.zeros((128, 64, 3), np.uint8)) == []
+
+
+if __name__ == "__main__":
+    test_tracks_keep_ids_between_detections()
+    test_box_iou()
+    test_hog_skips_frames_smaller_than_its_window()
+    print("Multi-person tests passed!")
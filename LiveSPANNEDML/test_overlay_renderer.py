@@ -0,0 +1,89 @@
+import cv2
+import numpy as np
+
+from overlay_renderer import OverlayRenderer, wrap_text
+
+SPEECH = ("The gentleman from West Virginia is recognized for five minutes to speak on the amendment "
+          "to the appropriations bill concerning coal industry jobs")
+
+
+def baseline_text_overlay(frame, text, timestamp_str=None):
+    """The overlay as drawn before OverlayRenderer: full-frame blends and text drawn on every frame"""
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (0, frame.shape[0] - 180), (frame.shape[1], frame.shape[0]), (0, 0, 0), -1)
+    cv2.addWeighted(overlay, 0.8, frame, 0.2, 0, frame)
+    if text:
+        for i, line in enumerate(wrap_text(text)):
+            y_pos = frame.shape[0] - 150 + (i * 30)
+            cv2.putText(frame, line, (22, y_pos + 2), font, 0.7, (0, 0, 0), 2, cv2.LINE_AA)
+            cv2.putText(frame, line, (20, y_pos), font, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
+
+    title_bg = frame.copy()
+    cv2.rectangle(title_bg, (0, 0), (frame.shape[1], 60), (0, 0, 0), -1)
+    cv2.addWeighted(title_bg, 0.7, frame, 0.3, 0, frame)
+    cv2.putText(frame, "CSPAN Video Analysis", (20, 40), font, 1.2, (0, 0, 0), 3, cv2.LINE_AA)
+    cv2.putText(frame, "CSPAN Video Analysis", (20, 40), font, 1.2, (0, 255, 255), 2, cv2.LINE_AA)
+    analysis_text = "Multi-Person Pose Tracking + Speech Analysis"
+    text_size = cv2.getTextSize(analysis_text, font, 0.7, 2)[0]
+    cv2.putText(frame, analysis_text, (frame.shape[1] - text_size[0] - 20, 40), font, 0.7, (0, 0, 0), 3,
+                cv2.LINE_AA)
+    cv2.putText(frame, analysis_text, (frame.shape[1] - text_size[0] - 20, 40), font, 0.7, (0, 255, 255), 2,
+                cv2.LINE_AA)
+    if timestamp_str is not None:
+        cv2.putText(frame, timestamp_str, (frame.shape[1] - 200, 80), font, 0.6, (200, 200, 200), 2, cv2.LINE_AA)
+    return frame
+
+
+def synthetic_frame(seed, height=720, width=1280):
+    """Noise over a gradient, so every blend and text edge lands on varied pixels"""
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    frame = gradient + rng.normal(0, 40, (height, width, 3))
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def test_overlay_matches_the_baseline_drawing():
+    """Cached text layers and in-place bar blending should look like drawing everything per frame.
+
+    The bars match exactly; compositing the pre-rendered text rounds differently
+    from drawing it, so antialiased text edges may be a few levels off.
+    """
+    renderer = OverlayRenderer()
+    # The second and third frames reuse the layers rendered for the first
+    for seed, text, timestamp in [(0, SPEECH, "Time: 00:03"), (1, SPEECH, "Time: 00:04"), (2, "", None)]:
+        frame = synthetic_frame(seed)
+        expected = baseline_text_overlay(frame.copy(), text, timestamp)
+        actual = renderer.draw_text_overlay(frame, text, timestamp)
+        difference = np.abs(actual.astype(int) - expected.astype(int))
+        assert difference.max() <= 5, (seed, difference.max())
+        assert (difference > 2).mean() < 1e-3
+        # The video between the bars is untouched
+        assert not difference[61:720 - 180].any()
+
+
+def test_small_frames_keep_the_bars_inside():
+    """Frames shorter than the speech bar should darken what there is, like the baseline"""
+    renderer = OverlayRenderer()
+    frame = synthetic_frame(3, height=150, width=320)
+    expected = baseline_text_overlay(frame.copy(), SPEECH)
+    actual = renderer.draw_text_overlay(frame, SPEECH)
+    assert np.abs(actual.astype(int) - expected.astype(int)).max() <= 5
+
+
+def test_segmentation_matches_the_baseline_composite():
+    renderer = OverlayRenderer()
+    frame = synthetic_frame(4, height=90, width=160)
+    mask = np.random.default_rng(5).random((45, 80)).astype(np.float32)
+
+    full_mask = cv2.resize(mask, (160, 90), interpolation=cv2.INTER_LINEAR)
+    condition = np.stack((full_mask,) * 3, axis=-1) > 0.1
+    expected = np.where(condition, frame, np.full(frame.shape, 192, np.uint8))
+    assert np.array_equal(renderer.composite_segmentation(frame.copy(), mask), expected)
+
+
+if __name__ == "__main__":
+    test_overlay_matches_the_baseline_drawing()
+    test_small_frames_keep_the_bars_inside()
+    test_segmentation_matches_the_baseline_composite()
+    print("Overlay renderer tests passed!")
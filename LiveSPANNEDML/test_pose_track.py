@@ -0,0 +1,63 @@
+import tempfile
+
+import numpy as np
+
+from pose_track import PoseTrack
+
+
+def make_track(n=100, fps=30.0):
+    """A track whose landmark values encode the frame number"""
+    track = PoseTrack(capacity=4)
+    for i in range(n):
+        track.append(i * 2, i * 2 / fps, np.full((33, 4), i, dtype=np.float32))
+    return track
+
+
+def test_append_grows_and_slices_without_copying():
+    """Appends should grow the arrays, and landmark/time slices should be views"""
+    track = make_track()
+    assert len(track) == 100
+    assert track.landmarks.shape == (100, 33, 4)
+    wrist = track.landmark(16, slice(0, 2))
+    assert wrist.shape == (100, 2) and np.shares_memory(wrist, track.landmarks)
+
+    window = track.slice_time(1.0, 2.0)
+    assert np.all((window.timestamps >= 1.0) & (window.timestamps < 2.0))
+    assert np.shares_memory(window.landmarks, track.landmarks)
+    assert track.index_of_frame(10) == 5 and track.index_of_frame(11) is None
+
+
+def test_concatenate_orders_by_timestamp():
+    """Chunks merged out of order should come back sorted by time"""
+    track = make_track()
+    merged = PoseTrack.concatenate([track[50:], track[:50]])
+    assert np.array_equal(merged.frames, track.frames)
+    assert np.array_equal(merged.landmarks, track.landmarks)
+
+
+def test_interpolate_blends_by_timestamp():
+    """Rows between two anchors should be replaced by a linear blend"""
+    track = make_track(10)
+    track.landmarks[3:6] = 2
+    track.interpolate(2, 6)
+    assert np.allclose(track.landmarks[3:6, 0, 0], [3, 4, 5])
+
+
+def test_save_and_memory_mapped_load():
+    """A saved track should load back memory-mapped with identical contents"""
+    track = make_track()
+    with tempfile.TemporaryDirectory() as tmp:
+        track.save(tmp)
+        loaded = PoseTrack.load(tmp)
+        assert isinstance(loaded.landmarks, np.memmap)
+        assert np.array_equal(loaded.timestamps, track.timestamps)
+        assert loaded[-1]['frame'] == 198
+        del loaded
+
+
+if __name__ == "__main__":
+    test_append_grows_and_slices_without_copying()
+    test_concatenate_orders_by_timestamp()
+    test_interpolate_blends_by_timestamp()
+    test_save_and_memory_mapped_load()
+    print("Pose track tests passed!")
@@ -0,0 +1,112 @@
+import threading
+
+from speech_index import SpeechIndex
+
+
+def make_index():
+    """Three segments with a gap between the second and third"""
+    return SpeechIndex([
+        {"start": 0.0, "end": 2.0, "text": "first"},
+        {"start": 2.5, "end": 5.0, "text": "second"},
+        {"start": 8.0, "end": 10.0, "text": "third"},
+    ])
+
+
+def test_lookup_and_gaps():
+    """Lookups should hit the containing segment and respect the gap tolerance"""
+    index = make_index()
+    assert index.text_at(1.0) == "first"
+    assert index.text_at(2.5) == "second"
+    assert index.text_at(6.0) == ""
+    assert index.text_at(6.0, tolerance=1.5) == "second"
+    assert index.text_at(7.5, tolerance=1.0) == "third"
+    assert index.text_at(20.0) == ""
+
+
+def test_out_of_order_append_and_range_query():
+    """Segments appended out of order should still be found by range queries"""
+    index = make_index()
+    index.append({"start": 5.5, "end": 7.0, "text": "late"})
+    assert [s["text"] for s in index] == ["first", "second", "late", "third"]
+    assert [s["text"] for s in index.overlapping(4.0, 8.5)] == ["second", "late", "third"]
+    assert index.overlapping(10.5, 12.0) == []
+
+
+def test_cursor_matches_index():
+    """The forward-only cursor should agree with plain lookups, even when rewound"""
+    index = make_index()
+    cursor = index.cursor()
+    timestamps = [i * 0.25 for i in range(50)] + [1.0]
+    for t in timestamps:
+        assert cursor.text_at(t) == index.text_at(t), t
+
+
+def test_cursor_after_out_of_order_insert():
+    """An insert before the cursor's position should not make it skip or repeat a segment"""
+    index = make_index()
+    cursor = index.cursor()
+    assert cursor.text_at(9.0) == "third"
+    index.append({"start": 0.5, "end": 0.8, "text": "aside"})
+    index.append({"start": 10.0, "end": 12.0, "text": "fourth"})
+    assert cursor.text_at(9.5) == "third"
+    assert cursor.text_at(11.0) == "fourth"
+
+
+def test_lookups_while_appending():
+    """Readers on other threads should only ever see whole segments that contain their timestamp"""
+    index = SpeechIndex()
+    errors = []
+    done = threading.Event()
+
+    def writer():
+        # One second segments every two seconds, with every tenth one arriving late
+        late = []
+        for k in range(3000):
+            segment = {"start": 2.0 * k, "end": 2.0 * k + 1, "text": f"{2 * k}:{2 * k + 1}"}
+            if k % 10 == 3:
+                late.append(segment)
+            else:
+                index.append(segment)
+            if k % 10 == 9:
+                index.extend(late)
+                late = []
+        done.set()
+
+    def check(t, text):
+        if text:
+            start, end = map(float, text.split(":"))
+            if not start <= t <= end:
+                errors.append((t, text))
+
+    def reader():
+        cursor = index.cursor()
+        t = 0.0
+        while not done.is_set() or t < 6000:
+            try:
+                check(t, cursor.text_at(t))
+                check(t, index.text_at(t))
+                for segment in index.overlapping(t, t + 3):
+                    if segment["end"] < t or segment["start"] > t + 3:
+                        errors.append((t, segment))
+                index[len(index) - 1]
+            except Exception as e:
+                errors.append(e)
+                break
+            t += 0.3
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert [s["start"] for s in index] == [2.0 * k for k in range(3000)]
+
+
+if __name__ == "__main__":
+    test_lookup_and_gaps()
+    test_out_of_order_append_and_range_query()
+    test_cursor_matches_index()
+    test_cursor_after_out_of_order_insert()
+    test_lookups_while_appending()
+    print("Speech index tests passed!")
@@ -0,0 +1,112 @@
+import numpy as np
+
+from streaming_stats import DecayingStats, MovementStats, RollingStats, RunningStats, SpeechStats
+
+
+def test_running_stats_match_numpy_and_merge():
+    """One-by-one, batch and merged updates give np.var, even far from zero"""
+    rng = np.random.default_rng(0)
+    values = rng.random((500, 3, 2)) * 1e-3 + 1e4
+    first = RunningStats((3, 2))
+    for value in values[:200]:
+        first.add(value)
+    second = RunningStats((3, 2))
+    second.add_batch(values[200:])
+    first.merge(second)
+    assert first.count == 500
+    assert np.allclose(first.mean, values.mean(axis=0))
+    assert np.allclose(first.variance, values.var(axis=0), rtol=1e-6)
+
+
+def test_rolling_and_decaying_stats_merge_across_chunks():
+    """Chunks processed separately merge into the stats of the whole stream"""
+    rng = np.random.default_rng(1)
+    timestamps = np.arange(600) / 10.0
+    values = rng.random(600)
+    early, late = RollingStats(10.0), RollingStats(10.0)
+    early.add_batch(timestamps[:300], values[:300])
+    late.add_batch(timestamps[300:], values[300:])
+    window = early.merge(late).stats()
+    assert len(early.buckets) <= 11
+    assert np.isclose(window.variance, values[timestamps > 49.9].var())
+
+    decaying = DecayingStats(5.0)
+    for t, v in zip(timestamps, values):
+        decaying.add(t, v)
+    early, late = DecayingStats(5.0), DecayingStats(5.0)
+    early.add_batch(timestamps[:300], values[:300])
+    late.add_batch(timestamps[300:], values[300:])
+    early.merge(late)
+    weights = 0.5 ** ((timestamps[-1] - timestamps) / 5.0)
+    mean = np.average(values, weights=weights)
+    assert np.isclose(decaying.mean, mean) and np.isclose(early.mean, mean)
+    assert np.isclose(early.variance, np.average((values - mean) ** 2, weights=weights))
+
+
+def test_rolling_batches_fill_the_same_buckets_as_single_values():
+    """With 0.7 second buckets, index * bucket_seconds can floor into the bucket below"""
+    timestamps = np.arange(100) / 10.0
+    values = np.arange(100, dtype=np.float64)
+    single, batch = RollingStats(7.0), RollingStats(7.0)
+    for t, v in zip(timestamps, values):
+        single.add(t, v)
+    batch.add_batch(timestamps, values)
+    assert sorted(batch.buckets) == sorted(single.buckets)
+    for index, bucket in single.buckets.items():
+        assert batch.buckets[index].count == bucket.count
+        assert np.isclose(batch.buckets[index].mean, bucket.mean)
+    assert np.isclose(batch.stats().variance, single.stats().variance)
+
+
+def test_empty_stats_can_be_queried_and_merged():
+    """Before the first value, e.g. a chunk where nobody was detected"""
+    rolling = RollingStats(10.0)
+    assert rolling.stats().count == 0
+    assert rolling.merge(RollingStats(10.0)).stats().count == 0
+    full = RollingStats(10.0)
+    full.add_batch(np.arange(50) / 10.0, np.arange(50.0))
+    assert full.merge(RollingStats(10.0)).stats().count == 50
+    assert RollingStats(10.0).merge(full).stats().count == 50
+
+    movement, speech = MovementStats(), SpeechStats()
+    assert movement.rolling() == movement.summary() == movement.recent() == {}
+    assert speech.rolling() == speech.recent() == 0 and speech.summary() == {}
+    assert movement.merge(MovementStats()).rolling() == {}
+    assert speech.merge(SpeechStats()).rolling() == 0
+
+
+def test_movement_and_speech_stats():
+    """Whole-video results match analyze_movement and analyze_speech; rolling ones follow the latest data"""
+    rng = np.random.default_rng(2)
+    landmarks = rng.random((300, 33, 4)).astype(np.float32)
+    landmarks[150:, 16, :2] = 0.5  # the right hand stops moving
+    timestamps = np.arange(300) / 10.0
+    movement = MovementStats(window_seconds=5.0)
+    moving = None
+    for start in range(0, 300, 10):
+        movement.add(timestamps[start:start + 10], landmarks[start:start + 10])
+        if start == 140:
+            moving = movement.rolling()["right_hand_variance"]
+    expected = np.var(landmarks[:, 16, :2].astype(np.float64), axis=0).sum()
+    assert np.isclose(movement.summary()["right_hand_variance"], expected)
+    assert movement.rolling()["right_hand_variance"] < 1e-12 < moving
+
+    speech = SpeechStats(window_seconds=30.0)
+    speech.add({"start": 0.0, "end": 30.0, "text": "slow " * 50})
+    assert speech.rolling() == 100
+    other = SpeechStats(window_seconds=30.0)
+    other.add({"start": 60.0, "end": 75.0, "text": "fast " * 75})
+    speech.merge(other)
+    assert speech.summary() == {"total_segments": 2, "total_words": 125, "total_speech_duration": 45.0,
+                                "words_per_minute": 125 / 45 * 60}
+    assert speech.rolling() == 300
+    assert 100 < speech.recent() < 300
+
+
+if __name__ == "__main__":
+    test_running_stats_match_numpy_and_merge()
+    test_rolling_and_decaying_stats_merge_across_chunks()
+    test_rolling_batches_fill_the_same_buckets_as_single_values()
+    test_empty_stats_can_be_queried_and_merged()
+    test_movement_and_speech_stats()
+    print("Streaming stats tests passed!")
@@ -0,0 +1,108 @@
+import threading
+
+import numpy as np
+import pytest
+
+import streaming_transcriber
+from streaming_transcriber import FAILED_TRANSCRIPT_TEXT, StreamingTranscriber
+
+# A 40 second talk: a three second sentence every four seconds
+SPEECH = [(t, t + 3.0, f"sentence {i}") for i, t in enumerate(range(0, 40, 4))]
+
+
+class FakeWhisper:
+    """Transcribes the SPEECH sentences starting in the window passed as its audio"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def transcribe(self, audio, initial_prompt=None):
+        start, duration = audio
+        self.prompts.append(initial_prompt)
+        segments = [{"start": s - start, "end": min(e, start + duration) - start, "text": text}
+                    for s, e, text in SPEECH if start <= s < start + duration]
+        return {"segments": segments}
+
+
+def transcribe(duration, windows, **options):
+    """Run a StreamingTranscriber with the audio replaced by its (start, duration)"""
+    def load_audio_window(path, start, duration):
+        windows.append((start, duration))
+        return np.array([start, duration])
+
+    segments = []
+    model = FakeWhisper()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(streaming_transcriber, "load_audio_window", load_audio_window)
+        transcriber = StreamingTranscriber(model, "talk.mp4", duration, segments, **options)
+        transcriber.start().join()
+    return transcriber, model, segments
+
+
+def test_windows_overlap_and_end_with_the_audio():
+    windows = []
+    transcriber, _, _ = transcribe(40.0, windows, window_seconds=10.0, overlap_seconds=4.0)
+    assert windows == [(0.0, 10.0), (6.0, 10.0), (12.0, 10.0), (18.0, 10.0), (24.0, 10.0), (30.0, 10.0)]
+    assert transcriber.done and transcriber.error is None
+    assert transcriber.wait_until(1e9, timeout=0)
+
+
+def test_every_sentence_is_committed_once_and_whole():
+    """Sentences starting in the second half of an overlap are left to the next window,
+    which sees them whole, and sentences an earlier window committed are not repeated"""
+    transcriber, model, segments = transcribe(40.0, [], window_seconds=10.0, overlap_seconds=4.0)
+    assert [(s["start"], s["end"], s["text"]) for s in segments] == SPEECH
+    # Each window is prompted with the last sentence committed before it
+    assert model.prompts == [None, "sentence 1", "sentence 3", "sentence 4", "sentence 6", "sentence 7"]
+
+
+def test_a_growing_source_is_transcribed_in_full_windows():
+    windows = []
+    available = [12.0]
+    lock = threading.Lock()
+
+    def duration():
+        with lock:
+            return available[0]
+
+    def load_audio_window(path, start, length):
+        windows.append((start, length))
+        with lock:
+            if available[0] < 40.0:
+                available[0] += 6.0
+            else:
+                transcriber.finish()
+        return np.array([start, length])
+
+    segments = []
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(streaming_transcriber, "load_audio_window", load_audio_window)
+        transcriber = StreamingTranscriber(FakeWhisper(), "live.ts", duration, segments, window_seconds=10.0,
+                                           overlap_seconds=4.0, poll_interval=0.01)
+        transcriber.start().join()
+    # Only the window reaching the end of the finished source is shorter than 10 seconds
+    assert all(length == 10.0 for _, length in windows[:-1])
+    assert windows[-1][0] + windows[-1][1] == pytest.approx(42.0)
+    assert [s["text"] for s in segments] == [text for _, _, text in SPEECH]
+
+
+def test_failure_leaves_a_placeholder_segment():
+    def load_audio_window(path, start, duration):
+        raise RuntimeError("no audio stream")
+
+    segments = []
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(streaming_transcriber, "load_audio_window", load_audio_window)
+        transcriber = StreamingTranscriber(FakeWhisper(), "silent.mp4", 40.0, segments)
+        transcriber.start().join()
+    assert isinstance(transcriber.error, RuntimeError)
+    assert transcriber.done
+    assert segments == [{"start": 0, "end": 100000, "text": FAILED_TRANSCRIPT_TEXT}]
+
+
+if __name__ == "__main__":
+    test_windows_overlap_and_end_with_the_audio()
+    test_every_sentence_is_committed_once_and_whole()
+    test_a_growing_source_is_transcribed_in_full_windows()
+    test_failure_leaves_a_placeholder_segment()
+    print("Streaming transcriber tests passed!")
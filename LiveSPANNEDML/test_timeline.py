@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+
+import cv2
+import numpy as np
+import pytest
+
+from pose_stubs import SquarePose
+from timeline import TimelineEmitter
+
+
+def test_windows_match_batch_statistics():
+    """Incremental window movement stats should match np.var over the same frames"""
+    rng = np.random.default_rng(0)
+    landmarks = rng.random((90, 33, 4)).astype(np.float32)
+    timestamps = np.arange(90) / 10.0
+    timeline = TimelineEmitter(window_seconds=3.0)
+    for t, frame in zip(timestamps, landmarks):
+        timeline.add_pose(t, frame)
+    timeline.add_speech({"start": 4.0, "end": 5.0, "text": " two words"})
+    windows = timeline.close(9.0)
+
+    assert [w["label"] for w in windows] == ["00:00 - 00:03", "00:03 - 00:06", "00:06 - 00:09"]
+    expected = np.var(landmarks[30:60, 16, :2].astype(np.float64), axis=0).sum()
+    assert np.isclose(windows[1]["movement"]["right_hand_variance"], expected)
+    assert windows[1]["transcript"] == "two words" and windows[1]["words_per_minute"] == 120
+    assert [e["type"] for e in windows[0]["events"]][-1] == "silence"
+
+
+def test_windows_wait_for_context_and_stream_to_file():
+    """A window is only emitted once its context texts have results"""
+    memo = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "timeline.jsonl")
+        timeline = TimelineEmitter(window_seconds=5.0, path=path, context_lookup=memo.get)
+        timeline.add_text(1.0, "budget talk")
+        timeline.advance(12.0)
+        assert timeline.windows == []
+
+        memo["budget talk"] = ({"labels": ["budget"], "scores": [0.9]}, "")
+        timeline.advance(12.0)
+        assert [w["index"] for w in timeline.windows] == [0, 1]
+        with open(path) as f:
+            assert json.loads(f.readline())["topics"] == ["budget"]
+        timeline.close()
+
+
+def test_close_on_a_window_boundary_adds_no_empty_window():
+    timeline = TimelineEmitter(window_seconds=2.0)
+    timeline.advance(6.0)
+    # The window ending at 6.0 waits in case the video ends there
+    assert len(timeline.windows) == 2
+    # Speech starting exactly at the end joins the last window
+    timeline.add_speech({"start": 6.0, "end": 7.0, "text": "over time"})
+    windows = timeline.close(6.0)
+    assert [w["label"] for w in windows] == ["00:00 - 00:02", "00:02 - 00:04", "00:04 - 00:06"]
+    assert all(w["end"] > w["start"] for w in windows)
+    assert windows[-1]["transcript"] == "over time"
+
+    timeline = TimelineEmitter(window_seconds=2.0)
+    timeline.advance(6.5)
+    timeline.add_speech({"start": 7.5, "end": 8.0, "text": "past the end"})
+    windows = timeline.close(7.0)
+    assert [(w["start"], w["end"]) for w in windows][-1] == (6.0, 7.0)
+    assert windows[-1]["transcript"] == "past the end"
+
+
+def test_gated_windows_use_interpolated_rows():
+    """With the motion gate on, windows should describe the final, interpolated pose rows"""
+    pytest.importorskip("mediapipe")
+    from cspan_analyzer_working import CSPANAnalyzer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A square that jumps every fifth frame, so the frames in between are static
+        video = os.path.join(tmp, "steps.mp4")
+        out = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"mp4v"), 10, (160, 90))
+        for i in range(60):
+            frame = np.full((90, 160, 3), 60, np.uint8)
+            x = 10 + (i // 5) * 10
+            frame[30:50, x:x + 20] = 255
+            out.write(frame)
+        out.release()
+
+        analyzer = CSPANAnalyzer(video_path=video, enable_speech=False, enable_context=False, motion_gate=True)
+        analyzer.pose = SquarePose()
+        path = os.path.join(tmp, "timeline.jsonl")
+        analyzer.process_video(render=False, timeline_path=path, timeline_window=2.0)
+        with open(path) as f:
+            windows = [json.loads(line) for line in f]
+
+    assert analyzer.metrics.counters["pose_reused"] > 30
+    assert len(windows) == 3
+    for window in windows:
+        expected = analyzer.analyze_movement(window["start"], window["end"])
+        for name, value in expected.items():
+            assert window["movement"][name] == pytest.approx(value, rel=1e-9, abs=1e-15)
+
+
+if __name__ == "__main__":
+    test_windows_match_batch_statistics()
+    test_windows_wait_for_context_and_stream_to_file()
+    test_close_on_a_window_boundary_adds_no_empty_window()
+    test_gated_windows_use_interpolated_rows()
+    print("Timeline tests passed!")
@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+from transcript_search import TranscriptIndex, build_query
+
+HEARING = [
+    {"start": 0.0, "end": 4.0, "text": "The committee will come to order."},
+    {"start": 4.0, "end": 9.5, "text": "Today we discuss clean coal and the miners it employs."},
+    {"start": 9.5, "end": 15.0, "text": "Coal country deserves better infrastructure."},
+]
+SIGNING = [
+    {"start": 2.0, "end": 6.0, "text": "I am signing an executive order on coal today."},
+]
+
+
+def test_keyword_phrase_prefix_and_window_queries():
+    index = TranscriptIndex(":memory:")
+    index.add_segments("hearing.mp4", HEARING)
+    index.add_segments("signing.mp4", SIGNING)
+
+    assert {hit["video"] for hit in index.search("coal")} == {"hearing.mp4", "signing.mp4"}
+    assert [hit["start"] for hit in index.search("clean coal", mode="phrase")] == [4.0]
+    assert index.search("coal clean", mode="phrase") == []
+    assert [hit["start"] for hit in index.search("coal clean")] == [4.0]
+    assert [hit["text"] for hit in index.search("infra", mode="prefix")] == [HEARING[2]["text"]]
+    assert len(index.search("order signing", mode="any")) == 2
+
+    hits = index.search("coal", video="hearing.mp4", start=10.0, end=20.0, order="time")
+    assert [(hit["start"], hit["end"]) for hit in hits] == [(9.5, 15.0)]
+    assert index.said("executive order", video="signing.mp4", start=0, end=15)
+    assert not index.said("executive order", video="hearing.mp4")
+
+
+def test_incremental_updates_persist_and_ignore_repeats():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transcripts.db")
+        index = TranscriptIndex(path)
+        assert index.add_segments("hearing.mp4", HEARING[:1]) == 1
+        # A streaming run re-adds what it already indexed along with new segments
+        assert index.add_segments("hearing.mp4", HEARING) == 2
+        index.close()
+
+        index = TranscriptIndex(path)
+        assert index.videos() == {"hearing.mp4": 3}
+        assert len(index.search("committee")) == 1
+        index.remove_video("hearing.mp4")
+        assert index.search("committee") == [] and index.videos() == {}
+        index.close()
+
+
+def test_build_query_ignores_punctuation():
+    assert build_query('coal, "miners"!') == '"coal" AND "miners"'
+    assert build_query("coal min", mode="prefix") == '"coal" AND "min"*'
+
+
+if __name__ == "__main__":
+    test_keyword_phrase_prefix_and_window_queries()
+    test_incremental_updates_persist_and_ignore_repeats()
+    test_build_query_ignores_punctuation()
+    print("Transcript search tests passed!")
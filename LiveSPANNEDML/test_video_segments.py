@@ -0,0 +1,57 @@
+import os
+import tempfile
+
+import cv2
+import numpy as np
+import pytest
+
+from video_segments import concat_videos
+
+
+def write_segment(path, values, size=(64, 48), fps=10):
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    for value in values:
+        out.write(np.full((size[1], size[0], 3), value, np.uint8))
+    out.release()
+
+
+def read_means(path):
+    cap = cv2.VideoCapture(path)
+    means = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        means.append(frame.mean())
+    cap.release()
+    return means
+
+
+def test_segments_are_joined_in_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"chunk_{i}.mp4") for i in range(3)]
+        write_segment(paths[0], [40] * 5)
+        write_segment(paths[1], [120] * 7)
+        write_segment(paths[2], [200] * 3)
+        output = os.path.join(tmp, "joined.mp4")
+        assert concat_videos(paths, output) == output
+        means = read_means(output)
+    assert len(means) == 15
+    assert np.allclose(means, [40] * 5 + [120] * 7 + [200] * 3, atol=10)
+
+
+def test_empty_segments_are_left_out():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, "chunk_0.mp4"), os.path.join(tmp, "missing.mp4")]
+        write_segment(paths[0], [80] * 4)
+        output = os.path.join(tmp, "joined.mp4")
+        concat_videos(paths, output)
+        assert len(read_means(output)) == 4
+        with pytest.raises(ValueError):
+            concat_videos([paths[1]], output)
+
+
+if __name__ == "__main__":
+    test_segments_are_joined_in_order()
+    test_empty_segments_are_left_out()
+    print("Video segment tests passed!")
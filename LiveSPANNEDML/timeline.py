@@ -0,0 +1,247 @@
+import json
+import math
+
+import numpy as np
+
+from streaming_stats import MOVEMENT_POINTS, RunningStats
+
+_POINT_INDICES = list(MOVEMENT_POINTS.values())
+
+# Summed x, y variance within a window above which a hand counts as gesturing
+GESTURE_VARIANCE = 0.002
+
+
+def format_window_time(seconds):
+    """Format seconds as MM:SS, or H:MM:SS past an hour."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+
+class _Window:
+    def __init__(self, index, start, end):
+        """Running aggregates for one window of the timeline."""
+        self.index = index
+        self.start = start
+        self.end = end
+        self.movement = RunningStats((len(_POINT_INDICES), 2))
+        self.segments = []
+        self.texts = []
+        self.events = []
+        self.fields = {}
+
+    def merge(self, other):
+        self.movement.merge(other.movement)
+        self.segments += other.segments
+        self.texts += other.texts
+        self.events += other.events
+
+
+class TimelineEmitter:
+    def __init__(self, window_seconds=15.0, path=None, on_window=None, context_lookup=None,
+                 gesture_variance=GESTURE_VARIANCE):
+        """Build the analysis timeline one fixed-length window at a time.
+
+        Pose frames, speech segments and context texts are added as they are
+        produced and folded into per-window running stats, so emitting a window
+        never rescans the pose track or the transcript. advance(t) marks that
+        all data before t has been added; every window ending before then whose
+        context texts have been analyzed is emitted, in order, to
+        on_window(window) and as one JSON line to path, which is flushed
+        after each window so readers can follow it while the video is still
+        being processed. context_lookup(text) returns the (topics, summary)
+        result for a text, or None while it is still pending.
+
+        Each window carries its transcript, words per minute, topics,
+        summaries, movement variance of the hands and head, and events:
+        a hand starting to gesture, a change of topic, silence, and any
+        added with add_event().
+        """
+        self.window_seconds = window_seconds
+        self.path = path
+        self.on_window = on_window
+        self.context_lookup = context_lookup
+        self.gesture_variance = gesture_variance
+
+        self.windows = []
+        self.late = 0  # data that arrived for an already emitted window
+        self._open = {}
+        self._next = 0
+        self._complete_until = 0.0
+        self._previous = None
+        self._file = open(path, "w") if path else None
+
+    def _window(self, timestamp):
+        index = int(timestamp // self.window_seconds)
+        if index < self._next:
+            self.late += 1
+            return None
+        if index not in self._open:
+            start = index * self.window_seconds
+            self._open[index] = _Window(index, start, start + self.window_seconds)
+        return self._open[index]
+
+    def add_pose(self, timestamp, landmarks):
+        """Add one frame's (landmarks, 4) array."""
+        window = self._window(timestamp)
+        if window is None:
+            return
+        window.movement.add(np.asarray(landmarks)[_POINT_INDICES, :2])
+
+    def add_poses(self, timestamps, landmarks):
+        """Add many frames at once, e.g. a merged PoseTrack's timestamps and landmarks."""
+        timestamps = np.asarray(timestamps)
+        if not len(timestamps):
+            return
+        xy = np.asarray(landmarks)[:, _POINT_INDICES, :2].astype(np.float64)
+        indices = (timestamps // self.window_seconds).astype(np.int64)
+        for index in np.unique(indices):
+            window = self._window(index * self.window_seconds)
+            if window is not None:
+                window.movement.add_batch(xy[indices == index])
+
+    def add_speech(self, segment):
+        """Add a transcript segment dict to the window it starts in."""
+        window = self._window(segment["start"])
+        if window is not None:
+            window.segments.append(segment)
+
+    def add_text(self, timestamp, text):
+        """Add a speech text sent for context analysis; its result comes from context_lookup."""
+        window = self._window(timestamp)
+        if window is not None:
+            window.texts.append(text)
+
+    def add_event(self, timestamp, event_type, **details):
+        """Add an event found elsewhere, e.g. a shot cut."""
+        window = self._window(timestamp)
+        if window is not None:
+            window.events.append({"timestamp": timestamp, "type": event_type, **details})
+
+    def note(self, timestamp, **fields):
+        """Set extra fields on the window containing timestamp."""
+        window = self._window(timestamp)
+        if window is not None:
+            window.fields.update(fields)
+
+    def _context_ready(self, window):
+        return self.context_lookup is None or all(self.context_lookup(t) is not None for t in window.texts)
+
+    def advance(self, timestamp):
+        """Mark everything before timestamp as added and emit the windows that are ready.
+
+        A window ending exactly at timestamp waits for a later advance or
+        close(), so data timed at the end of the video can still join it.
+        """
+        self._complete_until = max(self._complete_until, timestamp)
+        while (self._next + 1) * self.window_seconds < self._complete_until:
+            window = self._open.get(self._next) or self._window(self._next * self.window_seconds)
+            if not self._context_ready(window):
+                return
+            self._emit(window)
+
+    def close(self, end=None):
+        """Emit every remaining window, ending the last one at end (default: the last advance)."""
+        end = self._complete_until if end is None else max(end, self._complete_until)
+        # advance() never emits the window ending at the last advance, so the one ending at end is still open
+        last = max(math.ceil(end / self.window_seconds), self._next + 1)
+        # Data timed at or past the end (e.g. a transcript running over) goes into the last window
+        final = self._open.get(last - 1) or self._window((last - 1) * self.window_seconds)
+        for index in [i for i in self._open if i >= last]:
+            final.merge(self._open.pop(index))
+        while self._next < last:
+            window = self._open.get(self._next) or self._window(self._next * self.window_seconds)
+            window.end = min(window.end, max(end, window.start))
+            self._emit(window)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return self.windows
+
+    def _summarize(self, window):
+        segments = sorted(window.segments, key=lambda s: s["start"])
+        transcript = " ".join(s["text"].strip() for s in segments)
+        words = len(transcript.split())
+        speech_duration = sum(s["end"] - s["start"] for s in segments)
+
+        movement = {"frames": window.movement.count}
+        if window.movement.count:
+            variances = window.movement.variance.sum(axis=-1)
+            movement.update({name: float(v) for name, v in zip(MOVEMENT_POINTS, variances)})
+
+        topic_counts = {}
+        summaries = []
+        for text in window.texts:
+            result = self.context_lookup(text) if self.context_lookup else None
+            if result is None:
+                continue
+            topics, summary = result
+            label = topics["labels"][0]
+            topic_counts[label] = topic_counts.get(label, 0) + 1
+            if summary and summary not in summaries:
+                summaries.append(summary)
+        topics = sorted(topic_counts, key=topic_counts.get, reverse=True)
+
+        return {
+            "index": window.index,
+            "start": window.start,
+            "end": window.end,
+            "label": f"{format_window_time(window.start)} - {format_window_time(window.end)}",
+            "transcript": transcript,
+            "words": words,
+            "words_per_minute": (words / speech_duration) * 60 if speech_duration > 0 else 0,
+            "topics": topics,
+            "summaries": summaries,
+            "movement": movement,
+            "events": [],
+            **window.fields,
+        }
+
+    def _detect_events(self, summary, window):
+        events = list(window.events)
+        previous = self._previous
+        for hand in ("right_hand_variance", "left_hand_variance"):
+            variance = summary["movement"].get(hand, 0.0)
+            before = previous["movement"].get(hand, 0.0) if previous else 0.0
+            if variance >= self.gesture_variance > before:
+                events.append({"timestamp": window.start, "type": "gesture_start",
+                               "hand": hand.split("_")[0], "variance": variance})
+        if summary["topics"] and previous and previous["topics"] and summary["topics"][0] != previous["topics"][0]:
+            events.append({"timestamp": window.start, "type": "topic_change",
+                           "from": previous["topics"][0], "to": summary["topics"][0]})
+        if not summary["words"]:
+            events.append({"timestamp": window.start, "type": "silence"})
+        return sorted(events, key=lambda e: e["timestamp"])
+
+    def _emit(self, window):
+        summary = self._summarize(window)
+        summary["events"] = self._detect_events(summary, window)
+        self._open.pop(window.index, None)
+        self._next = window.index + 1
+        self._previous = summary
+        self.windows.append(summary)
+        if self._file is not None:
+            self._file.write(json.dumps(summary) + "\n")
+            self._file.flush()
+        if self.on_window is not None:
+            self.on_window(summary)
+
+
+def describe_window(window):
+    """Render a timeline window as a plain-text block like the frontend's temporal analysis."""
+    lines = [window["label"]]
+    if window["transcript"]:
+        lines.append(f"Speech: {window['transcript']}")
+        lines.append(f"Speech pace: around {window['words_per_minute']:.0f} words per minute")
+    if window["topics"]:
+        lines.append(f"Topics: {', '.join(window['topics'])}")
+    movement = window["movement"]
+    if movement.get("frames"):
+        lines.append("Movement variance: " + ", ".join(
+            f"{name.replace('_variance', '').replace('_', ' ')} {movement[name]:.4f}" for name in MOVEMENT_POINTS))
+    for event in window["events"]:
+        details = ", ".join(f"{k} {v:.4f}" if isinstance(v, float) else f"{k} {v}"
+                            for k, v in event.items() if k not in ("timestamp", "type"))
+        lines.append(f"[{format_window_time(event['timestamp'])}] {event['type'].replace('_', ' ')}"
+                     + (f" ({details})" if details else ""))
+    return "\n".join(lines)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Search the transcripts of every analyzed video.
+
+    python transcript_search.py transcripts.db add analysis_dir [analysis_dir ...]
+    python transcript_search.py transcripts.db search "clean coal" --mode phrase
+    python transcript_search.py transcripts.db search coal --video hearing.mp4 --start 60 --end 75
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Bump when the schema changes; an index with another version is rebuilt empty
+SCHEMA_VERSION = 1
+
+SEARCH_MODES = ("words", "any", "phrase", "prefix", "fts")
+SEARCH_ORDERS = ("recent", "time", "rank")
+
+# Word characters as FTS5's unicode61 tokenizer splits them
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    added REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    video_id INTEGER NOT NULL REFERENCES videos(id),
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    text TEXT NOT NULL,
+    UNIQUE (video_id, start_time, text)
+);
+CREATE INDEX IF NOT EXISTS segments_by_time ON segments (video_id, start_time);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+    text, content='segments', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS segments_added AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_removed AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_fts (segments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+def build_query(text, mode="words"):
+    """Turn search text into an FTS5 query.
+
+    "words" matches segments containing every word, "any" any of them,
+    "phrase" the words in order, and "prefix" every word with the last one
+    as a prefix ("coal min" finds "coal miners"). "fts" passes text through
+    as a raw FTS5 query. Punctuation in text is ignored except in "fts" mode.
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"mode must be one of {SEARCH_MODES}, got {mode!r}")
+    if mode == "fts":
+        return text
+    tokens = _TOKEN.findall(text)
+    if not tokens:
+        raise ValueError(f"Nothing to search for in {text!r}")
+    if mode == "phrase":
+        return '"' + " ".join(tokens) + '"'
+    quoted = [f'"{token}"' for token in tokens]
+    if mode == "prefix":
+        quoted[-1] += "*"
+    return (" OR " if mode == "any" else " AND ").join(quoted)
+
+
+class TranscriptIndex:
+    def __init__(self, path="transcripts.db"):
+        """Persistent full-text index of transcript segments across videos.
+
+        Segments live in an SQLite database with an FTS5 inverted index over
+        their text, so keyword, phrase and prefix queries (see build_query)
+        take milliseconds however many hours of video are indexed, and can be
+        limited to one video and a time window. Segments can be added as they
+        are transcribed; adding a segment again (same video, start and text)
+        is a no-op, so a run can safely re-add its whole transcript. The
+        database is in WAL mode, so other processes can search it while it is
+        being written. Phrases are matched within a segment, not across two.
+        """
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        with self._conn:
+            if version not in (0, SCHEMA_VERSION):
+                print(f"Rebuilding transcript index {path}: it has schema version {version}")
+                for table in ("segments_fts", "segments", "videos"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._video_ids = {}
+
+    def _video_id(self, video):
+        if video not in self._video_ids:
+            self._conn.execute("INSERT OR IGNORE INTO videos (name, added) VALUES (?, ?)", (video, time.time()))
+            row = self._conn.execute("SELECT id FROM videos WHERE name = ?", (video,)).fetchone()
+            self._video_ids[video] = row[0]
+        return self._video_ids[video]
+
+    def add_segments(self, video, segments):
+        """Index {"start", "end", "text"} segments of video in one transaction; returns how many were new."""
+        with self._lock, self._conn:
+            video_id = self._video_id(video)
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO segments (video_id, start_time, end_time, text) VALUES (?, ?, ?, ?)",
+                [(video_id, float(s["start"]), float(s["end"]), s["text"].strip()) for s in segments
+                 if s["text"].strip()])
+            return max(cursor.rowcount, 0)
+
+    def remove_video(self, video):
+        """Drop every segment of video from the index."""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM videos WHERE name = ?", (video,)).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM segments WHERE video_id = ?", (row[0],))
+            self._conn.execute("DELETE FROM videos WHERE id = ?", (row[0],))
+            self._video_ids.pop(video, None)
+
+    def videos(self):
+        """Return {video: number of indexed segments}."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT v.name, COUNT(s.id) FROM videos v LEFT JOIN segments s ON s.video_id = v.id GROUP BY v.id"
+            ).fetchall()
+        return dict(rows)
+
+    def search(self, text, mode="words", video=None, start=None, end=None, limit=100, order="recent"):
+        """Return matching segments as {"video", "start", "end", "text"} dicts.
+
+        With video set only that video is searched, and with start or end
+        only segments overlapping [start, end] seconds. Hits come most
+        recently indexed first (order="recent"), by video and time
+        (order="time"), or by relevance (order="rank", adding a "score",
+        higher for better matches). Ranking scores every match, so it is the
+        slowest order for words that occur in much of the archive.
+        """
+        if order not in SEARCH_ORDERS:
+            raise ValueError(f"order must be one of {SEARCH_ORDERS}, got {order!r}")
+        score = ", -bm25(segments_fts)" if order == "rank" else ""
+        sql = [f"SELECT v.name, s.start_time, s.end_time, s.text{score} FROM segments_fts",
+               "JOIN segments s ON s.id = segments_fts.rowid JOIN videos v ON v.id = s.video_id",
+               "WHERE segments_fts MATCH ?"]
+        params = [build_query(text, mode)]
+        window = []
+        if start is not None:
+            window.append("AND end_time >= ?")
+            params.append(start)
+        if end is not None:
+            window.append("AND start_time <= ?")
+            params.append(end)
+        if video is not None:
+            # Look the video's window up by time first, then only check those rows against the text index
+            sql.append("AND segments_fts.rowid IN (SELECT id FROM segments WHERE video_id = "
+                       "(SELECT id FROM videos WHERE name = ?) " + " ".join(window) + ")")
+            params.insert(1, video)
+        else:
+            sql += ["AND s." + condition[4:] for condition in window]
+        sql.append({"recent": "ORDER BY segments_fts.rowid DESC", "time": "ORDER BY v.name, s.start_time",
+                    "rank": "ORDER BY rank"}[order])
+        sql.append("LIMIT ?")
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(" ".join(sql), params).fetchall()
+        hits = [{"video": row[0], "start": row[1], "end": row[2], "text": row[3]} for row in rows]
+        if order == "rank":
+            for hit, row in zip(hits, rows):
+                hit["score"] = row[4]
+        return hits
+
+    def said(self, text, video=None, start=None, end=None, mode="phrase"):
+        """Return whether text was said (in video, between start and end seconds)."""
+        return bool(self.search(text, mode=mode, video=video, start=start, end=end, limit=1))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Search analyzed CSPAN transcripts')
+    parser.add_argument('index', type=str, help='Transcript index database')
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_parser = commands.add_parser("add", help="Index the transcripts of --data-dir analyses")
+    add_parser.add_argument('data_dirs', nargs="+")
+    search_parser = commands.add_parser("search", help="Search the index")
+    search_parser.add_argument('text', type=str)
+    search_parser.add_argument('--mode', choices=SEARCH_MODES, default="words")
+    search_parser.add_argument('--video', type=str, default=None, help='Only search this video')
+    search_parser.add_argument('--start', type=float, default=None, help='Window start in seconds')
+    search_parser.add_argument('--end', type=float, default=None, help='Window end in seconds')
+    search_parser.add_argument('--limit', type=int, default=20)
+    search_parser.add_argument('--order', choices=SEARCH_ORDERS, default="recent")
+    commands.add_parser("videos", help="List the indexed videos")
+    args = parser.parse_args()
+
+    index = TranscriptIndex(args.index)
+    if args.command == "add":
+        from analysis_store import load_analysis
+        for data_dir in args.data_dirs:
+            data = load_analysis(data_dir)
+            video = data["meta"].get("video_path") or data_dir
+            added = index.add_segments(os.path.abspath(video), data["speech_segments"])
+            print(f"Indexed {added} new segments of {video}")
+    elif args.command == "search":
+        started = time.perf_counter()
+        hits = index.search(args.text, mode=args.mode, video=args.video, start=args.start, end=args.end,
+                            limit=args.limit, order=args.order)
+        for hit in hits:
+            print(f"{hit['video']} [{hit['start']:.1f}-{hit['end']:.1f}] {hit['text']}")
+        print(f"{len(hits)} hits in {(time.perf_counter() - started) * 1000:.1f} ms")
+    else:
+        for video, count in index.videos().items():
+            print(f"{count:6d}  {video}")
+    index.close()
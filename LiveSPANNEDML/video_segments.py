@@ -0,0 +1,59 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+import cv2
+
+
+def concat_videos(segment_paths, output_path):
+    """Join video segments with identical encoding settings into one file.
+
+    Uses ffmpeg's concat demuxer to copy the streams without re-encoding when
+    ffmpeg is available, and falls back to re-writing the frames with OpenCV.
+    Returns the output path.
+    """
+    segment_paths = [p for p in segment_paths if os.path.exists(p) and os.path.getsize(p) > 0]
+    if not segment_paths:
+        raise ValueError("No video segments to join")
+
+    if len(segment_paths) == 1:
+        shutil.copyfile(segment_paths[0], output_path)
+        return output_path
+
+    if shutil.which("ffmpeg"):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            for path in segment_paths:
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+            list_path = f.name
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                 "-i", list_path, "-c", "copy", output_path],
+                capture_output=True, text=True
+            )
+        finally:
+            os.remove(list_path)
+        if result.returncode == 0:
+            return output_path
+        print(f"ffmpeg concat failed, re-encoding segments with OpenCV: {result.stderr.strip()}")
+
+    first = cv2.VideoCapture(segment_paths[0])
+    fps = first.get(cv2.CAP_PROP_FPS)
+    frame_size = (int(first.get(cv2.CAP_PROP_FRAME_WIDTH)), int(first.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    first.release()
+
+    out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, frame_size)
+    try:
+        for path in segment_paths:
+            cap = cv2.VideoCapture(path)
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                out.write(frame)
+            cap.release()
+    finally:
+        out.release()
+    return output_path